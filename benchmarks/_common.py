@@ -0,0 +1,50 @@
+# benchmarks/_common.py
+"""Helpers shared by the benchmark and check scripts."""
+import os
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_rev():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_project(directory):
+    """assets/videos and an initialised lms.db (the active database) under `directory`; returns the videos dir."""
+    from db import connection
+    from db.database import init_db
+
+    videos_dir = os.path.join(directory, "assets", "videos")
+    os.makedirs(videos_dir, exist_ok=True)
+    connection.configure(os.path.join(directory, "lms.db"))
+    init_db()
+    return videos_dir
+
+
+def percentile(ordered, p):
+    """The p-th percentile (0-100) of an ascending list."""
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def rss_bytes():
+    """Resident set size of this process, or None if it can't be read."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
@@ -0,0 +1,115 @@
+# benchmarks/bench_connection.py
+"""Per-call latency of the catalog lookups: connect-per-call vs managed connection.
+
+The "after" column bypasses the catalog cache; "cached" is a warm cache hit.
+
+Run from the project root:
+    python -m benchmarks.bench_connection [iterations]
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from db import connection
+from db.database import init_db, get_classes_by_grade, get_topics_by_class_id, get_topic_content_by_class_id, get_class_id
+
+
+def build_fixture(db_path):
+    """Create a small catalog in the original (pre-migration) lms.db layout."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE users (username TEXT PRIMARY KEY, password TEXT, status TEXT, grade TEXT);
+        CREATE TABLE classes (id INTEGER PRIMARY KEY AUTOINCREMENT, class_name TEXT UNIQUE, grade TEXT);
+        CREATE TABLE topics (id INTEGER PRIMARY KEY AUTOINCREMENT, topic_name TEXT, class_name TEXT,
+                             video_path TEXT, description TEXT, UNIQUE(topic_name, class_name));
+    ''')
+    for g in (12, 13):
+        for c in range(5):
+            cls = f"Class {c} G{g}"
+            conn.execute("INSERT INTO classes (class_name, grade) VALUES (?, ?)", (cls, f"Grade {g}"))
+            for t in range(10):
+                conn.execute(
+                    "INSERT INTO topics (topic_name, class_name, video_path, description) VALUES (?, ?, ?, ?)",
+                    (f"Topic {t}", cls, "/assets/videos/sample.mp4", "Sample topic description here.")
+                )
+    conn.commit()
+    conn.close()
+
+
+# -------------------------------------------------------------------
+# Baseline: the pre-connection-manager query functions
+# -------------------------------------------------------------------
+def legacy_get_classes_by_grade(db_path, grade):
+    conn = sqlite3.connect(db_path)
+    classes = [r[0] for r in conn.execute("SELECT class_name FROM classes WHERE grade=?", (grade,))]
+    conn.close()
+    return classes
+
+
+def legacy_get_topics_by_class(db_path, class_name):
+    conn = sqlite3.connect(db_path)
+    topics = [r[0] for r in conn.execute("SELECT topic_name FROM topics WHERE class_name=?", (class_name,))]
+    conn.close()
+    return topics
+
+
+def legacy_get_topic_content(db_path, class_name, topic_name):
+    conn = sqlite3.connect(db_path)
+    result = conn.execute(
+        "SELECT video_path, description FROM topics WHERE class_name=? AND topic_name=?",
+        (class_name, topic_name)
+    ).fetchone()
+    conn.close()
+    return result if result else (None, None)
+
+
+def per_call_us(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_fixture(db_path)
+
+        # "after" runs on a migrated copy of the same data
+        current_path = os.path.join(tmp, "bench_current.db")
+        shutil.copyfile(db_path, current_path)
+        connection.configure(current_path)
+        init_db()
+
+        class_id = get_class_id("Class 3 G13", "Grade 13")
+        cases = [
+            ("get_classes_by_grade",
+             lambda: legacy_get_classes_by_grade(db_path, "Grade 12"),
+             lambda: get_classes_by_grade.uncached("Grade 12"),
+             lambda: get_classes_by_grade("Grade 12")),
+            ("get_topics_by_class",
+             lambda: legacy_get_topics_by_class(db_path, "Class 3 G13"),
+             lambda: get_topics_by_class_id.uncached(class_id),
+             lambda: get_topics_by_class_id(class_id)),
+            ("get_topic_content",
+             lambda: legacy_get_topic_content(db_path, "Class 3 G13", "Topic 7"),
+             lambda: get_topic_content_by_class_id.uncached(class_id, "Topic 7"),
+             lambda: get_topic_content_by_class_id(class_id, "Topic 7")),
+        ]
+
+        print(f"{'function':<24}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}{'cached (us)':>14}")
+        for name, before, after, warm in cases:
+            assert before() == after() == warm()
+            b = per_call_us(before, iterations)
+            a = per_call_us(after, iterations)
+            c = per_call_us(warm, iterations)
+            print(f"{name:<24}{b:>14.1f}{a:>14.1f}{b / a:>9.1f}x{c:>14.1f}")
+
+        connection.close_all()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,286 @@
+# benchmarks/bench_db.py
+"""Latency/throughput of every public function in db/database.py.
+
+Build a dataset first (see benchmarks/datagen.py), then run from the
+project root:
+    python -m benchmarks.bench_db /tmp/big.db --out results.json
+    python -m benchmarks.bench_db /tmp/big.db --compare results.json
+
+Each case runs until --budget seconds or --max calls (at least --min).
+Cached lookups are timed twice: ".uncached" (hits SQLite) and warm.
+Write cases undo their own rows, so the dataset is left as it was.
+"""
+import argparse
+import inspect
+import json
+import platform
+import sqlite3
+import sys
+import time
+
+from benchmarks._common import git_rev, percentile
+from db import connection, database
+from db.database import (
+    init_db, check_login, get_classes_by_grade, get_class_id, get_topics_by_class_id,
+    get_topic_content_by_class_id, get_topic_id, get_topic, get_topics_by_class, get_topic_content,
+    get_all_users, delete_user, add_new_user, get_all_classes, delete_class_by_id,
+    delete_class, add_new_class, get_all_topics, get_users_page, count_users,
+    get_classes_page, count_classes, get_topics_page, count_topics, get_all_class_names,
+    get_class_choices, add_topic_to_class, add_new_topic, delete_topic_by_id, delete_topic,
+    search_topics, get_cache_stats, get_query_stats, delete_users, set_students_grade,
+    delete_classes, delete_topics, move_topics,
+)
+
+BENCH_CLASS = "Benchmark Class"
+BENCH_GRADE = "Grade 12"
+BATCH = 100         # rows per call in the batch cases
+
+
+def run_case(func, args_for, budget, min_calls, max_calls):
+    """Call func(*args_for(i)) repeatedly; return latency stats in ms."""
+    samples = []
+    deadline = time.perf_counter() + budget
+    i = 0
+    while i < max_calls and (i < min_calls or time.perf_counter() < deadline):
+        args = args_for(i)
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+        i += 1
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "mean_ms": total / len(samples),
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1],
+        "ops_per_s": len(samples) / (total / 1000) if total else float("inf"),
+    }
+
+
+# -------------------------------------------------------------------
+# Cases
+# -------------------------------------------------------------------
+def _sample(conn):
+    """Pick realistic arguments from the dataset."""
+    user = conn.execute("SELECT username, password FROM users WHERE status='student' "
+                        "ORDER BY username LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM users)").fetchone()
+    cls = conn.execute("SELECT c.id, c.class_name, c.grade FROM classes c "
+                       "ORDER BY (SELECT COUNT(*) FROM topics t WHERE t.class_id = c.id) DESC LIMIT 1").fetchone()
+    topic = conn.execute("SELECT topic_name FROM topics WHERE class_id=? ORDER BY topic_name DESC LIMIT 1",
+                         (cls[0],)).fetchone()
+    mid_user = conn.execute("SELECT status, username FROM users ORDER BY status DESC, username "
+                            "LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM users)").fetchone()
+    mid_class = conn.execute("SELECT grade, class_name FROM classes ORDER BY grade, class_name "
+                             "LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM classes)").fetchone()
+    mid_topic = conn.execute("SELECT class_id, topic_name, id FROM topics ORDER BY class_id, topic_name, id "
+                             "LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM topics)").fetchone()
+    return {
+        "user": tuple(user) if user else ("Anushka", "abc123"),
+        "class": tuple(cls),
+        "topic": topic[0] if topic else "Topic 1",
+        "user_cursor": tuple(mid_user),
+        "class_cursor": tuple(mid_class),
+        "topic_cursor": tuple(mid_topic) if mid_topic else None,
+    }
+
+
+def build_cases(s):
+    """[(name, func, args_for)] covering every public db.database function."""
+    user, pw = s["user"]
+    class_id, class_name, grade = s["class"]
+    topic = s["topic"]
+
+    def same(*args):
+        return lambda i: args
+
+    cases = [
+        ("init_db", init_db, same()),
+        ("check_login", check_login, same(user, pw)),
+        ("check_login (miss)", check_login, same(user, "wrong")),
+        ("get_classes_by_grade.uncached", get_classes_by_grade.uncached, same(grade)),
+        ("get_classes_by_grade", get_classes_by_grade, same(grade)),
+        ("get_class_id.uncached", get_class_id.uncached, same(class_name, grade)),
+        ("get_class_id", get_class_id, same(class_name, grade)),
+        ("get_topics_by_class_id.uncached", get_topics_by_class_id.uncached, same(class_id)),
+        ("get_topics_by_class_id", get_topics_by_class_id, same(class_id)),
+        ("get_topic_content_by_class_id.uncached", get_topic_content_by_class_id.uncached, same(class_id, topic)),
+        ("get_topic_content_by_class_id", get_topic_content_by_class_id, same(class_id, topic)),
+        ("get_topic_id.uncached", get_topic_id.uncached, same(class_id, topic)),
+        ("get_topic_id", get_topic_id, same(class_id, topic)),
+        ("get_topic", get_topic, same(s["topic_cursor"][2] if s["topic_cursor"] else 1)),
+        ("get_topics_by_class", get_topics_by_class, same(class_name, grade)),
+        ("get_topic_content", get_topic_content, same(class_name, topic, grade)),
+        ("get_all_users", get_all_users, same()),
+        ("get_all_classes", get_all_classes, same()),
+        ("get_all_topics", get_all_topics, same()),
+        ("get_all_class_names", get_all_class_names, same()),
+        ("get_class_choices", get_class_choices, same()),
+        ("get_users_page (first)", get_users_page, same()),
+        ("get_users_page (middle)", lambda c: get_users_page(after=c), same(s["user_cursor"])),
+        ("get_users_page (grade)", lambda: get_users_page(grade=BENCH_GRADE), same()),
+        ("count_users", count_users, same()),
+        ("count_users (grade)", lambda: count_users(grade=BENCH_GRADE), same()),
+        ("get_classes_page (first)", get_classes_page, same()),
+        ("get_classes_page (middle)", lambda c: get_classes_page(after=c), same(s["class_cursor"])),
+        ("count_classes", count_classes, same()),
+        ("get_topics_page (first)", get_topics_page, same()),
+        ("get_topics_page (middle)", lambda c: get_topics_page(after=c), same(s["topic_cursor"])),
+        ("get_topics_page (class)", lambda: get_topics_page(class_id=class_id), same()),
+        ("get_topics_page (grade)", lambda: get_topics_page(grade=BENCH_GRADE), same()),
+        ("count_topics", count_topics, same()),
+        ("count_topics (class)", lambda: count_topics(class_id), same()),
+        ("count_topics (grade)", lambda: count_topics(None, BENCH_GRADE), same()),
+        ("search_topics (word)", search_topics, same("cash flow")),
+        ("search_topics (prefix)", search_topics, same("depre")),
+        ("search_topics (grade)", search_topics, same("revision inflation", BENCH_GRADE)),
+        ("get_cache_stats", get_cache_stats, same()),
+        ("get_query_stats", get_query_stats, same()),
+
+        # --- Writes: each add_ case is undone by the delete_ case after it ---
+        ("add_new_user", add_new_user, lambda i: (f"bench-user-{i}", "pw", "student", BENCH_GRADE)),
+        ("delete_user", delete_user, lambda i: (f"bench-user-{i}",)),
+        ("add_new_class", add_new_class, lambda i: (f"{BENCH_CLASS} {i}", BENCH_GRADE)),
+        ("delete_class_by_id", delete_class_by_id, lambda i: (get_class_id.uncached(f"{BENCH_CLASS} {i}", BENCH_GRADE),)),
+        ("add_new_class (again)", add_new_class, lambda i: (f"{BENCH_CLASS} {i}", BENCH_GRADE)),
+        ("delete_class", delete_class, lambda i: (f"{BENCH_CLASS} {i}", BENCH_GRADE)),
+        ("add_topic_to_class", add_topic_to_class,
+         lambda i: (s["bench_class_id"], f"Bench Topic {i}", "/assets/videos/x.mp4", "Bench.")),
+        ("delete_topic", delete_topic, lambda i: (f"Bench Topic {i}", BENCH_CLASS, BENCH_GRADE)),
+        ("add_new_topic", add_new_topic,
+         lambda i: (f"Bench Topic {i}", BENCH_CLASS, "/assets/videos/x.mp4", "Bench.", BENCH_GRADE)),
+        ("delete_topic_by_id", delete_topic_by_id, lambda i: (_topic_id(s["bench_class_id"], f"Bench Topic {i}"),)),
+
+        # --- Batches of BATCH rows: a loop of single-row calls vs one batch call ---
+        ("add_new_user (x100)", _each(add_new_user),
+         lambda i: ([(f"bench-batch-{i}-{k}", "pw", "student", BENCH_GRADE) for k in range(BATCH)],)),
+        ("delete_user (x100 loop)", _each(delete_user),
+         lambda i: ([(f"bench-batch-{i}-{k}",) for k in range(BATCH)],)),
+        ("add_new_user (x100 again)", _each(add_new_user),
+         lambda i: ([(f"bench-batch-{i}-{k}", "pw", "student", BENCH_GRADE) for k in range(BATCH)],)),
+        ("delete_users (x100)", delete_users, lambda i: ([f"bench-batch-{i}-{k}" for k in range(BATCH)],)),
+        ("set_students_grade (x100)", set_students_grade,
+         lambda i: (s["batch_users"], ("Grade 13", BENCH_GRADE)[i % 2])),
+        ("add_new_class (x100)", _each(add_new_class),
+         lambda i: ([(f"{BENCH_CLASS} {i}-{k}", BENCH_GRADE) for k in range(BATCH)],)),
+        ("delete_classes (x100)", delete_classes,
+         lambda i: ([get_class_id.uncached(f"{BENCH_CLASS} {i}-{k}", BENCH_GRADE) for k in range(BATCH)],)),
+        ("add_topic_to_class (x100)", _each(add_topic_to_class),
+         lambda i: ([(s["bench_class_id"], f"Bench Batch {i}-{k}", "/assets/videos/x.mp4", "Bench.")
+                     for k in range(BATCH)],)),
+        ("delete_topics (x100)", delete_topics,
+         lambda i: ([_topic_id(s["bench_class_id"], f"Bench Batch {i}-{k}") for k in range(BATCH)],)),
+        ("move_topics (x100)", move_topics,
+         lambda i: (s["move_topics"], (s["move_class_id"], s["bench_class_id"])[i % 2])),
+    ]
+    return cases
+
+
+def _each(func):
+    """One call per row, the way the admin pages worked before batch functions."""
+    return lambda rows: [func(*row) for row in rows]
+
+
+def _topic_id(class_id, topic_name):
+    row = connection.get_connection().execute(
+        "SELECT id FROM topics WHERE class_id=? AND topic_name=?", (class_id, topic_name)
+    ).fetchone()
+    return row[0] if row else -1
+
+
+def public_functions():
+    return {name for name, obj in inspect.getmembers(database)
+            if callable(obj) and not name.startswith("_")
+            and getattr(obj, "__module__", None) == "db.database"}
+
+
+# -------------------------------------------------------------------
+# Main
+# -------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_db", description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="database built with benchmarks.datagen")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per case (default: %(default)s)")
+    parser.add_argument("--min", type=int, default=3, help="minimum calls per case")
+    parser.add_argument("--max", type=int, default=2000, help="maximum calls per case")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare p50 against")
+    args = parser.parse_args(argv)
+
+    connection.configure(args.db)
+    init_db()
+    conn = connection.get_connection()
+    counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("users", "classes", "topics")}
+    sample = _sample(conn)
+
+    # Classes, topics and users the write cases work on; removed again at the end.
+    add_new_class(BENCH_CLASS, BENCH_GRADE)
+    add_new_class(f"{BENCH_CLASS} B", BENCH_GRADE)
+    sample["bench_class_id"] = get_class_id.uncached(BENCH_CLASS, BENCH_GRADE)
+    sample["move_class_id"] = get_class_id.uncached(f"{BENCH_CLASS} B", BENCH_GRADE)
+    for k in range(BATCH):
+        add_topic_to_class(sample["bench_class_id"], f"Bench Move {k}", "/assets/videos/x.mp4", "Bench.")
+        add_new_user(f"bench-grade-{k}", "pw", "student", BENCH_GRADE)
+    sample["move_topics"] = [_topic_id(sample["bench_class_id"], f"Bench Move {k}") for k in range(BATCH)]
+    sample["batch_users"] = [f"bench-grade-{k}" for k in range(BATCH)]
+    cases = build_cases(sample)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{counts['users']:,} users, {counts['classes']:,} classes, {counts['topics']:,} topics")
+    print(f"{'case':<40}{'calls':>7}{'ops/s':>11}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+          + (f"{'vs base':>10}" if baseline else ""))
+
+    results = {}
+    add_calls = None
+    for name, func, args_for in cases:
+        if args.only and args.only not in name:
+            continue
+        if name.startswith("delete_") and add_calls is not None:
+            # undo exactly what the preceding add_ case created
+            stats = run_case(func, args_for, 0, add_calls, add_calls)
+        else:
+            stats = run_case(func, args_for, args.budget, args.min, args.max)
+        add_calls = stats["calls"] if name.startswith("add_") else None
+        results[name] = stats
+
+        line = (f"{name:<40}{stats['calls']:>7}{stats['ops_per_s']:>11.0f}{stats['p50_ms']:>10.3f}"
+                f"{stats['p90_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['max_ms']:>10.3f}")
+        if baseline and name in baseline:
+            line += f"{stats['p50_ms'] / baseline[name]['p50_ms']:>9.2f}x"
+        print(line)
+
+    delete_classes([sample["bench_class_id"], sample["move_class_id"]])
+    delete_users(sample["batch_users"])
+
+    covered = {name.split(" ")[0].split(".")[0] for name in results}
+    missing = sorted(public_functions() - covered)
+    if missing and not args.only:
+        print(f"not benchmarked: {', '.join(missing)}", file=sys.stderr)
+
+    if args.out:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "db": args.db,
+            "rows": counts,
+            "budget_s": args.budget,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"results written to {args.out}")
+
+    connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/bench_list.py
+"""Build time and memory of a long card list: one widget set per row vs VirtualList.
+
+Needs a display (Tk). Run from the project root:
+    python -m benchmarks.bench_list --rows 10000
+    python -m benchmarks.bench_list --rows 10000 --out list.json
+
+Each mode runs in a fresh interpreter so memory numbers don't mix:
+    legacy   Frame + Label + Button per row packed into a scrolling
+             Canvas (how the pages built lists before ui/virtual_list.py)
+    virtual  ui.virtual_list.VirtualList with recycled row widgets
+
+Reported: time until the list is built and drawn, resident memory
+added, widgets created, and the mean time per step while scrolling
+from top to bottom in 50 jumps.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks._common import count_widgets, rss_bytes
+
+ROW_HEIGHT = 160
+SCROLL_STEPS = 50
+
+
+def _card(tk, styles, parent):
+    card = tk.Frame(parent, bg=styles.ENTRY_BG, width=700, height=130)
+    card.pack_propagate(False)
+    card.info = tk.Label(card, font=(styles.FONT_FAMILY, 14), fg=styles.FG_COLOR, bg=styles.ENTRY_BG)
+    card.info.pack(pady=(20, 10))
+    card.button = tk.Button(card, text="Delete", font=(styles.FONT_FAMILY, 12, "bold"),
+                            bg=styles.BUTTON_PRIMARY, fg=styles.BG_COLOR, relief="flat", width=14)
+    card.button.pack()
+    return card
+
+
+def build_legacy(tk, styles, root, rows):
+    canvas = tk.Canvas(root, bg=styles.BG_COLOR, highlightthickness=0)
+    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
+    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+    canvas.create_window((0, 0), window=scroll_frame, anchor="n")
+    canvas.pack(fill="both", expand=True)
+    for row in rows:
+        card = _card(tk, styles, scroll_frame)
+        card.info.config(text=row)
+        card.button.config(command=lambda r=row: r)
+        card.pack(pady=15)
+    return canvas
+
+
+def build_virtual(tk, styles, root, rows):
+    from ui.virtual_list import VirtualList
+
+    def make(parent):
+        card = _card(tk, styles, parent)
+        card.button.config(command=lambda: card.row)
+        return card
+
+    def fill(card, row):
+        card.row = row
+        card.info.config(text=row)
+
+    view = VirtualList(root, ROW_HEIGHT, make, fill)
+    view.frame.pack(fill="both", expand=True)
+    view.set_rows(rows)
+    return view.canvas
+
+
+def run_mode(mode, count):
+    """Build one list in this process and return its measurements."""
+    import tkinter as tk
+    from utils import styles
+
+    root = tk.Tk()
+    root.geometry("1000x800")
+    root.update()
+    rows = [f"Row {i:05d}   |   Role: student   |   Grade: Grade 12" for i in range(count)]
+    widgets_before = count_widgets(root)
+    rss_before = rss_bytes()
+
+    start = time.perf_counter()
+    canvas = (build_legacy if mode == "legacy" else build_virtual)(tk, styles, root, rows)
+    root.update()
+    build_s = time.perf_counter() - start
+    rss_after = rss_bytes()
+
+    start = time.perf_counter()
+    for step in range(1, SCROLL_STEPS + 1):
+        canvas.yview_moveto(step / SCROLL_STEPS)
+        root.update()
+    scroll_ms = (time.perf_counter() - start) / SCROLL_STEPS * 1000
+
+    result = {
+        "mode": mode,
+        "rows": count,
+        "build_s": build_s,
+        "widgets": count_widgets(root) - widgets_before,
+        "rss_mb": (rss_after - rss_before) / 1e6 if rss_before is not None else None,
+        "scroll_ms": scroll_ms,
+    }
+    root.destroy()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_list", description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--modes", default="legacy,virtual", help="comma-separated (default: %(default)s)")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_mode(args.child, args.rows)))
+        return
+
+    results = []
+    print(f"{'mode':<10}{'rows':>8}{'build s':>10}{'widgets':>10}{'RSS MB':>9}{'scroll ms':>11}")
+    for mode in args.modes.split(","):
+        proc = subprocess.run([sys.executable, "-m", "benchmarks.bench_list", "--rows", str(args.rows),
+                               "--child", mode], capture_output=True, text=True)
+        if proc.returncode:
+            sys.exit(f"{mode} run failed:\n{proc.stderr}")
+        result = json.loads(proc.stdout)
+        results.append(result)
+        rss = f"{result['rss_mb']:>9.1f}" if result["rss_mb"] is not None else f"{'n/a':>9}"
+        print(f"{mode:<10}{result['rows']:>8}{result['build_s']:>10.2f}{result['widgets']:>10}{rss}"
+              f"{result['scroll_ms']:>11.2f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_startup.py
+"""Cold-start time of the app, phase by phase.
+
+Starts the app --runs times, each in a fresh interpreter with
+LMS_STARTUP=1 (see utils/startup.py), and reports the median time to
+each phase main.py marks plus the process wall time. Run from the
+project root:
+    python -m benchmarks.bench_startup --db /tmp/lms_copy.db --out startup.json
+    python -m benchmarks.bench_startup --db /tmp/lms_copy.db --compare startup.json
+    python -m benchmarks.bench_startup --imports-only
+
+The full run opens the window and quits once the login page is drawn,
+so it needs a display; --imports-only just runs "import main" and
+works anywhere. Backups and maintenance are turned off for the runs.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks._common import git_rev
+
+TOP_IMPORTS = 10    # slowest imports (by median inclusive time) listed
+
+
+def run_once(command, env, timeout):
+    """One cold start; returns (wall ms, timeline dict from utils.startup)."""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        subprocess.run(command, env={**env, "LMS_STARTUP_JSON": path}, check=True, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall = (time.perf_counter() - start) * 1000
+        with open(path, encoding="utf-8") as f:
+            return wall, json.load(f)
+    finally:
+        os.remove(path)
+
+
+def summarize(runs):
+    """Median of every phase (and import) over the runs."""
+    phases = {"wall": statistics.median(wall for wall, _ in runs)}
+    for label in runs[0][1]["marks_ms"]:
+        values = [timeline["marks_ms"][label] for _, timeline in runs if label in timeline["marks_ms"]]
+        phases[label] = statistics.median(values)
+    imports = {}
+    for _, timeline in runs:
+        for name, times in timeline["imports_ms"].items():
+            imports.setdefault(name, []).append(times["inclusive"])
+    imports = {name: statistics.median(values) for name, values in imports.items()}
+    return phases, imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_startup", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="database for the full run (LMS_DB_PATH; default: the app's own)")
+    parser.add_argument("--runs", type=int, default=10, help="cold starts to take the median of (default: %(default)s)")
+    parser.add_argument("--imports-only", action="store_true", help='time "import main" only (no display needed)')
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a start counts as hung")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    env = {**os.environ, "LMS_STARTUP": "1", "LMS_STARTUP_EXIT": "1",
+           "LMS_BACKUP_INTERVAL": "0", "LMS_MAINTENANCE": "0", "LMS_VIDEO_SCAN": "0",
+           "LMS_VIDEO_WATCH": "0", "PYTHONDONTWRITEBYTECODE": "1"}
+    if args.db:
+        env["LMS_DB_PATH"] = args.db
+    command = [sys.executable, "-c", "import main"] if args.imports_only else [sys.executable, "main.py"]
+
+    run_once(command, env, args.timeout)        # warm the OS file cache and .pyc files
+    runs = [run_once(command, env, args.timeout) for _ in range(args.runs)]
+    phases, imports = summarize(runs)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]["phases"]
+
+    print(f"{'phase (median of ' + str(args.runs) + ')':<32}{'ms':>10}" + (f"{'vs base':>10}" if baseline else ""))
+    for label, value in phases.items():
+        line = f"{label:<32}{value:>10.1f}"
+        if baseline and baseline.get(label):
+            line += f"{value / baseline[label]:>9.2f}x"
+        print(line)
+    print(f"{'slowest imports':<56}{'ms':>10}")
+    for name, value in sorted(imports.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]:
+        print(f"{name:<56}{value:>10.1f}")
+
+    if args.out:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db": args.db,
+            "runs": args.runs,
+            "imports_only": args.imports_only,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": {"phases": phases, "imports": imports}}, f, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# benchmarks/bench_video.py
+"""Throughput and latency of the video server under concurrent viewers.
+
+Builds a throwaway project directory with --topics lectures (a random
+--size-mb video each, and a database whose topics point at them),
+starts the server there in a child process (so client and server don't
+share a GIL) and has --clients asyncio viewers watch them: viewer i
+opens /topic/<id> of lecture i mod --topics, checks it got that lecture
+and downloads the video the page links to, --requests times over one
+keep-alive connection (a new one whenever the server closes it). Run
+from the project root:
+    python -m benchmarks.bench_video
+    python -m benchmarks.bench_video --engine asyncio --clients 200 --size-mb 20
+    python -m benchmarks.bench_video --engine both --out video.json
+    python -m benchmarks.bench_video --engine asyncio --compare video.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks._common import PROJECT_ROOT, git_rev, make_project, percentile
+
+READ_CHUNK = 256 * 1024
+CLASS_NAME = "Benchmark"
+
+
+# -------------------------------------------------------------------
+# Server side
+# -------------------------------------------------------------------
+def make_lectures(directory, topics, size):
+    """A project under `directory` with `topics` lectures of `size` bytes; returns [(topic id, title)]."""
+    from db import connection
+    from db.database import add_new_class, add_topic_to_class
+
+    videos_dir = make_project(directory)
+    class_id = add_new_class(CLASS_NAME, "Grade 12")
+    lectures = []
+    for k in range(topics):
+        with open(os.path.join(videos_dir, f"lecture-{k}.mp4"), "wb") as f:
+            f.write(os.urandom(size))
+        topic_id = add_topic_to_class(class_id, f"Lecture {k}", f"/assets/videos/lecture-{k}.mp4", "Benchmark.")
+        lectures.append((topic_id, f"{CLASS_NAME} - Lecture {k}"))
+    connection.close_all()
+    return lectures
+
+
+def serve(engine, port, directory):
+    """Child process: run `engine` on `port` for the project in `directory` until killed."""
+    os.chdir(directory)
+    from db import connection
+    from server import video
+    connection.configure(os.path.join(directory, "lms.db"))
+    video.ENGINE = engine
+    video.PORT = port
+    video.VIDEO_DIR = os.path.join(directory, "assets", "videos")
+    video._serve()
+
+
+def start_server(engine, port, directory):
+    """The server child process, once it accepts connections."""
+    child = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_video", "--serve", engine,
+                              "--port", str(port), "--dir", directory],
+                             cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+    except BaseException:
+        child.terminate()
+        raise
+    return child
+
+
+def wait_for_port(port, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            if time.monotonic() >= deadline:
+                sys.exit(f"server did not start on port {port}")
+            time.sleep(0.05)
+
+
+# -------------------------------------------------------------------
+# Client
+# -------------------------------------------------------------------
+class Connection:
+    """One keep-alive HTTP/1.1 client connection, reopened when the server closes it."""
+
+    def __init__(self, port):
+        self.port = port
+        self.reader = self.writer = None
+        self.connects = 0
+
+    async def get(self, path, headers=None, keep_body=False):
+        """GET `path`; returns (status, response headers, body bytes if keep_body else its length)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+            self.connects += 1
+        lines = [f"GET {path} HTTP/1.1", f"Host: 127.0.0.1:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        version, status = head[0].split()[:2]
+        response = {}
+        for line in head[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                response[name.strip().lower()] = value.strip()
+
+        received = 0
+        body = []
+        if "content-length" in response:
+            remaining = int(response["content-length"])
+            while remaining:
+                chunk = await self.reader.read(min(remaining, READ_CHUNK))
+                if not chunk:
+                    raise ConnectionError("server closed mid-body")
+                remaining -= len(chunk)
+                received += len(chunk)
+                if keep_body:
+                    body.append(chunk)
+        elif status not in ("204", "304"):
+            while chunk := await self.reader.read(READ_CHUNK):
+                received += len(chunk)
+                if keep_body:
+                    body.append(chunk)
+            response["connection"] = "close"
+
+        if response.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+            await self.close()
+        return int(status), response, b"".join(body) if keep_body else received
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+
+async def viewer(port, lecture, size, requests, latencies, errors):
+    """Open one lecture's page and download its video, `requests` times."""
+    topic_id, title = lecture
+    connection = Connection(port)
+    received = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            status, _, page = await connection.get(f"/topic/{topic_id}", keep_body=True)
+            source = re.search(rb'src="([^"]+)"', page)
+            if status != 200 or f"<title>{title}</title>".encode() not in page or source is None:
+                errors.append(f"/topic/{topic_id}: HTTP {status}, not {title!r}")
+                continue
+            status, _, count = await connection.get(source.group(1).decode())
+        except (OSError, asyncio.IncompleteReadError) as error:
+            errors.append(repr(error))
+            await connection.close()
+            continue
+        if status != 200 or count != size:
+            errors.append(f"{source.group(1).decode()}: HTTP {status}, {count} bytes")
+        latencies.append((time.perf_counter() - start) * 1000)
+        received += len(page) + count
+    await connection.close()
+    return received, connection.connects
+
+
+async def run_clients(port, lectures, size, clients, requests):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(viewer(port, lectures[i % len(lectures)], size, requests, latencies, errors)
+                                     for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies) or [0.0]
+    received = sum(r for r, _ in results)
+    for error in sorted(set(errors))[:5]:
+        print(f"  error: {error}", file=sys.stderr)
+    return {
+        "clients": clients,
+        "views": len(latencies),
+        "errors": len(errors),
+        "connections": sum(c for _, c in results),
+        "seconds": elapsed,
+        "views_per_s": len(latencies) / elapsed,
+        "mb_per_s": received / 1e6 / elapsed,
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1],
+    }
+
+
+# -------------------------------------------------------------------
+# Main
+# -------------------------------------------------------------------
+def bench_engine(engine, args, directory, lectures, size):
+    child = start_server(engine, args.port, directory)
+    try:
+        return asyncio.run(run_clients(args.port, lectures, size, args.clients, args.requests))
+    finally:
+        child.terminate()
+        child.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_video", description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=("flask", "asyncio", "both"), default="both")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent viewers (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=10, help="views per viewer (default: %(default)s)")
+    parser.add_argument("--topics", type=int, default=10, help="distinct lectures watched (default: %(default)s)")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="size of each video (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--serve", choices=("flask", "asyncio"), help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(args.serve, args.port, args.dir)
+
+    size = int(args.size_mb * 1e6)
+    directory = tempfile.mkdtemp(prefix="lms-bench-video-")
+    try:
+        lectures = make_lectures(directory, args.topics, size)
+        engines = ("flask", "asyncio") if args.engine == "both" else (args.engine,)
+        results = {engine: bench_engine(engine, args, directory, lectures, size) for engine in engines}
+    finally:
+        shutil.rmtree(directory)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{args.clients} viewers x {args.requests} views (page + video) of {args.topics} lectures")
+    print(f"{'engine':<10}{'views/s':>9}{'MB/s':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+          f"{'conns':>7}{'errors':>8}" + (f"{'vs base':>10}" if baseline else ""))
+    for engine, stats in results.items():
+        line = (f"{engine:<10}{stats['views_per_s']:>9.1f}{stats['mb_per_s']:>9.0f}{stats['p50_ms']:>10.1f}"
+                f"{stats['p90_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+                f"{stats['connections']:>7}{stats['errors']:>8}")
+        if baseline and engine in baseline:
+            line += f"{stats['p50_ms'] / baseline[engine]['p50_ms']:>9.2f}x"
+        print(line)
+
+    if args.out:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "clients": args.clients,
+            "requests": args.requests,
+            "topics": args.topics,
+            "size_mb": args.size_mb,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/bench_video_cache.py
+"""Concurrent viewers of the same lectures, with and without the block cache.
+
+A classroom: --viewers students open one of --lectures lectures within
+--spread seconds of each other and stream it the way the HTML5 player
+does, in --range-kb byte-range requests from start to end. For each
+engine the run is repeated with the block cache (server/chunks.py,
+--cache-mb) and with it off (LMS_VIDEO_CACHE_MB=0); with --cold the
+lectures are evicted from the OS page cache first (Linux), as they
+would be on a machine that just booted. Reported per run: throughput,
+latency of the range requests, the server's hit ratio and resident size
+(from /stats/cache) and the bytes the server process read (read() calls
+and actual storage reads, from /proc/<pid>/io where available). Run
+from the project root:
+    python -m benchmarks.bench_video_cache
+    python -m benchmarks.bench_video_cache --engine asyncio --viewers 30 --cold
+    python -m benchmarks.bench_video_cache --out cache.json
+    python -m benchmarks.bench_video_cache --compare cache.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks._common import git_rev, percentile
+from benchmarks.bench_video import Connection, make_lectures, start_server
+
+
+def evict_from_page_cache(directory):
+    """Drop the lectures from the OS page cache, where the OS lets us (Linux)."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    videos_dir = os.path.join(directory, "assets", "videos")
+    for name in os.listdir(videos_dir):
+        fd = os.open(os.path.join(videos_dir, name), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def process_io(pid):
+    """(bytes read by read() calls, bytes read from storage) of process `pid`, or None."""
+    try:
+        with open(f"/proc/{pid}/io", encoding="ascii") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["read_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# -------------------------------------------------------------------
+# Viewers
+# -------------------------------------------------------------------
+async def viewer(port, name, size, range_bytes, delay, latencies, errors):
+    """Stream lecture `name` start to end in range requests, after `delay` seconds."""
+    await asyncio.sleep(delay)
+    connection = Connection(port)
+    received = 0
+    for offset in range(0, size, range_bytes):
+        last = min(offset + range_bytes, size) - 1
+        start = time.perf_counter()
+        try:
+            status, _, count = await connection.get(f"/video/{name}", {"Range": f"bytes={offset}-{last}"})
+        except (OSError, asyncio.IncompleteReadError) as error:
+            errors.append(repr(error))
+            await connection.close()
+            continue
+        if status != 206 or count != last - offset + 1:
+            errors.append(f"{name} bytes={offset}-{last}: HTTP {status}, {count} bytes")
+        latencies.append((time.perf_counter() - start) * 1000)
+        received += count
+    await connection.close()
+    return received
+
+
+async def classroom(port, lectures, size, args):
+    latencies, errors = [], []
+    rng = random.Random(42)
+    start = time.perf_counter()
+    received = await asyncio.gather(*(
+        viewer(port, f"lecture-{i % lectures}.mp4", size, args.range_kb * 1024,
+               rng.uniform(0, args.spread), latencies, errors)
+        for i in range(args.viewers)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies) or [0.0]
+    for error in sorted(set(errors))[:5]:
+        print(f"  error: {error}", file=sys.stderr)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "mb_per_s": sum(received) / 1e6 / elapsed,
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+    }
+
+
+async def fetch_stats(port):
+    connection = Connection(port)
+    status, _, body = await connection.get("/stats/cache", keep_body=True)
+    await connection.close()
+    return json.loads(body) if status == 200 else None
+
+
+# -------------------------------------------------------------------
+# Main
+# -------------------------------------------------------------------
+def bench(engine, cache_mb, args, directory, size):
+    if args.cold:
+        evict_from_page_cache(directory)
+    os.environ["LMS_VIDEO_CACHE_MB"] = str(cache_mb)      # read by the server child at import
+    child = start_server(engine, args.port, directory)
+    try:
+        io_before = process_io(child.pid)
+        result = asyncio.run(classroom(args.port, args.lectures, size, args))
+        io_after = process_io(child.pid)
+        stats = asyncio.run(fetch_stats(args.port))
+    finally:
+        child.terminate()
+        child.wait()
+    result["hit_ratio"] = stats["hit_ratio"] if cache_mb else None
+    result["resident_mb"] = stats["resident"] / 1e6 if cache_mb else None
+    if io_before and io_after:
+        result["read_calls_mb"] = (io_after[0] - io_before[0]) / 1e6
+        result["storage_read_mb"] = (io_after[1] - io_before[1]) / 1e6
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_video_cache", description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=("flask", "asyncio", "both"), default="both")
+    parser.add_argument("--viewers", type=int, default=30, help="concurrent viewers (default: %(default)s)")
+    parser.add_argument("--lectures", type=int, default=1, help="distinct lectures watched (default: %(default)s)")
+    parser.add_argument("--size-mb", type=float, default=40.0, help="size of each lecture (default: %(default)s)")
+    parser.add_argument("--range-kb", type=int, default=1024, help="bytes per range request (default: %(default)s)")
+    parser.add_argument("--spread", type=float, default=2.0, help="seconds over which viewers join (default: %(default)s)")
+    parser.add_argument("--cache-mb", type=float, default=256.0, help="cache budget when on (default: %(default)s)")
+    parser.add_argument("--cold", action="store_true", help="evict the lectures from the OS page cache before each run")
+    parser.add_argument("--port", type=int, default=5097)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    size = int(args.size_mb * 1e6)
+    engines = ("flask", "asyncio") if args.engine == "both" else (args.engine,)
+    directory = tempfile.mkdtemp(prefix="lms-bench-cache-")
+    results = {}
+    try:
+        make_lectures(directory, args.lectures, size)
+        for engine in engines:
+            for label, cache_mb in (("cache", args.cache_mb), ("no cache", 0)):
+                results[f"{engine}/{label}"] = bench(engine, cache_mb, args, directory, size)
+    finally:
+        shutil.rmtree(directory)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{args.viewers} viewers of {args.lectures} x {args.size_mb:g} MB lecture(s), "
+          f"{args.range_kb} KB ranges, joining over {args.spread:g}s" + (", cold page cache" if args.cold else ""))
+    print(f"{'run':<18}{'MB/s':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'hits':>7}{'res MB':>8}"
+          f"{'read MB':>9}{'disk MB':>9}{'errors':>8}" + (f"{'vs base':>10}" if baseline else ""))
+    for run, stats in results.items():
+        hits = f"{stats['hit_ratio']:.0%}" if stats["hit_ratio"] is not None else "-"
+        resident = f"{stats['resident_mb']:.0f}" if stats["resident_mb"] is not None else "-"
+        line = (f"{run:<18}{stats['mb_per_s']:>8.0f}{stats['p50_ms']:>9.1f}{stats['p90_ms']:>9.1f}"
+                f"{stats['p99_ms']:>9.1f}{hits:>7}{resident:>8}"
+                f"{stats.get('read_calls_mb', 0):>9.0f}{stats.get('storage_read_mb', 0):>9.0f}{stats['errors']:>8}")
+        if baseline and run in baseline:
+            line += f"{stats['p50_ms'] / baseline[run]['p50_ms']:>9.2f}x"
+        print(line)
+
+    if args.out:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "viewers": args.viewers,
+            "lectures": args.lectures,
+            "size_mb": args.size_mb,
+            "range_kb": args.range_kb,
+            "cache_mb": args.cache_mb,
+            "cold": args.cold,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
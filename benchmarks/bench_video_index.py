@@ -0,0 +1,262 @@
+# benchmarks/bench_video_index.py
+"""Correctness and speed of the video index (db/videos.py, utils/mp4.py).
+
+There are no sample lectures in the repo and no ffmpeg to make them, so
+this writes MP4 files box by box, the way encoders lay them out: moov
+before or after mdat, version 0 and 1 headers, a 64-bit mdat size, one
+video and one audio track. It first checks that utils.mp4 reads back
+the duration, size and codecs each file was written with (and rejects
+broken files), then builds a throwaway project with --files lectures
+and times a full scan, a rescan with nothing changed, a rescan after
+--touch files changed, and the topic-page lookup against the filesystem
+checks it replaces. Run from the project root:
+    python -m benchmarks.bench_video_index
+    python -m benchmarks.bench_video_index --files 2000 --out index.json
+    python -m benchmarks.bench_video_index --compare index.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+from benchmarks._common import git_rev, make_project
+from utils import mp4
+
+IDENTITY_MATRIX = struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+
+
+# -------------------------------------------------------------------
+# Synthetic MP4 files (ISO/IEC 14496-12 layouts)
+# -------------------------------------------------------------------
+def box(kind, *payload):
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), kind.encode("latin-1")) + body
+
+
+def full_box(kind, version, *payload):
+    return box(kind, struct.pack(">I", version << 24), *payload)
+
+
+def _mvhd(version, timescale, duration):
+    times = struct.pack(">QQIQ", 0, 0, timescale, duration) if version else struct.pack(">IIII", 0, 0, timescale, duration)
+    return full_box("mvhd", version, times, struct.pack(">IH10x", 0x10000, 0x100), IDENTITY_MATRIX,
+                    bytes(24), struct.pack(">I", 3))
+
+
+def _tkhd(version, track_id, duration, width, height):
+    if version:
+        times = struct.pack(">QQIIQ", 0, 0, track_id, 0, duration)
+    else:
+        times = struct.pack(">IIIII", 0, 0, track_id, 0, duration)
+    return full_box("tkhd", version, times, bytes(8), struct.pack(">hhhH", 0, 0, 0 if width else 0x100, 0),
+                    IDENTITY_MATRIX, struct.pack(">II", width << 16, height << 16))
+
+
+def _track(version, track_id, duration, handler, entry, width=0, height=0, tkhd_size=True):
+    stbl = box("stbl", full_box("stsd", 0, struct.pack(">I", 1), entry),
+               full_box("stts", 0, bytes(4)), full_box("stsc", 0, bytes(4)),
+               full_box("stsz", 0, bytes(8)), full_box("stco", 0, bytes(4)))
+    mdia = box("mdia",
+               full_box("mdhd", 0, struct.pack(">IIIIHH", 0, 0, 1000, duration, 0x55C4, 0)),
+               full_box("hdlr", 0, bytes(4), handler.encode(), bytes(12), b"handler\0"),
+               box("minf", box("dinf", full_box("dref", 0, struct.pack(">I", 0))), stbl))
+    size = (width, height) if tkhd_size else (0, 0)
+    return box("trak", _tkhd(version, track_id, duration, *size), mdia)
+
+
+def _visual_entry(codec, width, height):
+    return box(codec, bytes(6), struct.pack(">H", 1), bytes(16), struct.pack(">HH", width, height),
+               struct.pack(">II", 0x480000, 0x480000), bytes(4), struct.pack(">H", 1), bytes(32),
+               struct.pack(">Hh", 0x18, -1))
+
+
+def _audio_entry(codec):
+    return box(codec, bytes(6), struct.pack(">H", 1), bytes(8), struct.pack(">HH", 2, 16), bytes(4),
+               struct.pack(">I", 44100 << 16))
+
+
+def write_mp4(path, seconds=90.0, width=1280, height=720, codec="avc1", audio="mp4a",
+              version=0, moov_last=False, large_mdat=False, mdat_bytes=4096, tkhd_size=True):
+    """Write an MP4 with the given properties (mdat is filler) to `path`."""
+    duration = int(seconds * 1000)
+    tracks = [_track(version, 1, duration, "vide", _visual_entry(codec, width, height), width, height, tkhd_size)]
+    if audio:
+        tracks.append(_track(version, 2, duration, "soun", _audio_entry(audio)))
+    moov = box("moov", _mvhd(version, 1000, duration), *tracks)
+    ftyp = box("ftyp", b"isom", struct.pack(">I", 0x200), b"isomiso2avc1mp41")
+    if large_mdat:
+        mdat_header = struct.pack(">I4sQ", 1, b"mdat", 16 + mdat_bytes)
+    else:
+        mdat_header = struct.pack(">I4s", 8 + mdat_bytes, b"mdat")
+    with open(path, "wb") as f:
+        f.write(ftyp)
+        if not moov_last:
+            f.write(moov)
+        f.write(mdat_header)
+        f.truncate(f.tell() + mdat_bytes)   # sparse filler
+        f.seek(0, os.SEEK_END)
+        if moov_last:
+            f.write(moov)
+
+
+# -------------------------------------------------------------------
+# Correctness
+# -------------------------------------------------------------------
+CASES = [
+    ("moov first, v0", {}),
+    ("moov after mdat", {"moov_last": True, "mdat_bytes": 50_000_000}),
+    ("v1 headers, 64-bit mdat", {"version": 1, "large_mdat": True, "moov_last": True, "seconds": 5400.5}),
+    ("HEVC 4K, no audio", {"codec": "hvc1", "width": 3840, "height": 2160, "audio": None}),
+    ("size from stsd only", {"tkhd_size": False, "width": 640, "height": 360}),
+]
+
+
+def check_probe(directory):
+    """Probe each CASES file and two broken ones; returns the failures."""
+    failures = []
+    for name, options in CASES:
+        path = os.path.join(directory, "case.mp4")
+        write_mp4(path, **options)
+        expected = {"seconds": 90.0, "width": 1280, "height": 720, "codec": "avc1", "audio": "mp4a", **options}
+        info = mp4.probe(path)
+        got = (info.duration, info.width, info.height, info.codec, info.audio_codec)
+        want = (expected["seconds"], expected["width"], expected["height"], expected["codec"], expected["audio"])
+        if got != want:
+            failures.append(f"{name}: got {got}, expected {want}")
+
+    write_mp4(path, moov_last=True)
+    with open(path, "rb") as f:
+        broken = {"random bytes": os.urandom(5000), "moov cut short": f.read()[:-40]}
+    for name, data in broken.items():
+        with open(path, "wb") as f:
+            f.write(data)
+        try:
+            mp4.probe(path)
+            failures.append(f"{name}: no Mp4Error")
+        except mp4.Mp4Error:
+            pass
+    return failures
+
+
+# -------------------------------------------------------------------
+# Scan timing
+# -------------------------------------------------------------------
+def make_library(directory, files):
+    """A project dir with `files` lectures (every other one with moov last) and an empty index."""
+    videos_dir = make_project(directory)
+    for k in range(files):
+        subdir = os.path.join(videos_dir, f"class-{k % 20}")
+        os.makedirs(subdir, exist_ok=True)
+        write_mp4(os.path.join(subdir, f"lecture-{k}.mp4"), seconds=600 + k, moov_last=bool(k % 2),
+                  mdat_bytes=1_000_000)
+    os.chdir(directory)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def bench_scan(files, touch, lookups):
+    from db import videos
+    from db.cache import catalog_cache
+
+    results = {}
+    results["full_scan_ms"], counts = timed(videos.scan)
+    if counts["added"] != files or counts["errors"]:
+        sys.exit(f"full scan: {counts}")
+    results["rescan_ms"], counts = timed(videos.scan)
+    if counts["added"] or counts["updated"]:
+        sys.exit(f"rescan changed rows: {counts}")
+
+    for k in range(touch):
+        path = os.path.join("assets", "videos", f"class-{k % 20}", f"lecture-{k}.mp4")
+        write_mp4(path, seconds=60, moov_last=True, mdat_bytes=2_000_000)
+    results["touched_rescan_ms"], counts = timed(videos.scan)
+    if counts["updated"] != touch:
+        sys.exit(f"touched rescan: {counts}")
+
+    # The topic page used to resolve and stat the file on every open.
+    paths = [f"/assets/videos/class-{k % 20}/lecture-{k}.mp4" for k in range(min(files, 200))]
+
+    def filesystem():
+        for _ in range(lookups // len(paths)):
+            for path in paths:
+                os.path.exists(os.path.abspath(os.path.join(os.getcwd(), path.lstrip("/"))))
+
+    def indexed():
+        for _ in range(lookups // len(paths)):
+            for path in paths:
+                videos.lookup(path)
+
+    catalog_cache.clear()
+    n = lookups // len(paths) * len(paths)
+    results["filesystem_check_us"] = timed(filesystem)[0] * 1000 / n
+    results["index_lookup_us"] = timed(indexed)[0] * 1000 / n
+    results["probe_us"] = timed(lambda: [mp4.probe(p.lstrip("/")) for p in paths])[0] * 1000 / len(paths)
+    return results
+
+
+# -------------------------------------------------------------------
+# Main
+# -------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_video_index",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=500, help="lectures in the project (default: %(default)s)")
+    parser.add_argument("--touch", type=int, default=5, help="files changed before the last rescan (default: %(default)s)")
+    parser.add_argument("--lookups", type=int, default=20000, help="topic-page lookups timed (default: %(default)s)")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="lms-bench-index-")
+    cwd = os.getcwd()
+    try:
+        failures = check_probe(directory)
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+        print(f"probe: {len(CASES) + 2 - len(failures)}/{len(CASES) + 2} cases ok")
+        make_library(directory, args.files)
+        results = bench_scan(args.files, args.touch, args.lookups)
+    finally:
+        from db import connection
+        connection.close_all()
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{args.files} lectures, {args.touch} changed before the last rescan")
+    for name, value in results.items():
+        line = f"  {name:<24}{value:>12.2f}"
+        if baseline and name in baseline:
+            line += f"{value / baseline[name]:>9.2f}x"
+        print(line)
+
+    if args.out:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "files": args.files,
+            "touch": args.touch,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"results written to {args.out}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# benchmarks/bench_video_watch.py
+"""Batching and correctness of the assets/videos watcher (db/watcher.py).
+
+Builds a throwaway project whose topics point at lectures, starts the
+watcher on it (real watchdog observer, no start delay) and then, like
+an admin would:
+
+    burst     copies --files lectures into a new folder at once
+    rename    renames that folder (its topics must follow)
+    move      moves single lectures into another folder (topics follow)
+    delete    deletes lectures (their topics lose their video_path)
+
+For each step it reports the filesystem events seen, the DB
+transactions they became, and how long after the last file operation
+the index and topics were up to date. Run from the project root:
+    python -m benchmarks.bench_video_watch
+    python -m benchmarks.bench_video_watch --files 2000 --out watch.json
+    python -m benchmarks.bench_video_watch --compare watch.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks._common import git_rev, make_project
+from benchmarks.bench_video_index import write_mp4
+
+CLASS_NAME = "Watched"
+
+
+def make_watched_class(directory, files):
+    """Empty assets/videos and a class whose topic k points at burst/lecture-k.mp4."""
+    from db.database import add_new_class, add_topic_to_class
+
+    make_project(directory)
+    os.chdir(directory)
+    class_id = add_new_class(CLASS_NAME, "Grade 12")
+    for k in range(files):
+        add_topic_to_class(class_id, f"Lecture {k}", f"/assets/videos/burst/lecture-{k}.mp4", "Watched.")
+    return class_id
+
+
+def topic_paths(class_id):
+    from db import connection
+    return dict(connection.get_connection().execute(
+        "SELECT topic_name, video_path FROM topics WHERE class_id=?", (class_id,)))
+
+
+def indexed(prefix):
+    from db import connection
+    return connection.get_connection().execute(
+        "SELECT COUNT(*) FROM videos WHERE path > ? AND path < ?", (prefix + "/", prefix + "0")).fetchone()[0]
+
+
+def settle(watcher, done, timeout=60.0):
+    """Wait until `done()` holds and no batch is pending; seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if not watcher.pending() and done():
+            return time.perf_counter() - start
+        time.sleep(0.01)
+    sys.exit("watcher did not catch up")
+
+
+def step(watcher, name, action, done, results):
+    events, batches = watcher.events, watcher.batches
+    start = time.perf_counter()
+    action()
+    acted = time.perf_counter() - start
+    lag = settle(watcher, done)
+    results[name] = {
+        "events": watcher.events - events,
+        "transactions": watcher.batches - batches,
+        "action_s": acted,
+        "caught_up_s": lag,
+    }
+
+
+def run(files):
+    from db.watcher import VideoWatcher
+
+    class_id = make_watched_class(os.getcwd(), files)
+    watcher = VideoWatcher(start_delay=0)
+    watcher.start()
+    watcher.ready.wait()
+    results = {}
+    videos_dir = os.path.join("assets", "videos")
+    moved = files // 10
+
+    def burst():
+        # Written straight into place, as a copy would: created + modified events per file.
+        os.makedirs(os.path.join(videos_dir, "burst"))
+        for k in range(files):
+            write_mp4(os.path.join(videos_dir, "burst", f"lecture-{k}.mp4"), seconds=600 + k, mdat_bytes=200_000)
+
+    step(watcher, "burst", burst, lambda: indexed("assets/videos/burst") == files, results)
+
+    def rename():
+        os.rename(os.path.join(videos_dir, "burst"), os.path.join(videos_dir, "term-1"))
+
+    step(watcher, "rename", rename,
+         lambda: indexed("assets/videos/term-1") == files
+         and topic_paths(class_id)["Lecture 0"] == "/assets/videos/term-1/lecture-0.mp4", results)
+
+    def move():
+        os.makedirs(os.path.join(videos_dir, "archive"))
+        for k in range(moved):
+            os.rename(os.path.join(videos_dir, "term-1", f"lecture-{k}.mp4"),
+                      os.path.join(videos_dir, "archive", f"lecture-{k}.mp4"))
+
+    step(watcher, "move", move,
+         lambda: indexed("assets/videos/archive") == moved
+         and topic_paths(class_id)[f"Lecture {moved - 1}"] == f"/assets/videos/archive/lecture-{moved - 1}.mp4",
+         results)
+
+    def delete():
+        for k in range(moved, 2 * moved):
+            os.remove(os.path.join(videos_dir, "term-1", f"lecture-{k}.mp4"))
+
+    step(watcher, "delete", delete,
+         lambda: indexed("assets/videos/term-1") == files - 2 * moved
+         and topic_paths(class_id)[f"Lecture {2 * moved - 1}"] is None, results)
+
+    watcher.stop()
+    watcher.join()
+
+    paths = topic_paths(class_id)
+    expected = {f"Lecture {k}": (f"/assets/videos/archive/lecture-{k}.mp4" if k < moved else
+                                 None if k < 2 * moved else f"/assets/videos/term-1/lecture-{k}.mp4")
+                for k in range(files)}
+    wrong = [name for name, path in expected.items() if paths.get(name) != path]
+    return results, wrong
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_video_watch",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=500, help="lectures in the burst (default: %(default)s)")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="lms-bench-watch-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(directory)
+        results, wrong = run(args.files)
+    finally:
+        from db import connection
+        connection.close_all()
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{args.files} lectures")
+    print(f"{'step':<10}{'events':>8}{'writes':>8}{'action s':>10}{'caught up s':>13}"
+          + (f"{'vs base':>10}" if baseline else ""))
+    for name, stats in results.items():
+        line = (f"{name:<10}{stats['events']:>8}{stats['transactions']:>8}{stats['action_s']:>10.2f}"
+                f"{stats['caught_up_s']:>13.2f}")
+        if baseline and name in baseline:
+            line += f"{stats['caught_up_s'] / baseline[name]['caught_up_s']:>9.2f}x"
+        print(line)
+    print(f"topics: {args.files - len(wrong)}/{args.files} point where expected")
+    for name in wrong[:5]:
+        print(f"  wrong: {name}", file=sys.stderr)
+
+    if args.out:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "files": args.files,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"results written to {args.out}")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
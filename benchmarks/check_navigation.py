@@ -0,0 +1,143 @@
+# benchmarks/check_navigation.py
+"""Check that navigating between pages leaks no handlers, widgets or memory.
+
+Needs a display (Tk) and a database with classes for --grade (a copy,
+it is only read). Run from the project root:
+    python -m benchmarks.check_navigation /tmp/lms_copy.db
+    python -m benchmarks.check_navigation /tmp/lms_copy.db --navigations 1000
+
+Walks the student pages (dashboard -> class -> topic and Back) and the
+admin pages (dashboard -> each edit page and Back) through the router,
+hovering each page's scroll area so its wheel binding is made and
+released. After a warm-up and again at the end it returns to the login
+page and counts Tcl commands, bindings on "all", pending after() calls,
+widgets and RSS. Exits 1 if any count grew or RSS grew more than
+--max-rss-mb.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+from db import connection
+from db.database import get_classes_by_grade, get_topics_by_class, get_topic_content
+from benchmarks._common import count_widgets, rss_bytes
+
+WARMUP = 50
+
+
+def pick_student_path(grade):
+    """A class of `grade` with a topic whose video exists (topic may be None)."""
+    for class_name in get_classes_by_grade(grade)[:50]:
+        for topic in get_topics_by_class(class_name, grade):
+            video_path, _ = get_topic_content(class_name, topic, grade)
+            if video_path and os.path.exists(video_path.strip().replace("\\", "/").lstrip("/")):
+                return class_name, topic
+    classes = get_classes_by_grade(grade)
+    return (classes[0], None) if classes else (None, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.check_navigation", description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="database file (a copy; it is only read)")
+    parser.add_argument("--navigations", type=int, default=1000, help="page opens + Backs (default: %(default)s)")
+    parser.add_argument("--grade", default="Grade 12")
+    parser.add_argument("--max-rss-mb", type=float, default=10.0, help="allowed RSS growth (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    connection.configure(args.db)
+    class_name, topic = pick_student_path(args.grade)
+    if class_name is None:
+        sys.exit(f"no classes for {args.grade} in {args.db}")
+
+    import tkinter as tk
+    from main import next_page
+    from ui.router import Router
+    from ui.db_worker import get_worker
+    from ui.login_page import open_login_page
+    from ui.student_dashboard import open_student_dashboard
+    from ui.class_page import open_class_page
+    from ui.topic_page import open_topic_page
+    from ui.admin_dashboard import open_admin_dashboard
+    from ui.edit_users import open_edit_users
+    from ui.edit_classes import open_edit_classes
+    from ui.edit_topics import open_edit_topics
+    from ui.query_profile import open_query_profile
+
+    root = tk.Tk()
+    root.geometry("1200x900")
+    router = Router(root)
+    router.set_home(open_login_page, next_page)
+    worker = get_worker(root)
+
+    def settle():
+        """Let the page's DB tasks finish and Tk process the results."""
+        root.update()
+        while worker._pending:
+            time.sleep(0.002)
+            root.update()
+
+    def hover():
+        area = getattr(router.current.canvas, "master", None)
+        area = getattr(area, "_scroll_area", None)
+        if area is not None:
+            area._on_enter(None)
+            area._on_leave(None)
+
+    student = [lambda: router.reset(open_student_dashboard, "nav-check", args.grade),
+               lambda: router.open(open_class_page, "nav-check", args.grade, class_name)]
+    if topic is not None:
+        student += [lambda: router.open(open_topic_page, "nav-check", args.grade, class_name, topic), router.back]
+    student += [router.back]
+    admin = [lambda: router.reset(open_admin_dashboard, "nav-check")]
+    for page in (open_edit_users, open_edit_classes, open_edit_topics, open_query_profile):
+        admin += [lambda page=page: router.open(page, "nav-check"), router.back]
+    steps = student + admin
+
+    def snapshot():
+        router.home()
+        settle()
+        gc.collect()
+        return {
+            "tcl commands": len(root.tk.call("info", "commands")),
+            "bindings on all": len(root.bind_all()),
+            "pending after()": len(root.tk.call("after", "info")),
+            "widgets": count_widgets(root),
+            "python objects": len(gc.get_objects()),
+            "rss MB": (rss_bytes() or 0) / 1e6,
+        }
+
+    def walk(count):
+        for i in range(count):
+            steps[i % len(steps)]()
+            settle()
+            hover()
+
+    walk(WARMUP)
+    before = snapshot()
+    start = time.perf_counter()
+    walk(args.navigations)
+    elapsed = time.perf_counter() - start
+    after = snapshot()
+    root.destroy()
+
+    print(f"{args.navigations} navigations in {elapsed:.1f}s "
+          f"({elapsed / args.navigations * 1000:.1f} ms each, topic page {'on' if topic else 'skipped: no video'})")
+    print(f"{'':<18}{'before':>12}{'after':>12}")
+    failed = []
+    for name in before:
+        print(f"{name:<18}{before[name]:>12.1f}{after[name]:>12.1f}" if name == "rss MB"
+              else f"{name:<18}{before[name]:>12}{after[name]:>12}")
+        if name == "rss MB":
+            if after[name] - before[name] > args.max_rss_mb:
+                failed.append(name)
+        elif name != "python objects" and after[name] > before[name]:
+            failed.append(name)
+    if failed:
+        sys.exit("grew: " + ", ".join(failed))
+    print("ok: nothing grew")
+
+
+if __name__ == "__main__":
+    main()
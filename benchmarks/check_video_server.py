@@ -0,0 +1,257 @@
+# benchmarks/check_video_server.py
+"""Check the video server's HTTP behaviour byte for byte, on every engine.
+
+Run from the project root:
+    python -m benchmarks.check_video_server
+    python -m benchmarks.check_video_server --engine asyncio
+
+Serves a generated file (each byte is its offset mod 251, so any wrong
+offset shows) with each engine in a child process and checks Range
+requests: single, suffix and open ranges, ranges clamped at the end,
+multipart/byteranges, merged overlaps, 416s, ignored malformed headers,
+If-Range and HEAD. Then the /topic/<id> player page (right lecture,
+escaped title, 404s), conditional GET and compression: validators
+and Cache-Control on the page and the video, gzip (and brotli when
+installed) negotiation, and that a revisit with the validators gets a
+304 whose raw bytes on the wire are headers only. Exits 1 if any engine
+fails a check.
+"""
+import argparse
+import email.parser
+import gzip
+import http.client
+import os
+import socket
+import shutil
+import sys
+import tempfile
+
+from benchmarks._common import make_project
+from benchmarks.bench_video import start_server
+from server.responses import brotli
+
+SIZE = 100_000
+NAME = "check.mp4"
+EMPTY = "empty.mp4"
+
+
+def make_checked_topic(directory):
+    """The checked files under assets/videos and a topic playing NAME; returns its id."""
+    from db import connection
+    from db.database import add_new_class, add_topic_to_class
+
+    videos = make_project(directory)
+    with open(os.path.join(videos, NAME), "wb") as f:
+        f.write(expected(0, SIZE))
+    open(os.path.join(videos, EMPTY), "wb").close()
+    topic_id = add_topic_to_class(add_new_class("Checks", "Grade 12"), "Range & cache",
+                                  f"assets\\videos\\{NAME}", "Checked.")
+    connection.close_all()
+    return topic_id
+
+
+def expected(start, end):
+    """Bytes start..end-1 of the generated file."""
+    return bytes(i % 251 for i in range(start, end))
+
+
+class Checker:
+    def __init__(self, port, topic_id):
+        self.port = port
+        self.topic_id = topic_id
+        self.page_path = f"/topic/{topic_id}"
+        self.failures = []
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+
+    def request(self, headers=None, method="GET", path=f"/video/{NAME}"):
+        self.connection.request(method, path, headers=headers or {})
+        response = self.connection.getresponse()
+        return response, response.read()
+
+    def check(self, name, condition, detail=""):
+        if not condition:
+            self.failures.append(f"{name}: {detail}")
+
+    def raw(self, path, headers):
+        """(status, bytes after the header block) of a request on a fresh connection."""
+        lines = [f"GET {path} HTTP/1.1", "Host: 127.0.0.1", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        received = b""
+        with socket.create_connection(("127.0.0.1", self.port), timeout=10) as sock:
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            while chunk := sock.recv(65536):
+                received += chunk
+        head, _, body = received.partition(b"\r\n\r\n")
+        return int(head.split()[1]), body
+
+    def revisit(self, label, path, headers):
+        status, body = self.raw(path, headers)
+        self.check(label, status == 304, f"status {status}")
+        self.check(label, body == b"", f"{len(body)} body bytes on the wire")
+
+    def single(self, range_header, start, end, headers=None):
+        response, body = self.request({"Range": range_header, **(headers or {})})
+        label = f"Range {range_header}" + "".join(f" + {name}" for name in headers or ())
+        self.check(label, response.status == 206, f"status {response.status}")
+        self.check(label, response.getheader("Content-Range") == f"bytes {start}-{end - 1}/{SIZE}",
+                   response.getheader("Content-Range"))
+        self.check(label, body == expected(start, end), f"{len(body)} bytes, wanted {end - start}")
+
+    def whole(self, label, headers):
+        response, body = self.request(headers)
+        self.check(label, response.status == 200, f"status {response.status}")
+        self.check(label, body == expected(0, SIZE), f"{len(body)} bytes")
+
+    def unsatisfiable(self, range_header, path=f"/video/{NAME}", size=SIZE):
+        response, _ = self.request({"Range": range_header}, path=path)
+        label = f"Range {range_header} ({path})"
+        self.check(label, response.status == 416, f"status {response.status}")
+        self.check(label, response.getheader("Content-Range") == f"bytes */{size}",
+                   response.getheader("Content-Range"))
+
+    def multipart(self, range_header, ranges):
+        response, body = self.request({"Range": range_header})
+        label = f"Range {range_header}"
+        self.check(label, response.status == 206, f"status {response.status}")
+        content_type = response.getheader("Content-Type", "")
+        self.check(label, content_type.startswith("multipart/byteranges; boundary="), content_type)
+        self.check(label, int(response.getheader("Content-Length")) == len(body), "Content-Length")
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+        parts = message.get_payload()
+        self.check(label, len(parts) == len(ranges), f"{len(parts)} parts")
+        for part, (start, end) in zip(parts, ranges):
+            self.check(label, part["Content-Range"] == f"bytes {start}-{end - 1}/{SIZE}", part["Content-Range"])
+            self.check(label, part.get_payload(decode=True) == expected(start, end), f"part {start}-{end - 1}")
+
+    def run(self):
+        response, body = self.request()
+        self.check("GET", response.status == 200 and body == expected(0, SIZE), f"status {response.status}")
+        self.check("GET", response.getheader("Accept-Ranges") == "bytes", "no Accept-Ranges")
+        etag = response.getheader("ETag")
+        last_modified = response.getheader("Last-Modified")
+        self.check("GET", etag and last_modified, "no validators")
+
+        self.single("bytes=0-0", 0, 1)
+        self.single("bytes=0-499", 0, 500)
+        self.single(f"bytes={SIZE - 1}-{SIZE - 1}", SIZE - 1, SIZE)
+        self.single("bytes=40000-", 40000, SIZE)
+        self.single("bytes=-1", SIZE - 1, SIZE)
+        self.single("bytes=-500", SIZE - 500, SIZE)
+        self.single(f"bytes=-{SIZE * 2}", 0, SIZE)
+        self.single(f"bytes=99990-{SIZE * 5}", 99990, SIZE)
+        self.single("bytes=0-10,5-20", 0, 21)
+        self.single(f"bytes=10-19,{SIZE}-", 10, 20)
+
+        self.multipart("bytes=0-9,20-29", [(0, 10), (20, 30)])
+        self.multipart("bytes=-5,100-199", [(SIZE - 5, SIZE), (100, 200)])
+
+        self.unsatisfiable(f"bytes={SIZE}-")
+        self.unsatisfiable("bytes=-0")
+        self.unsatisfiable("bytes=0-", path=f"/video/{EMPTY}", size=0)
+
+        self.whole("Range bytes=5-2 (malformed)", {"Range": "bytes=5-2"})
+        self.whole("Range items=0-5 (unknown unit)", {"Range": "items=0-5"})
+        self.whole("Range with 20 ranges", {"Range": "bytes=" + ",".join(f"{i * 10}-{i * 10}" for i in range(20))})
+
+        self.single("bytes=100-199", 100, 200, {"If-Range": etag})
+        self.single("bytes=100-199", 100, 200, {"If-Range": last_modified})
+        self.whole("If-Range stale ETag", {"Range": "bytes=100-199", "If-Range": '"0-0"'})
+        self.whole("If-Range weak ETag", {"Range": "bytes=100-199", "If-Range": f"W/{etag}"})
+        self.whole("If-Range old date", {"Range": "bytes=100-199", "If-Range": "Mon, 01 Jan 2001 00:00:00 GMT"})
+
+        response, body = self.request({"Range": "bytes=0-99"}, method="HEAD")
+        self.check("HEAD", response.status == 206 and body == b"", f"status {response.status}, {len(body)} bytes")
+        self.check("HEAD", response.getheader("Content-Length") == "100", response.getheader("Content-Length"))
+
+        response, body = self.request(path=f"/video/{EMPTY}")
+        self.check("empty file", response.status == 200 and body == b"", f"status {response.status}")
+        response, _ = self.request(path="/video/missing.mp4")
+        self.check("missing file", response.status == 404, f"status {response.status}")
+
+        self.check_topics()
+        self.check_caching(etag, last_modified)
+        return self.failures
+
+
+    def check_topics(self):
+        response, page = self.request(path=self.page_path)
+        label = self.page_path
+        self.check(label, response.status == 200, f"status {response.status}")
+        self.check(label, b"<title>Checks - Range &amp; cache</title>" in page, "wrong or unescaped title")
+        self.check(label, f'src="/video/{NAME}"'.encode() in page, "wrong video link")
+        for path in (f"/topic/{self.topic_id + 1000}", "/topic/abc", "/topic/"):
+            response, _ = self.request(path=path)
+            self.check(path, response.status == 404, f"status {response.status}")
+
+    def check_caching(self, etag, last_modified):
+        path = f"/video/{NAME}"
+        response, _ = self.request({"Range": "bytes=0-0"})
+        self.check("video Cache-Control", response.getheader("Cache-Control"), "missing")
+        self.revisit("video If-None-Match", path, {"If-None-Match": etag})
+        self.revisit("video If-None-Match weak", path, {"If-None-Match": f'"nope", W/{etag}'})
+        self.revisit("video If-None-Match *", path, {"If-None-Match": "*"})
+        self.revisit("video If-Modified-Since", path, {"If-Modified-Since": last_modified})
+        self.revisit("video If-None-Match + Range", path, {"If-None-Match": etag, "Range": "bytes=0-99"})
+        self.whole("video stale If-None-Match", {"If-None-Match": '"0-0"', "If-Modified-Since": last_modified})
+        self.whole("video old If-Modified-Since", {"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+
+        response, plain = self.request(path=self.page_path)
+        label = "page identity"
+        self.check(label, response.status == 200 and b"<video" in plain, f"status {response.status}")
+        self.check(label, response.getheader("Content-Encoding") is None, response.getheader("Content-Encoding"))
+        self.check(label, response.getheader("Cache-Control") == "no-cache", response.getheader("Cache-Control"))
+        plain_etag = response.getheader("ETag")
+
+        response, body = self.request({"Accept-Encoding": "gzip, deflate"}, path=self.page_path)
+        label = "page gzip"
+        self.check(label, response.getheader("Content-Encoding") == "gzip", response.getheader("Content-Encoding"))
+        self.check(label, response.getheader("Vary") == "Accept-Encoding", response.getheader("Vary"))
+        self.check(label, gzip.decompress(body) == plain, "does not decompress to the page")
+        self.check(label, len(body) < len(plain), f"{len(body)} >= {len(plain)} bytes")
+        gzip_etag = response.getheader("ETag")
+        self.check(label, gzip_etag and gzip_etag != plain_etag, "same ETag as identity")
+
+        response, body = self.request({"Accept-Encoding": "gzip;q=0, identity"}, path=self.page_path)
+        self.check("page gzip;q=0", response.getheader("Content-Encoding") is None and body == plain,
+                   response.getheader("Content-Encoding"))
+        if brotli is not None:
+            response, body = self.request({"Accept-Encoding": "gzip, br"}, path=self.page_path)
+            self.check("page br", response.getheader("Content-Encoding") == "br"
+                       and brotli.decompress(body) == plain, response.getheader("Content-Encoding"))
+
+        self.revisit("page If-None-Match", self.page_path, {"If-None-Match": plain_etag})
+        self.revisit("page If-None-Match gzip", self.page_path, {"If-None-Match": gzip_etag, "Accept-Encoding": "gzip"})
+        status, body = self.raw(self.page_path, {"If-None-Match": '"stale"'})
+        self.check("page stale If-None-Match", status == 200 and body == plain, f"status {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.check_video_server", description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=("flask", "asyncio", "both"), default="both")
+    parser.add_argument("--port", type=int, default=5098)
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="lms-check-video-")
+    failed = False
+    try:
+        topic_id = make_checked_topic(directory)
+        for engine in ("flask", "asyncio") if args.engine == "both" else (args.engine,):
+            child = start_server(engine, args.port, directory)
+            try:
+                failures = Checker(args.port, topic_id).run()
+            finally:
+                child.terminate()
+                child.wait()
+            print(f"{engine}: {'ok' if not failures else f'{len(failures)} failed'}")
+            for failure in failures:
+                print(f"  {failure}")
+            failed = failed or bool(failures)
+    finally:
+        shutil.rmtree(directory)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# benchmarks/datagen.py
+"""Populate a database with synthetic users, classes and topics.
+
+Run from the project root:
+    python -m benchmarks.datagen /tmp/big.db --users 100000 --classes 5000 --topics 1000000
+
+The file is created (or extended) at the current schema. Output is
+deterministic for a given --seed. The FTS triggers are dropped during
+the load and the search index is rebuilt in one pass afterwards.
+"""
+import argparse
+import random
+import sys
+import time
+
+from db import connection
+from db.connection import get_connection
+from db.migrations import migrate
+
+GRADES = ("Grade 12", "Grade 13")
+
+SUBJECTS = (
+    "Accounting", "Business Studies", "Economics", "Mathematics", "Physics", "Chemistry",
+    "Biology", "Geography", "History", "Literature", "Statistics", "Information Technology",
+    "Political Science", "Logic", "Agriculture", "Art", "Drama", "Music",
+)
+
+TOPIC_HEADS = (
+    "Introduction to", "Fundamentals of", "Advanced", "Revision:", "Past Paper on", "Applied",
+    "Case Study:", "Principles of", "Theory of", "Practical",
+)
+
+TOPIC_NOUNS = (
+    "Cash Flow", "Balance Sheets", "Depreciation", "Market Structures", "Elasticity", "Inflation",
+    "Partnerships", "Ledger Accounts", "Demand and Supply", "Interest Rates", "Taxation",
+    "Cost Accounting", "Budgeting", "Trade", "Banking", "Derivatives", "Vectors", "Kinematics",
+    "Organic Reactions", "Genetics", "Ecosystems", "Probability", "Regression", "Algorithms",
+)
+
+WORDS = (
+    "this lesson covers the main ideas behind {noun} with worked examples and practice "
+    "questions drawn from recent examination papers students should review the previous "
+    "unit before watching the video and attempt the exercises afterwards key terms are "
+    "defined and common mistakes are highlighted throughout the session including a short "
+    "summary at the end together with links to further reading and revision notes"
+).split()
+
+BATCH = 10000
+
+
+def _description(rng, noun):
+    """~150-400 characters of filler text mentioning the topic."""
+    words = rng.sample(WORDS, rng.randint(25, min(60, len(WORDS))))
+    return " ".join(words).replace("{noun}", noun.lower()).capitalize() + "."
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def gen_users(rng, count):
+    for i in range(count):
+        if i % 50 == 0:
+            yield (f"admin{i:07d}", f"pw{rng.randrange(10 ** 8):08d}", "admin", None)
+        else:
+            yield (f"student{i:07d}", f"pw{rng.randrange(10 ** 8):08d}", "student", rng.choice(GRADES))
+
+
+def gen_classes(count):
+    for i in range(count):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        yield (f"{subject} {i // len(SUBJECTS) + 1}", GRADES[i % 2])
+
+
+def gen_topics(rng, class_ids, count):
+    """Spread `count` topics over `class_ids` (unique name per class)."""
+    per_class, extra = divmod(count, len(class_ids))
+    for n, class_id in enumerate(class_ids):
+        for i in range(per_class + (n < extra)):
+            noun = TOPIC_NOUNS[(i + n) % len(TOPIC_NOUNS)]
+            name = f"{TOPIC_HEADS[i % len(TOPIC_HEADS)]} {noun} {i + 1}"
+            video = f"/assets/videos/class{class_id}_topic{i + 1}.mp4"
+            yield (class_id, name, video, _description(rng, noun))
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _insert(conn, sql, rows, label, started):
+    total = 0
+    for batch in _batches(rows):
+        conn.executemany(sql, batch)
+        total += len(batch)
+        print(f"\r  {label}: {total:,} ({time.perf_counter() - started:.1f}s)", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+
+def generate(db_path, users=1000, classes=100, topics=10000, seed=1):
+    """Add synthetic rows to `db_path`. Returns the row counts added."""
+    rng = random.Random(seed)
+    connection.configure(db_path)
+    migrate()
+    conn = get_connection()
+    started = time.perf_counter()
+
+    triggers = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type='trigger' AND tbl_name IN ('topics', 'classes')"
+    ).fetchall()
+
+    before = {table: _count(conn, table) for table in ("users", "classes", "topics")}
+
+    with conn:
+        conn.execute("BEGIN")      # the trigger DDL is part of the transaction too
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+
+        _insert(conn, "INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?)",
+                gen_users(rng, users), "users", started)
+        _insert(conn, "INSERT OR IGNORE INTO classes (class_name, grade) VALUES (?, ?)",
+                gen_classes(classes), "classes", started)
+        class_ids = [r[0] for r in conn.execute("SELECT id FROM classes ORDER BY id")]
+        if class_ids:
+            _insert(conn, "INSERT OR IGNORE INTO topics (class_id, topic_name, video_path, description) "
+                          "VALUES (?, ?, ?, ?)", gen_topics(rng, class_ids, topics), "topics", started)
+
+        # Rebuild the search index in one pass, then restore the triggers.
+        conn.execute("DELETE FROM topics_fts")
+        conn.execute('''
+            INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+            SELECT t.id, t.topic_name, t.description, c.class_name, c.grade
+            FROM topics t JOIN classes c ON c.id = t.class_id
+        ''')
+        for _, sql in triggers:
+            conn.execute(sql)
+
+    added = {table: _count(conn, table) - n for table, n in before.items()}
+    conn.execute("ANALYZE")
+    print(f"  done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    connection.close_all()
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.datagen", description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="database file to create or extend")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--classes", type=int, default=100)
+    parser.add_argument("--topics", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    added = generate(args.db, args.users, args.classes, args.topics, args.seed)
+    print(", ".join(f"{count:,} {table}" for table, count in added.items()) + f" added to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
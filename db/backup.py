@@ -0,0 +1,284 @@
+# db/backup.py
+"""Online backups and restore of the LMS database.
+
+    python -m db.backup backup               # snapshot into ./backups
+    python -m db.backup list
+    python -m db.backup restore backups/lms-20250101-120000.db
+
+Snapshots use SQLite's online backup API, copying a batch of pages per
+step and sleeping between steps so the app keeps reading and writing
+while a backup runs. The copy reads from one pinned WAL snapshot, so it
+is a consistent point in time and never restarts because of app writes.
+Each snapshot is written to a temporary file and renamed into place, so
+a snapshot file is always complete. The newest LMS_BACKUP_KEEP
+snapshots are kept.
+
+The app also takes a snapshot every LMS_BACKUP_INTERVAL minutes in a
+background thread (0 disables it).
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from db import connection
+from db.cache import catalog_cache
+from db.migrations import migrate
+
+STEP_PAGES = 1024          # pages copied per step (4 MB with 4 KB pages)
+STEP_SLEEP = 0.01          # seconds to yield to the app between steps
+DEFAULT_KEEP = int(os.environ.get("LMS_BACKUP_KEEP", "10"))
+DEFAULT_INTERVAL_MIN = float(os.environ.get("LMS_BACKUP_INTERVAL", "60"))
+
+SNAPSHOT_TIME = "%Y%m%d-%H%M%S"
+
+log = logging.getLogger("lms.db.backup")
+
+BackupResult = namedtuple("BackupResult", "path pages bytes seconds")
+
+
+def default_dir():
+    """LMS_BACKUP_DIR, or a backups/ folder next to the database."""
+    configured = os.environ.get("LMS_BACKUP_DIR")
+    if configured:
+        return configured
+    db_path = connection.get_db_path()
+    base = "." if db_path == ":memory:" else os.path.dirname(os.path.abspath(db_path))
+    return os.path.join(base, "backups")
+
+
+def _prefix():
+    db_path = connection.get_db_path()
+    name = "memory" if db_path == ":memory:" else os.path.splitext(os.path.basename(db_path))[0]
+    return name + "-"
+
+
+def list_snapshots(directory=None):
+    """Snapshot paths in `directory`, oldest first."""
+    directory = directory or default_dir()
+    if not os.path.isdir(directory):
+        return []
+    prefix = _prefix()
+    names = sorted(n for n in os.listdir(directory) if n.startswith(prefix) and n.endswith(".db"))
+    return [os.path.join(directory, n) for n in names]
+
+
+def rotate(directory=None, keep=DEFAULT_KEEP):
+    """Delete all but the newest `keep` snapshots. Returns the deleted paths."""
+    snapshots = list_snapshots(directory)
+    stale = snapshots[:-keep] if keep > 0 else []
+    for path in stale:
+        os.remove(path)
+    return stale
+
+
+# -------------------------------------------------------------------
+# Backup / restore
+# -------------------------------------------------------------------
+def _copy(src, dst, progress, pages, sleep):
+    """Run the backup API; returns (total pages, seconds)."""
+    total = [0]
+
+    def step(status, remaining, page_count):
+        total[0] = page_count
+        if progress is not None:
+            progress(page_count - remaining, page_count)
+        if remaining and sleep:
+            # The source lock is released between steps; give writers a turn.
+            time.sleep(sleep)
+
+    start = time.perf_counter()
+    src.backup(dst, pages=pages, progress=step)
+    return total[0], time.perf_counter() - start
+
+
+def backup(directory=None, keep=DEFAULT_KEEP, progress=None, pages=STEP_PAGES, sleep=STEP_SLEEP, label=""):
+    """Snapshot the configured database. Returns a BackupResult.
+
+    progress(done_pages, total_pages) is called after every step.
+    """
+    directory = directory or default_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = _prefix() + time.strftime(SNAPSHOT_TIME) + (f"-{label}" if label else "")
+    path = os.path.join(directory, name + ".db")
+    suffix = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{name}-{suffix}.db")
+        suffix += 1
+    tmp_path = path + ".part"
+
+    src = connection.open_connection()
+    dst = sqlite3.connect(tmp_path)
+    try:
+        # Pin one read snapshot for the whole copy. In WAL mode this does
+        # not block writers, and the steps no longer restart every time
+        # the app commits.
+        src.execute("BEGIN")
+        src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        page_count, seconds = _copy(src, dst, progress, pages, sleep)
+        dst.execute("PRAGMA journal_mode=DELETE")   # self-contained file, no -wal
+    except BaseException:
+        dst.close()
+        os.remove(tmp_path)
+        raise
+    finally:
+        src.close()
+    dst.close()
+    os.replace(tmp_path, path)
+
+    rotate(directory, keep)
+    return BackupResult(path, page_count, os.path.getsize(path), seconds)
+
+
+def check_snapshot(path):
+    """Raise ValueError unless `path` is a readable, intact LMS database."""
+    if not os.path.isfile(path):
+        raise ValueError(f"No such snapshot: {path}")
+    try:
+        conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        try:
+            result = conn.execute("PRAGMA quick_check").fetchone()[0]
+            tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"{path} is not a usable database: {e}")
+    if result != "ok":
+        raise ValueError(f"{path} failed quick_check: {result}")
+    if not {"users", "classes", "topics"} <= tables:
+        raise ValueError(f"{path} is not an LMS database")
+
+
+def restore(path, progress=None, safety_backup=True, directory=None):
+    """Replace the configured database's contents with snapshot `path`.
+
+    Goes through the backup API, so it is safe while other connections
+    are open; they see the restored data on their next query. Unless
+    disabled, the current data is snapshotted first into `directory`
+    (label "pre-restore"). Returns a BackupResult for the restore.
+    """
+    check_snapshot(path)
+    if safety_backup:
+        backup(directory, label="pre-restore", keep=0)
+
+    src = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    dst = connection.open_connection()
+    try:
+        page_count, seconds = _copy(src, dst, progress, -1, 0)
+    finally:
+        src.close()
+        dst.close()
+
+    migrate()                       # an older snapshot may predate the current schema
+    catalog_cache.clear()
+    return BackupResult(path, page_count, os.path.getsize(path), seconds)
+
+
+# -------------------------------------------------------------------
+# Scheduled backups
+# -------------------------------------------------------------------
+class BackupScheduler(threading.Thread):
+    """Takes a snapshot every `interval` seconds until stop() is called."""
+
+    def __init__(self, interval, directory=None, keep=DEFAULT_KEEP):
+        super().__init__(name="BackupScheduler", daemon=True)
+        self.interval = interval
+        self.directory = directory
+        self.keep = keep
+        self.last = None            # BackupResult of the latest run
+        self.last_error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.last = backup(self.directory, self.keep)
+                self.last_error = None
+                log.info("backup %s: %d pages, %.1f MB in %.2fs", self.last.path, self.last.pages,
+                         self.last.bytes / 1e6, self.last.seconds)
+            except (OSError, sqlite3.Error) as e:
+                self.last_error = e
+                log.error("scheduled backup failed: %s", e)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+
+
+def start_scheduler(interval_min=DEFAULT_INTERVAL_MIN, directory=None, keep=DEFAULT_KEEP):
+    """Start the background backup thread once. Returns it (None if disabled)."""
+    global _scheduler
+    if interval_min <= 0:
+        return None
+    if _scheduler is None or not _scheduler.is_alive():
+        _scheduler = BackupScheduler(interval_min * 60, directory, keep)
+        _scheduler.start()
+    return _scheduler
+
+
+def stop_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+def _progress_printer(verb):
+    start = time.perf_counter()
+
+    def show(done, total):
+        pct = done / total * 100 if total else 100.0
+        print(f"\r{verb}: {done}/{total} pages ({pct:.0f}%) {time.perf_counter() - start:.1f}s",
+              end="", file=sys.stderr)
+
+    return show
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m db.backup", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=connection.DEFAULT_DB_PATH, help="database file (default: %(default)s)")
+    parser.add_argument("--dir", help="snapshot directory (default: LMS_BACKUP_DIR or backups/ next to the DB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_backup = sub.add_parser("backup", help="take a snapshot now")
+    p_backup.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="snapshots to keep (default: %(default)s)")
+    sub.add_parser("list", help="list snapshots, oldest first")
+    p_restore = sub.add_parser("restore", help="replace the database with a snapshot")
+    p_restore.add_argument("snapshot")
+    p_restore.add_argument("--no-safety-backup", action="store_true",
+                           help="don't snapshot the current data first")
+
+    args = parser.parse_args(argv)
+    connection.configure(args.db)
+
+    try:
+        if args.command == "backup":
+            result = backup(args.dir, args.keep, progress=_progress_printer("backup"))
+            print(file=sys.stderr)
+            print(f"{result.path}: {result.pages} pages, {result.bytes / 1e6:.1f} MB in {result.seconds:.2f}s")
+        elif args.command == "list":
+            for path in list_snapshots(args.dir):
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(path)))
+                print(f"{stamp}  {os.path.getsize(path) / 1e6:>9.1f} MB  {path}")
+        else:
+            result = restore(args.snapshot, progress=_progress_printer("restore"),
+                             safety_backup=not args.no_safety_backup, directory=args.dir)
+            print(file=sys.stderr)
+            print(f"restored {args.db} from {result.path} ({result.pages} pages in {result.seconds:.2f}s)")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        parser.exit(1, f"\nerror: {e}\n")
+    finally:
+        connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+# db/bulk.py
+"""Bulk import/export of users, classes and topics.
+
+    python -m db.bulk import users.csv
+    python -m db.bulk import topics.json --table topics
+    python -m db.bulk export users users.csv
+    python -m db.bulk export topics --format json > topics.json
+
+Imports run in a single transaction with executemany. Rows that would
+violate a constraint are reported with their row number and skipped;
+the rest of the batch is still loaded.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from db import connection
+from db.cache import catalog_cache
+from db.connection import get_connection
+from db.migrations import migrate
+
+# -------------------------------------------------------------------
+# Table specs
+#   columns:  file columns, in export order
+#   required: columns a row must have
+#   insert:   table columns written on import
+#   key:      unique key, in terms of `insert` columns
+#   select:   export query (streams rows matching `columns`)
+# -------------------------------------------------------------------
+TABLES = {
+    "users": {
+        "columns": ("username", "password", "status", "grade"),
+        "required": ("username", "password", "status"),
+        "insert": ("username", "password", "status", "grade"),
+        "key": ("username",),
+        "select": "SELECT username, password, status, grade FROM users ORDER BY status DESC, username",
+    },
+    "classes": {
+        "columns": ("class_name", "grade"),
+        "required": ("class_name", "grade"),
+        "insert": ("class_name", "grade"),
+        "key": ("class_name", "grade"),
+        "select": "SELECT class_name, grade FROM classes ORDER BY grade, class_name",
+    },
+    "topics": {
+        # grade is only needed when the class name exists in several grades
+        "columns": ("topic_name", "class_name", "grade", "video_path", "description"),
+        "required": ("topic_name", "class_name"),
+        "insert": ("class_id", "topic_name", "video_path", "description"),
+        "key": ("class_id", "topic_name"),
+        "select": "SELECT t.topic_name, c.class_name, c.grade, t.video_path, t.description "
+                  "FROM topics t JOIN classes c ON c.id = t.class_id ORDER BY t.class_id, t.topic_name",
+    },
+}
+
+FORMATS = ("csv", "json", "jsonl")
+
+
+class ImportReport:
+    """Outcome of an import: how many rows went in and which were skipped."""
+
+    def __init__(self, table):
+        self.table = table
+        self.inserted = 0
+        self.conflicts = []     # (row_number, row_dict, reason)
+        self.seconds = 0.0
+
+    def conflict(self, row_number, row, reason):
+        self.conflicts.append((row_number, row, reason))
+
+    def __repr__(self):
+        return (f"<ImportReport {self.table}: {self.inserted} inserted, "
+                f"{len(self.conflicts)} conflicts, {self.seconds:.2f}s>")
+
+
+# -------------------------------------------------------------------
+# Reading / writing files
+# -------------------------------------------------------------------
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext == "ndjson":
+        return "jsonl"
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported file type '{ext}' (expected one of {', '.join(FORMATS)})")
+    return ext
+
+
+def detect_table(path):
+    stem = os.path.splitext(os.path.basename(path))[0].lower()
+    for table in TABLES:
+        if stem.startswith(table):
+            return table
+    raise ValueError(f"Cannot tell which table '{path}' belongs to; pass --table")
+
+
+def read_rows(path, fmt=None):
+    """Yield dict rows from a CSV, JSON (array of objects) or JSON Lines file."""
+    fmt = fmt or detect_format(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        elif fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get("rows", [])
+            yield from data
+
+
+def write_rows(out, columns, rows, fmt):
+    """Stream `rows` (tuples) to the file object `out`."""
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    elif fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+    else:
+        out.write("[")
+        for i, row in enumerate(rows):
+            out.write(",\n" if i else "\n")
+            out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        out.write("\n]\n")
+
+
+# -------------------------------------------------------------------
+# Import
+# -------------------------------------------------------------------
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value if value and value.lower() not in ("none", "null") else None
+
+
+def _existing_keys(conn, table, key):
+    cols = ", ".join(key)
+    return {tuple(row) for row in conn.execute(f"SELECT {cols} FROM {table}")}
+
+
+def _class_resolver(conn):
+    """Return resolve(row) -> (class_id, error) for topic rows."""
+    by_name_grade, by_name = {}, {}
+    for class_id, name, grade in conn.execute("SELECT id, class_name, grade FROM classes"):
+        by_name_grade[(name, grade)] = class_id
+        by_name.setdefault(name, []).append(class_id)
+
+    def resolve(row):
+        name, grade = row["class_name"], row["grade"]
+        if grade is not None:
+            class_id = by_name_grade.get((name, grade))
+            return (class_id, None) if class_id else (None, f"unknown class '{name}' in {grade}")
+        ids = by_name.get(name, [])
+        if len(ids) == 1:
+            return ids[0], None
+        if not ids:
+            return None, f"unknown class '{name}'"
+        return None, f"class '{name}' exists in several grades; add a grade column"
+
+    return resolve
+
+
+def import_rows(table, rows):
+    """Insert dict rows into `table` in one transaction. Returns an ImportReport."""
+    spec = TABLES[table]
+    columns, insert, key = spec["columns"], spec["insert"], spec["key"]
+    report = ImportReport(table)
+    start = time.perf_counter()
+
+    conn = get_connection()
+    seen = _existing_keys(conn, table, key)
+    resolve_class = _class_resolver(conn) if "class_id" in insert else None
+
+    batch, numbers = [], []
+    for number, raw in enumerate(rows, start=1):
+        row = {col: _clean(raw.get(col)) for col in columns}
+        missing = [col for col in spec["required"] if row[col] is None]
+        if missing:
+            report.conflict(number, row, f"missing {', '.join(missing)}")
+            continue
+        if resolve_class is not None:
+            row["class_id"], error = resolve_class(row)
+            if error:
+                report.conflict(number, row, error)
+                continue
+        row_key = tuple(row[col] for col in key)
+        if row_key in seen:
+            report.conflict(number, row, "already exists")
+            continue
+        seen.add(row_key)
+        batch.append(tuple(row[col] for col in insert))
+        numbers.append(number)
+
+    placeholders = ", ".join("?" for _ in insert)
+    sql = f"INSERT INTO {table} ({', '.join(insert)}) VALUES ({placeholders})"
+
+    with conn:
+        try:
+            conn.execute("SAVEPOINT bulk_import")
+            conn.executemany(sql, batch)
+            conn.execute("RELEASE bulk_import")
+            report.inserted = len(batch)
+        except sqlite3.IntegrityError:
+            # Someone else wrote a conflicting row since the keys were read;
+            # redo the batch row by row so only the offending rows are dropped.
+            conn.execute("ROLLBACK TO bulk_import")
+            conn.execute("RELEASE bulk_import")
+            for number, values in zip(numbers, batch):
+                try:
+                    conn.execute(sql, values)
+                    report.inserted += 1
+                except sqlite3.IntegrityError as e:
+                    report.conflict(number, dict(zip(insert, values)), str(e))
+
+    if report.inserted:
+        catalog_cache.clear()
+    report.conflicts.sort(key=lambda c: c[0])
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def import_file(path, table=None, fmt=None):
+    """Import a CSV/JSON/JSON Lines file. Returns an ImportReport."""
+    table = table or detect_table(path)
+    return import_rows(table, read_rows(path, fmt))
+
+
+# -------------------------------------------------------------------
+# Export
+# -------------------------------------------------------------------
+def iter_table(table, batch_size=1000):
+    """Yield rows of `table` as tuples without loading the whole table."""
+    cursor = get_connection().execute(TABLES[table]["select"])
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def export_table(table, out, fmt="csv"):
+    """Stream `table` to the file object `out`. Returns the row count."""
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in iter_table(table):
+            count += 1
+            yield row
+
+    write_rows(out, TABLES[table]["columns"], counted(), fmt)
+    return count
+
+
+def export_file(table, path, fmt=None):
+    fmt = fmt or detect_format(path)
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        return export_table(table, out, fmt)
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m db.bulk", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=connection.DEFAULT_DB_PATH, help="database file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="load rows from a CSV/JSON file")
+    p_import.add_argument("file")
+    p_import.add_argument("--table", choices=TABLES, help="target table (default: from file name)")
+    p_import.add_argument("--format", choices=FORMATS, help="file format (default: from extension)")
+    p_import.add_argument("--max-report", type=int, default=50, help="conflicts to print (default: %(default)s)")
+
+    p_export = sub.add_parser("export", help="write a table to a CSV/JSON file or stdout")
+    p_export.add_argument("table", choices=TABLES)
+    p_export.add_argument("file", nargs="?", help="output file (default: stdout)")
+    p_export.add_argument("--format", choices=FORMATS, help="file format (default: from extension, else csv)")
+
+    args = parser.parse_args(argv)
+    connection.configure(args.db)
+    migrate()
+
+    try:
+        if args.command == "import":
+            report = import_file(args.file, args.table, args.format)
+            print(f"{report.table}: {report.inserted} inserted, "
+                  f"{len(report.conflicts)} skipped in {report.seconds:.2f}s")
+            for number, row, reason in report.conflicts[:args.max_report]:
+                print(f"  row {number}: {reason}  {row}")
+            if len(report.conflicts) > args.max_report:
+                print(f"  ... {len(report.conflicts) - args.max_report} more")
+        elif args.file:
+            count = export_file(args.table, args.file, args.format)
+            print(f"{args.table}: {count} rows written to {args.file}", file=sys.stderr)
+        else:
+            export_table(args.table, sys.stdout, args.format or "csv")
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+    finally:
+        connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# db/cache.py
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from db import connection
+
+# -------------------------------------------------------------------
+# Read-through cache for catalog queries
+#
+# Entries are tagged (e.g. ("topics", class_name)) so write functions
+# can drop exactly what they changed. Writes made by other processes
+# are detected through PRAGMA data_version on a dedicated probe
+# connection, which clears the whole cache; lookups probe at most every
+# PROBE_INTERVAL seconds, poll() (called on every navigation) at once.
+# Listeners (e.g. the UI's page cache) hear about every invalidation.
+# -------------------------------------------------------------------
+PROBE_INTERVAL = 0.25
+
+
+class _Entry:
+    __slots__ = ("value", "tags", "created", "last_hit", "hits")
+
+    def __init__(self, value, tags):
+        self.value = value
+        self.tags = tags
+        self.created = time.time()
+        self.last_hit = None
+        self.hits = 0
+
+
+class CatalogCache:
+    """Bounded LRU cache with per-entry hit stats and tag invalidation."""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0             # bumped by every invalidation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._listeners = []
+
+        self._probe_lock = threading.Lock()     # guards the probe connection and _data_version
+        self._probe = None
+        self._probe_generation = None
+        self._data_version = None
+        self._probed_at = float("-inf")
+
+    # --- External change detection ---
+    def _check_external_writes(self, force=False):
+        """Clear the cache if another connection committed since the last check.
+
+        Without `force` this runs at most every PROBE_INTERVAL seconds
+        (and is skipped while another thread probes), unless the managed
+        connections were reset. Call without the cache lock; returns
+        True if the data changed under us (listeners still need telling).
+        """
+        generation = connection.get_generation()
+        if not force and self._probe_generation == generation \
+                and time.monotonic() - self._probed_at < PROBE_INTERVAL:
+            return False
+        if not self._probe_lock.acquire(blocking=force or self._probe_generation != generation):
+            return False
+        try:
+            self._probed_at = time.monotonic()
+            reset = False
+            if self._probe is None or self._probe_generation != generation:
+                if self._probe is not None:
+                    self._probe.close()
+                    reset = True        # reconfigured or restored: a different database
+                self._probe = connection.open_connection()
+                self._probe_generation = generation
+                self._data_version = None
+            version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+            previous, self._data_version = self._data_version, version
+        finally:
+            self._probe_lock.release()
+        if version != previous:     # a new probe connection, or a commit we didn't record
+            with self._lock:
+                self._clear_locked()
+        return reset or (previous is not None and version != previous)
+
+    def _record_local_write(self):
+        """Take data_version after a local commit as the new baseline, so it isn't seen as external."""
+        with self._probe_lock:
+            if self._probe is not None and self._probe_generation == connection.get_generation():
+                self._data_version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll(self):
+        """Check for commits from other connections now; True if there were any."""
+        changed = self._check_external_writes(force=True)
+        if changed:
+            self._notify(None)
+        return changed
+
+    # --- Lookups ---
+    def get(self, key):
+        """Return (found, value, epoch) and update the hit/miss counters."""
+        changed = self._check_external_writes()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                result = False, None, self._epoch
+            else:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                entry.last_hit = time.time()
+                self.hits += 1
+                result = True, entry.value, self._epoch
+        if changed:
+            self._notify(None)
+        return result
+
+    def put(self, key, value, tags, epoch):
+        """Store a value unless an invalidation happened since `epoch`."""
+        with self._lock:
+            if epoch != self._epoch:
+                return      # a write raced with the query that produced this value
+            self._entries[key] = _Entry(value, tuple(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # --- Invalidation ---
+    def _clear_locked(self):
+        self._epoch += 1
+        if self._entries:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of `tags`; call after a local commit."""
+        tags = set(tags)
+        with self._lock:
+            self._epoch += 1
+            stale = [k for k, e in self._entries.items() if tags.intersection(e.tags)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+        self._record_local_write()
+        self._notify(tags)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._clear_locked()
+        self._record_local_write()
+        self._notify(None)
+
+    # --- Listeners ---
+    def add_listener(self, func):
+        """Call func(tags) after every invalidation.
+
+        `tags` is the set of invalidated tags, or None when everything was
+        dropped (clear(), restores, writes from other processes). Called
+        on whichever thread did the write, so keep it short.
+        """
+        self._listeners.append(func)
+
+    def remove_listener(self, func):
+        self._listeners.remove(func)
+
+    def _notify(self, tags):
+        for func in list(self._listeners):
+            func(tags)
+
+    # --- Stats ---
+    def stats(self):
+        """Return counters plus per-entry stats, most recently used last."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            now = time.time()
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": [
+                    {
+                        "key": key,
+                        "hits": e.hits,
+                        "age": now - e.created,
+                        "idle": now - (e.last_hit or e.created),
+                    }
+                    for key, e in self._entries.items()
+                ],
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+
+catalog_cache = CatalogCache()
+
+
+def cached(tags_for):
+    """Decorator: serve a read function from catalog_cache.
+
+    `tags_for` takes the same arguments as the function and returns the
+    tags the result depends on. Arguments are bound to the function's
+    signature (defaults filled in) before keying, so f(x), f(x, None)
+    and f(name=x) share an entry. The undecorated function stays
+    available as `func.uncached`.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        arity = len(signature.parameters)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # every argument given positionally (the usual call) is already normal
+            if kwargs or len(args) != arity:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                args, kwargs = bound.args, bound.kwargs
+            key = (func.__name__,) + args + tuple(sorted(kwargs.items()))
+            found, value, epoch = catalog_cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                catalog_cache.put(key, value, tags_for(*args, **kwargs), epoch)
+            # Callers get their own list so they can't corrupt the cache.
+            return list(value) if isinstance(value, list) else value
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
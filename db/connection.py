@@ -0,0 +1,167 @@
+# db/connection.py
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# -------------------------------------------------------------------
+# Connection manager
+#
+# One long-lived connection per thread (Tk main thread, VideoServer,
+# workers). Connections are opened lazily and tuned once with PRAGMAS.
+# -------------------------------------------------------------------
+DEFAULT_DB_PATH = os.environ.get("LMS_DB_PATH", "lms.db")
+
+PRAGMAS = (
+    ("auto_vacuum", "INCREMENTAL"),    # takes effect for new DBs (existing: db.maintenance convert)
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 256 * 1024 * 1024),
+    ("cache_size", -16000),        # negative = KiB, so ~16 MB of page cache
+    ("busy_timeout", 5000),        # ms to wait on a locked DB before failing
+    ("temp_store", "MEMORY"),
+    ("foreign_keys", "ON"),        # enforce topics.class_id ON DELETE CASCADE
+)
+
+_lock = threading.Lock()
+_local = threading.local()
+_db_path = DEFAULT_DB_PATH
+_memory_uri = None
+_memory_anchor = None   # keeps a shared :memory: DB alive between threads
+_generation = 0
+_connections = []
+_factory = sqlite3.Connection
+_factory_generation = 0
+_last_used = time.monotonic()
+
+
+def _connect_uri():
+    """Return (database, uri) for sqlite3.connect for the configured path."""
+    if _db_path == ":memory:":
+        return _memory_uri, True
+    return _db_path, False
+
+
+def open_connection():
+    """Open a new, unmanaged connection with the PRAGMA profile applied.
+
+    The caller owns it; most code should use get_connection() instead.
+    """
+    database, uri = _connect_uri()
+    # check_same_thread=False only so configure()/close_all() can close
+    # connections owned by other threads; each connection is still used
+    # by a single thread.
+    conn = sqlite3.connect(database, uri=uri, check_same_thread=False, factory=_factory)
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def configure(path=DEFAULT_DB_PATH):
+    """Point every thread at a new database file (or ":memory:")."""
+    global _db_path, _memory_uri, _memory_anchor
+    close_all()
+    with _lock:
+        _db_path = path
+        if path == ":memory:":
+            # Shared-cache in-memory DB so all threads see the same data.
+            _memory_uri = f"file:lms-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            _memory_anchor = sqlite3.connect(_memory_uri, uri=True, check_same_thread=False)
+        else:
+            _memory_uri = None
+
+
+def set_connection_factory(factory=sqlite3.Connection):
+    """Open connections with `factory` (a sqlite3.Connection subclass) from now on.
+
+    Connections in use by other threads are left alone: each thread
+    reopens its own on its next get_connection().
+    """
+    global _factory, _factory_generation
+    with _lock:
+        _factory = factory
+        _factory_generation += 1
+
+
+def get_db_path():
+    """Return the path of the configured database."""
+    return _db_path
+
+
+def idle_seconds():
+    """Seconds since any thread last asked for its managed connection."""
+    return time.monotonic() - _last_used
+
+
+def get_generation():
+    """Return a counter that changes whenever the managed connections are reset."""
+    return _generation
+
+
+def get_connection():
+    """Return this thread's connection, opening it on first use."""
+    global _last_used
+    _last_used = time.monotonic()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.generation == _generation:
+        if _local.factory_generation == _factory_generation:
+            return conn
+        close_connection()      # opened with the previous factory
+
+    factory_generation = _factory_generation
+    conn = open_connection()
+    with _lock:
+        _connections.append(conn)
+    _local.conn = conn
+    _local.generation = _generation
+    _local.factory_generation = factory_generation
+    return conn
+
+
+def close_connection():
+    """Close the calling thread's connection (e.g. when a worker exits)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        return
+    _local.conn = None
+    with _lock:
+        if conn in _connections:
+            _connections.remove(conn)
+    conn.close()
+
+
+def _close_managed():
+    global _generation
+    with _lock:
+        _generation += 1
+        conns = list(_connections)
+        _connections.clear()
+    for conn in conns:
+        conn.close()
+    _local.conn = None
+
+
+def close_all():
+    """Close every connection opened by the manager, in any thread."""
+    global _memory_anchor
+    _close_managed()
+    with _lock:
+        anchor, _memory_anchor = _memory_anchor, None
+    if anchor is not None:
+        anchor.close()
+
+
+@contextmanager
+def transaction():
+    """Run a block in one transaction on this thread's connection.
+
+    Commits on success, rolls back on any exception.
+    """
+    conn = get_connection()
+    with conn:
+        yield conn
+
+
+configure(DEFAULT_DB_PATH)
@@ -1,244 +1,483 @@
 # db/database.py
+import re
 import sqlite3
-import os
+from db.connection import get_connection
+from db.migrations import migrate
+from db.cache import cached, catalog_cache
+from db.pagination import PAGE_SIZE, count_rows, fetch_page
+from db.profiler import profiler
 
-def init_db():
-    db_path = "lms.db"
-    new_db = not os.path.exists(db_path)  # ✅ Detect first-time creation
-
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
-    # --- Create tables if not exist ---
-    cursor.execute('''CREATE TABLE IF NOT EXISTS users (
-                        username TEXT PRIMARY KEY,
-                        password TEXT,
-                        status TEXT,
-                        grade TEXT
-                    )''')
-
-    cursor.execute('''CREATE TABLE IF NOT EXISTS classes (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        class_name TEXT UNIQUE,
-                        grade TEXT
-                    )''')
-
-    cursor.execute('''CREATE TABLE IF NOT EXISTS topics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        topic_name TEXT,
-                        class_name TEXT,
-                        video_path TEXT,
-                        description TEXT,
-                        UNIQUE(topic_name, class_name)
-                    )''')
-
-    # ✅ Insert default data only if database is new
-    if new_db:
-        # --- Default Users ---
-        users = [
-            ("Anushka", "abc123", "admin", None),
-            ("Imashi", "cde456", "student", "Grade 12"),
-            ("Chamika", "fgh789", "student", "Grade 13")
-        ]
-        for user in users:
-            cursor.execute("INSERT INTO users VALUES (?, ?, ?, ?)", user)
-
-        # --- Default Classes ---
-        classes_data = [
-            ("Accounting 1", "Grade 12"),
-            ("Business Studies 1", "Grade 12"),
-            ("Economics 1", "Grade 12"),
-            ("Paper Discussions", "Grade 12"),
-            ("Accounting 2", "Grade 13"),
-            ("Business Studies 2", "Grade 13"),
-            ("Economics 2", "Grade 13"),
-            ("Paper Discussions", "Grade 13"),
-            ("Revision", "Grade 13"),
-        ]
-        for c in classes_data:
-            cursor.execute("INSERT INTO classes (class_name, grade) VALUES (?, ?)", c)
-
-        # --- Default Topics ---
-        topics_data = {
-            "Accounting 1": 10,
-            "Business Studies 1": 6,
-            "Economics 1": 7,
-            "Accounting 2": 5,
-            "Business Studies 2": 6,
-            "Economics 2": 7,
-            "Paper Discussions": 9,
-            "Revision": 4
-        }
-
-        default_video = "/assets/videos/Accoounting1Topic1.mp4"
-        default_desc = "Sample topic description here."
-
-        for cls, count in topics_data.items():
-            for i in range(1, count + 1):
-                topic_name = f"Topic {i}"
-                video_path = default_video
-                description = default_desc
-                if cls == "Accounting 1" and topic_name == "Topic 1":
-                    video_path = "/assets/videos/Accoounting1Topic1.mp4"
-                    description = "Introduction to accounting."
-                cursor.execute(
-                    "INSERT INTO topics (topic_name, class_name, video_path, description) VALUES (?, ?, ?, ?)",
-                    (topic_name, cls, video_path, description)
-                )
-
-    conn.commit()
-    conn.close()
+def init_db():
+    """Bring the database up to the current schema (no-op when current)."""
+    if migrate():
+        catalog_cache.clear()
 
 
 def check_login(username, password):
-    conn = sqlite3.connect("lms.db")
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT status, grade FROM users WHERE username=? AND password=?", (username, password))
     result = cursor.fetchone()
-    conn.close()
     return result
 
 
+@cached(lambda grade: [("classes", grade)])
 def get_classes_by_grade(grade):
-    conn = sqlite3.connect("lms.db")
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT class_name FROM classes WHERE grade=?", (grade,))
     classes = [row[0] for row in cursor.fetchall()]
-    conn.close()
     return classes
 
 
-def get_topics_by_class(class_name):
-    conn = sqlite3.connect("lms.db")
+@cached(lambda class_name, grade=None: [("class", class_name)])
+def get_class_id(class_name, grade=None):
+    """Resolve a class name (within `grade`, if given) to its id, or None."""
+    conn = get_connection()
+    if grade is None:
+        row = conn.execute("SELECT MIN(id) FROM classes WHERE class_name=?", (class_name,)).fetchone()
+    else:
+        row = conn.execute("SELECT id FROM classes WHERE class_name=? AND grade=?", (class_name, grade)).fetchone()
+    return row[0] if row else None
+
+
+@cached(lambda class_id: [("topics", class_id)])
+def get_topics_by_class_id(class_id):
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT topic_name FROM topics WHERE class_name=?", (class_name,))
+    cursor.execute("SELECT topic_name FROM topics WHERE class_id=?", (class_id,))
     topics = [row[0] for row in cursor.fetchall()]
-    conn.close()
     return topics
 
 
-def get_topic_content(class_name, topic_name):
-    conn = sqlite3.connect("lms.db")
+@cached(lambda class_id, topic_name: [("topics", class_id)])
+def get_topic_content_by_class_id(class_id, topic_name):
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        "SELECT video_path, description FROM topics WHERE class_name=? AND topic_name=?",
-        (class_name, topic_name)
+        "SELECT video_path, description FROM topics WHERE class_id=? AND topic_name=?",
+        (class_id, topic_name)
     )
     result = cursor.fetchone()
-    conn.close()
     return result if result else (None, None)
 
 
+@cached(lambda class_id, topic_name: [("topics", class_id)])
+def get_topic_id(class_id, topic_name):
+    conn = get_connection()
+    row = conn.execute("SELECT id FROM topics WHERE class_id=? AND topic_name=?", (class_id, topic_name)).fetchone()
+    return row[0] if row else None
+
+
+def get_topic(topic_id):
+    """(class_name, grade, topic_name, video_path, description) of a topic, or None.
+
+    Not cached: the video server looks topics up by id on every page
+    request, and a primary-key lookup is cheaper than tracking which
+    class each cached id belongs to.
+    """
+    conn = get_connection()
+    return conn.execute("""
+        SELECT c.class_name, c.grade, t.topic_name, t.video_path, t.description
+        FROM topics t
+        JOIN classes c ON c.id = t.class_id
+        WHERE t.id=?
+    """, (topic_id,)).fetchone()
+
+
+# --- Name-based wrappers used by the student pages ---
+def get_topics_by_class(class_name, grade=None):
+    class_id = get_class_id(class_name, grade)
+    return get_topics_by_class_id(class_id) if class_id is not None else []
+
+
+def get_topic_content(class_name, topic_name, grade=None):
+    class_id = get_class_id(class_name, grade)
+    if class_id is None:
+        return (None, None)
+    return get_topic_content_by_class_id(class_id, topic_name)
+
+
 def get_all_users():
     """Return list of all users as (username, status, grade)."""
-    conn = sqlite3.connect("lms.db")
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT username, status, grade FROM users ORDER BY status DESC")
     users = cursor.fetchall()
-    conn.close()
     return users
 
 
 def delete_user(username):
-    """Delete a user from the database."""
-    conn = sqlite3.connect("lms.db")
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM users WHERE username=?", (username,))
-    conn.commit()
-    conn.close()
+    """Delete a user from the database. Returns how many were deleted (0 or 1)."""
+    conn = get_connection()
+    with conn:
+        cursor = conn.execute("DELETE FROM users WHERE username=?", (username,))
+    catalog_cache.invalidate(("users",))
+    return cursor.rowcount
 
 
 def add_new_user(username, password, status, grade):
     """Insert a new user. Returns True if successful, False if username exists."""
-    conn = sqlite3.connect("lms.db")
-    cursor = conn.cursor()
+    conn = get_connection()
     try:
-        cursor.execute("INSERT INTO users VALUES (?, ?, ?, ?)", (username, password, status, grade))
-        conn.commit()
-        return True
+        with conn:
+            conn.execute("INSERT INTO users VALUES (?, ?, ?, ?)", (username, password, status, grade))
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
+    catalog_cache.invalidate(("users",))
+    return True
+
+
+def delete_users(usernames):
+    """Delete several users in one transaction. Returns how many were deleted."""
+    conn = get_connection()
+    with conn:
+        cursor = conn.executemany("DELETE FROM users WHERE username=?", [(u,) for u in usernames])
+    catalog_cache.invalidate(("users",))
+    return cursor.rowcount
+
+
+def set_students_grade(usernames, grade):
+    """Move several students to `grade` in one transaction; admins are skipped.
+
+    Returns how many users were updated.
+    """
+    conn = get_connection()
+    with conn:
+        cursor = conn.executemany(
+            "UPDATE users SET grade=? WHERE username=? AND status='student'",
+            [(grade, u) for u in usernames]
+        )
+    catalog_cache.invalidate(("users",))
+    return cursor.rowcount
 
 
 def get_all_classes():
     """Return list of all classes as (class_name, grade)."""
-    conn = sqlite3.connect("lms.db")
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT class_name, grade FROM classes ORDER BY grade ASC")
     classes = cursor.fetchall()
-    conn.close()
     return classes
 
 
-def delete_class(class_name):
+def delete_class_by_id(class_id):
+    """Delete a class; its topics go with it (ON DELETE CASCADE). Returns how many were deleted (0 or 1)."""
+    conn = get_connection()
+    row = conn.execute("SELECT class_name, grade FROM classes WHERE id=?", (class_id,)).fetchone()
+    with conn:
+        cursor = conn.execute("DELETE FROM classes WHERE id=?", (class_id,))
+    if row:
+        catalog_cache.invalidate(("classes", row[1]), ("class", row[0]), ("topics", class_id))
+    return cursor.rowcount
+
+
+def delete_class(class_name, grade=None):
     """Delete a class from the database."""
-    conn = sqlite3.connect("lms.db")
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM classes WHERE class_name=?", (class_name,))
-    conn.commit()
-    conn.close()
+    class_id = get_class_id(class_name, grade)
+    if class_id is not None:
+        delete_class_by_id(class_id)
+
+
+def delete_classes(class_ids):
+    """Delete several classes (and their topics) in one transaction.
+
+    Returns how many classes were deleted.
+    """
+    conn = get_connection()
+    tags = []
+    deleted = 0
+    with conn:
+        for class_id in class_ids:
+            row = conn.execute("SELECT class_name, grade FROM classes WHERE id=?", (class_id,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM classes WHERE id=?", (class_id,))
+                tags += [("classes", row[1]), ("class", row[0]), ("topics", class_id)]
+                deleted += 1
+    if tags:
+        catalog_cache.invalidate(*tags)
+    return deleted
+
 
 def add_new_class(class_name, grade):
-    """Insert a new class. Returns True if successful, False if class already exists."""
-    conn = sqlite3.connect("lms.db")
-    cursor = conn.cursor()
+    """Insert a new class. Returns its id, or False if the class already exists."""
+    conn = get_connection()
     try:
-        cursor.execute("INSERT INTO classes (class_name, grade) VALUES (?, ?)", (class_name, grade))
-        conn.commit()
-        return True
+        with conn:
+            cursor = conn.execute("INSERT INTO classes (class_name, grade) VALUES (?, ?)", (class_name, grade))
+        catalog_cache.invalidate(("classes", grade), ("class", class_name))
+        return cursor.lastrowid
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def get_all_topics():
     """Return all topics with their associated class names (no duplicates removed)."""
-    conn = sqlite3.connect("lms.db")
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT topic_name, class_name
-        FROM topics
-        ORDER BY class_name ASC, topic_name ASC
+        SELECT t.topic_name, c.class_name
+        FROM topics t
+        JOIN classes c ON c.id = t.class_id
+        ORDER BY c.class_name ASC, t.topic_name ASC
     """)
     topics = cursor.fetchall()
-    conn.close()
     return topics
 
 
 
+def _filters(**columns):
+    """Build WHERE fragments/params for the non-None keyword filters."""
+    where, params = [], []
+    for column, value in columns.items():
+        if value is not None:
+            where.append(f"{column}=?")
+            params.append(value)
+    return where, params
+
+
+def _topic_filters(class_id=None, grade=None):
+    where, params = _filters(**{"t.class_id": class_id})
+    if grade is not None:
+        where.append("t.class_id IN (SELECT id FROM classes WHERE grade=?)")
+        params.append(grade)
+    return where, params
+
+
+def get_users_page(after=None, before=None, limit=PAGE_SIZE, status=None, grade=None):
+    """Return a Page of (username, status, grade) rows, optionally filtered by role/grade."""
+    where, params = _filters(status=status, grade=grade)
+    return fetch_page(
+        "SELECT username, status, grade FROM users",
+        [("status", "DESC"), ("username", "ASC")],
+        lambda row: (row[1], row[0]),
+        where, params, after, before, limit
+    )
+
+
+def count_users(status=None, grade=None):
+    """Return the number of users matching the filters."""
+    return count_rows("users", *_filters(status=status, grade=grade))
+
+
+def get_classes_page(after=None, before=None, limit=PAGE_SIZE, grade=None):
+    """Return a Page of (class_id, class_name, grade) rows, optionally filtered by grade."""
+    where, params = _filters(grade=grade)
+    return fetch_page(
+        "SELECT id, class_name, grade FROM classes",
+        [("grade", "ASC"), ("class_name", "ASC")],
+        lambda row: (row[2], row[1]),
+        where, params, after, before, limit
+    )
+
+
+def count_classes(grade=None):
+    """Return the number of classes matching the filter."""
+    return count_rows("classes", *_filters(grade=grade))
+
+
+def get_topics_page(after=None, before=None, limit=PAGE_SIZE, class_id=None, grade=None):
+    """Return a Page of (topic_id, topic_name, class_id, class_name, grade) rows.
+
+    Ordered by class id then topic name, which walks the UNIQUE(class_id,
+    topic_name) index; optionally filtered by class or grade.
+    """
+    where, params = _topic_filters(class_id, grade)
+    return fetch_page(
+        "SELECT t.id, t.topic_name, t.class_id, c.class_name, c.grade "
+        "FROM topics t JOIN classes c ON c.id = t.class_id",
+        [("t.class_id", "ASC"), ("t.topic_name", "ASC")],
+        lambda row: (row[2], row[1]),
+        where, params, after, before, limit
+    )
+
+
+def count_topics(class_id=None, grade=None):
+    """Return the number of topics matching the filters."""
+    return count_rows("topics t", *_topic_filters(class_id, grade))
+
+
 def get_all_class_names():
     """Return list of all existing class names."""
-    conn = sqlite3.connect("lms.db")
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT class_name FROM classes ORDER BY class_name ASC")
+    cursor.execute("SELECT DISTINCT class_name FROM classes ORDER BY class_name ASC")
     classes = [row[0] for row in cursor.fetchall()]
-    conn.close()
     return classes
 
 
-def add_new_topic(topic_name, class_name, video_path, description):
-    """Insert a new topic for a given class with video path and description."""
-    conn = sqlite3.connect("lms.db")
+def get_class_choices():
+    """Return (class_id, class_name, grade) for every class, for pickers."""
+    conn = get_connection()
     cursor = conn.cursor()
+    cursor.execute("SELECT id, class_name, grade FROM classes ORDER BY grade ASC, class_name ASC")
+    return cursor.fetchall()
+
+
+def add_topic_to_class(class_id, topic_name, video_path, description):
+    """Insert a topic into a class. Returns its id, or False if the name is taken or the class is gone."""
+    conn = get_connection()
     try:
-        cursor.execute(
-            "INSERT INTO topics (topic_name, class_name, video_path, description) VALUES (?, ?, ?, ?)",
-            (topic_name, class_name, video_path, description)
-        )
-        conn.commit()
-        return True
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO topics (class_id, topic_name, video_path, description) VALUES (?, ?, ?, ?)",
+                (class_id, topic_name, video_path, description)
+            )
+        catalog_cache.invalidate(("topics", class_id))
+        return cursor.lastrowid
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 
-def delete_topic(topic_name, class_name):
+def add_new_topic(topic_name, class_name, video_path, description, grade=None):
+    """Insert a new topic for a given class with video path and description."""
+    class_id = get_class_id(class_name, grade)
+    if class_id is None:
+        return False
+    return add_topic_to_class(class_id, topic_name, video_path, description)
+
+
+def delete_topic_by_id(topic_id):
+    """Delete a single topic by id. Returns how many were deleted (0 or 1)."""
+    conn = get_connection()
+    row = conn.execute("SELECT class_id FROM topics WHERE id=?", (topic_id,)).fetchone()
+    with conn:
+        cursor = conn.execute("DELETE FROM topics WHERE id=?", (topic_id,))
+    if row:
+        catalog_cache.invalidate(("topics", row[0]))
+    return cursor.rowcount
+
+
+def delete_topics(topic_ids):
+    """Delete several topics by id in one transaction. Returns how many were deleted."""
+    conn = get_connection()
+    class_ids = set()
+    deleted = 0
+    with conn:
+        for topic_id in topic_ids:
+            row = conn.execute("SELECT class_id FROM topics WHERE id=?", (topic_id,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM topics WHERE id=?", (topic_id,))
+                class_ids.add(row[0])
+                deleted += 1
+    if class_ids:
+        catalog_cache.invalidate(*[("topics", c) for c in class_ids])
+    return deleted
+
+
+def move_topics(topic_ids, class_id):
+    """Move several topics into class `class_id` in one transaction.
+
+    Topics whose name is already taken in the target class stay where
+    they are. Returns (moved_ids, skipped_ids); raises ValueError if the
+    class does not exist.
+    """
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM classes WHERE id=?", (class_id,)).fetchone() is None:
+        raise ValueError(f"Class {class_id} does not exist")
+    class_ids = {class_id}
+    moved, skipped = [], []
+    with conn:
+        for topic_id in topic_ids:
+            row = conn.execute("SELECT class_id FROM topics WHERE id=?", (topic_id,)).fetchone()
+            if row is None or row[0] == class_id:
+                continue
+            cursor = conn.execute("UPDATE OR IGNORE topics SET class_id=? WHERE id=?", (class_id, topic_id))
+            if cursor.rowcount:
+                class_ids.add(row[0])
+                moved.append(topic_id)
+            else:
+                skipped.append(topic_id)
+    if moved:
+        catalog_cache.invalidate(*[("topics", c) for c in class_ids])
+    return moved, skipped
+
+
+def delete_topic(topic_name, class_name, grade=None):
     """Delete a specific topic belonging to a class."""
-    conn = sqlite3.connect("lms.db")
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM topics WHERE topic_name=? AND class_name=?", (topic_name, class_name))
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    class_id = get_class_id(class_name, grade)
+    if class_id is None:
+        return
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM topics WHERE class_id=? AND topic_name=?", (class_id, topic_name))
+    catalog_cache.invalidate(("topics", class_id))
+
+
+def _search_words(text):
+    return [w.lower() for w in re.findall(r"\w+", text)]
+
+
+def _fts_query(words):
+    """FTS5 query where every word must match; the last one as a prefix
+    (it is usually still being typed) once it has two characters."""
+    terms = [f'"{w}"' for w in words]
+    if terms and len(words[-1]) >= 2:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _snippet(text, words, width=12):
+    """Short excerpt of `text` around the first matched word, matches in [brackets]."""
+    tokens = (text or "").split()
+    matched = [any(re.sub(r"\W", "", t).lower().startswith(w) for w in words) for t in tokens]
+    first = matched.index(True) if True in matched else 0
+    start = max(0, first - width // 3)
+    excerpt = [f"[{t}]" if m else t for t, m in zip(tokens[start:start + width], matched[start:start + width])]
+    return ("…" if start else "") + " ".join(excerpt) + ("…" if start + width < len(tokens) else "")
+
+
+SEARCH_RANKED = 500
+
+
+def search_topics(query, grade=None, limit=20):
+    """Full-text search over topic names, descriptions and class names.
+
+    Returns (topic_id, topic_name, class_name, grade, snippet) rows, best
+    match first (bm25: topic name > class name > description). The
+    snippet marks matched words with [brackets].
+
+    bm25 costs microseconds per scored row, so a query matching more
+    than SEARCH_RANKED topics (a word in most descriptions, a two-letter
+    prefix) is ranked over its newest SEARCH_RANKED matches only.
+    """
+    words = _search_words(query)
+    if not words:
+        return []
+    conn = get_connection()
+
+    match = f"{{topic_name description class_name}} : ({_fts_query(words)})"
+    if grade:
+        # indexed without spaces (see migration 008): one short doclist to intersect
+        match += ' AND grade : "{}"'.format(" ".join(_search_words(grade.replace(" ", ""))))
+    cutoff = conn.execute(
+        "SELECT rowid FROM topics_fts WHERE topics_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+        (match, SEARCH_RANKED)
+    ).fetchone()
+    ids = [row[0] for row in conn.execute(
+        "SELECT rowid FROM topics_fts WHERE topics_fts MATCH ?"
+        + (" AND rowid > ?" if cutoff else "") + " ORDER BY rank LIMIT ?",
+        (match,) + (cutoff or ()) + (limit,)
+    )]
+    if not ids:
+        return []
+
+    rows = {row[0]: row for row in conn.execute(f"""
+        SELECT t.id, t.topic_name, c.class_name, c.grade, t.description
+        FROM topics t JOIN classes c ON c.id = t.class_id
+        WHERE t.id IN ({", ".join("?" for _ in ids)})
+    """, ids)}
+    return [
+        rows[i][:4] + (_snippet(rows[i][4], words),)
+        for i in ids if i in rows
+    ]
+
+
+def get_cache_stats():
+    """Return hit/miss counters and per-entry stats of the catalog cache."""
+    return catalog_cache.stats()
+
+
+def get_query_stats():
+    """Return per-statement profiler stats (empty unless profiling is on)."""
+    return profiler.snapshot()
@@ -0,0 +1,280 @@
+# db/maintenance.py
+"""Background database maintenance.
+
+While the app is idle, a scheduler thread runs, one at a time and at
+most once per interval each:
+
+    checkpoint           PRAGMA wal_checkpoint(PASSIVE)        every 5 min
+    incremental_vacuum   return free pages to the OS           every 10 min
+    optimize             PRAGMA optimize                       every hour
+    analyze              ANALYZE (sampled, analysis_limit)     every day
+    quick_check          PRAGMA quick_check                    every day
+
+Tasks use their own connection with a short busy timeout, and a
+progress handler aborts a running task as soon as the app touches the
+database again, so maintenance never holds up interactive queries; an
+aborted task is retried at the next idle period.
+
+    python -m db.maintenance run [TASK ...]   # run now, ignoring idleness
+    python -m db.maintenance status
+    python -m db.maintenance convert          # one-off VACUUM to enable incremental vacuum
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
+
+from db import connection
+
+IDLE_SECONDS = float(os.environ.get("LMS_MAINTENANCE_IDLE", "30"))
+TICK_SECONDS = 5
+BUSY_TIMEOUT_MS = 100
+VACUUM_PAGES = 1024
+ANALYSIS_LIMIT = 1000
+
+# name -> minimum seconds between runs
+INTERVALS = {
+    "checkpoint": 5 * 60,
+    "incremental_vacuum": 10 * 60,
+    "optimize": 60 * 60,
+    "analyze": 24 * 60 * 60,
+    "quick_check": 24 * 60 * 60,
+}
+
+log = logging.getLogger("lms.db.maintenance")
+
+# One line of the maintenance log.
+Run = namedtuple("Run", "started task seconds status detail")
+
+
+# -------------------------------------------------------------------
+# Tasks: each takes a connection and returns a short detail string
+# -------------------------------------------------------------------
+def checkpoint(conn):
+    busy, log_frames, done = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    if log_frames < 0:
+        return "not in WAL mode"
+    return f"{done}/{log_frames} frames checkpointed" + (" (readers active)" if done < log_frames else "")
+
+
+def incremental_vacuum(conn):
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if mode != 2:
+        return f"{free} free pages; auto_vacuum is not INCREMENTAL (run: python -m db.maintenance convert)"
+    if not free:
+        return "no free pages"
+    # Chunks are separate short write transactions, so the app can get
+    # the write lock in between (and the progress handler stops us).
+    left = free
+    while left:
+        conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})").fetchall()
+        left = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return f"released {free} pages"
+
+
+def optimize(conn):
+    conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    conn.execute("PRAGMA optimize").fetchall()
+    return "ok"
+
+
+def analyze(conn):
+    conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize").fetchall()
+    return "statistics refreshed"
+
+
+def quick_check(conn):
+    problems = [row[0] for row in conn.execute("PRAGMA quick_check")]
+    if problems == ["ok"]:
+        return "ok"
+    for problem in problems:
+        log.error("quick_check: %s", problem)
+    raise sqlite3.DatabaseError(f"quick_check found {len(problems)} problem(s): {problems[0]}")
+
+
+TASKS = {
+    "checkpoint": checkpoint,
+    "incremental_vacuum": incremental_vacuum,
+    "optimize": optimize,
+    "analyze": analyze,
+    "quick_check": quick_check,
+}
+
+
+# -------------------------------------------------------------------
+# Running tasks
+# -------------------------------------------------------------------
+_history = deque(maxlen=200)
+_last_run = {}          # task -> time.time() of the last completed run
+_run_lock = threading.Lock()
+
+
+def history():
+    """The most recent maintenance runs, oldest first."""
+    return list(_history)
+
+
+def _open():
+    conn = connection.open_connection()
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.isolation_level = None     # tasks manage their own transactions
+    return conn
+
+
+def run_task(name, yield_to_app=True):
+    """Run one task now and log it. Returns its Run record.
+
+    With yield_to_app, the task is aborted (status "interrupted") as soon
+    as the app uses the database.
+    """
+    started = time.time()
+    start = time.perf_counter()
+    with _run_lock:
+        conn = _open()
+        if yield_to_app:
+            idle_at_start = connection.idle_seconds()
+
+            def check():
+                # idle_seconds() only shrinks below its start value when
+                # some thread asked for its connection since.
+                return 1 if connection.idle_seconds() < idle_at_start else 0
+
+            conn.set_progress_handler(check, 10000)
+        try:
+            detail = TASKS[name](conn)
+            status = "ok"
+            _last_run[name] = started
+        except sqlite3.OperationalError as e:
+            status, detail = ("interrupted", "app became active") if "interrupt" in str(e) else ("busy", str(e))
+        except sqlite3.DatabaseError as e:
+            status, detail = "error", str(e)
+            _last_run[name] = started
+        finally:
+            conn.close()
+
+    run = Run(started, name, time.perf_counter() - start, status, detail)
+    _history.append(run)
+    level = logging.INFO if status in ("ok", "interrupted") else logging.WARNING
+    log.log(level, "%s %s in %.2fs: %s", name, status, run.seconds, detail)
+    return run
+
+
+def due_tasks(now=None):
+    """Tasks whose interval has elapsed, most overdue first."""
+    now = now or time.time()
+    due = [(now - _last_run.get(name, 0) - interval, name)
+           for name, interval in INTERVALS.items()
+           if now - _last_run.get(name, 0) >= interval]
+    return [name for _, name in sorted(due, reverse=True)]
+
+
+def convert_to_incremental():
+    """Switch an existing DB to auto_vacuum=INCREMENTAL (full VACUUM; blocks writers)."""
+    conn = _open()
+    try:
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        start = time.perf_counter()
+        conn.execute("VACUUM")
+        return time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+# -------------------------------------------------------------------
+# Scheduler
+# -------------------------------------------------------------------
+class MaintenanceScheduler(threading.Thread):
+    """Runs due tasks, one per tick, while the app has been idle long enough."""
+
+    def __init__(self, idle_seconds=IDLE_SECONDS, tick=TICK_SECONDS):
+        super().__init__(name="MaintenanceScheduler", daemon=True)
+        self.idle_seconds = idle_seconds
+        self.tick = tick
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.tick):
+            if connection.idle_seconds() < self.idle_seconds:
+                continue
+            due = due_tasks()
+            if due:
+                run_task(due[0])
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+
+
+def start_scheduler(idle_seconds=IDLE_SECONDS):
+    """Start the maintenance thread once (LMS_MAINTENANCE=0 disables it)."""
+    global _scheduler
+    if os.environ.get("LMS_MAINTENANCE", "1") == "0":
+        return None
+    if _scheduler is None or not _scheduler.is_alive():
+        _scheduler = MaintenanceScheduler(idle_seconds)
+        _scheduler.start()
+    return _scheduler
+
+
+def stop_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m db.maintenance", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=connection.DEFAULT_DB_PATH, help="database file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_run = sub.add_parser("run", help="run tasks now")
+    p_run.add_argument("tasks", nargs="*", metavar="TASK", help=f"one of {', '.join(TASKS)} (default: all)")
+    sub.add_parser("status", help="show free pages, WAL size and auto_vacuum mode")
+    sub.add_parser("convert", help="enable incremental vacuum on an existing DB (full VACUUM)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in getattr(args, "tasks", []) if name not in TASKS]
+    if unknown:
+        parser.error(f"unknown task(s): {', '.join(unknown)}")
+
+    connection.configure(args.db)
+    try:
+        if args.command == "run":
+            for name in args.tasks or TASKS:
+                run = run_task(name, yield_to_app=False)
+                print(f"{name:<20}{run.status:<12}{run.seconds:>8.2f}s  {run.detail}")
+        elif args.command == "status":
+            conn = _open()
+
+            def pragma(name):
+                return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+            page_size = pragma("page_size")
+            wal_path = args.db + "-wal"
+            print(f"pages:        {pragma('page_count')} x {page_size} bytes")
+            print(f"free pages:   {pragma('freelist_count')}")
+            print(f"auto_vacuum:  {('NONE', 'FULL', 'INCREMENTAL')[pragma('auto_vacuum')]}")
+            print(f"WAL size:     {os.path.getsize(wal_path) if os.path.exists(wal_path) else 0} bytes")
+            conn.close()
+        else:
+            seconds = convert_to_incremental()
+            print(f"converted {args.db} to incremental auto_vacuum in {seconds:.1f}s")
+    except sqlite3.Error as e:
+        parser.exit(1, f"error: {e}\n")
+    finally:
+        connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
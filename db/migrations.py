@@ -0,0 +1,321 @@
+# db/migrations.py
+import sqlite3
+
+from db.connection import get_connection
+
+# -------------------------------------------------------------------
+# Versioned schema migrations
+#
+# The schema version lives in PRAGMA user_version. Each step below
+# brings the DB from version N-1 to N; pending steps run once, in
+# order, inside a single transaction. A DB that is already current
+# costs one PRAGMA read.
+# -------------------------------------------------------------------
+
+
+def _table_exists(conn, name):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _seed_defaults(conn):
+    """Default users, classes and topics for a brand-new database.
+
+    Runs after all migrations, so it always targets the current schema.
+    """
+    users = [
+        ("Anushka", "abc123", "admin", None),
+        ("Imashi", "cde456", "student", "Grade 12"),
+        ("Chamika", "fgh789", "student", "Grade 13")
+    ]
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", users)
+
+    classes_data = [
+        ("Accounting 1", "Grade 12"),
+        ("Business Studies 1", "Grade 12"),
+        ("Economics 1", "Grade 12"),
+        ("Paper Discussions", "Grade 12"),
+        ("Accounting 2", "Grade 13"),
+        ("Business Studies 2", "Grade 13"),
+        ("Economics 2", "Grade 13"),
+        ("Paper Discussions", "Grade 13"),
+        ("Revision", "Grade 13"),
+    ]
+    conn.executemany("INSERT INTO classes (class_name, grade) VALUES (?, ?)", classes_data)
+
+    topics_data = {
+        "Accounting 1": 10,
+        "Business Studies 1": 6,
+        "Economics 1": 7,
+        "Accounting 2": 5,
+        "Business Studies 2": 6,
+        "Economics 2": 7,
+        "Paper Discussions": 9,
+        "Revision": 4
+    }
+
+    default_video = "/assets/videos/Accoounting1Topic1.mp4"
+    default_desc = "Sample topic description here."
+
+    rows = []
+    for class_id, cls in conn.execute("SELECT id, class_name FROM classes ORDER BY id"):
+        for i in range(1, topics_data.get(cls, 0) + 1):
+            topic_name = f"Topic {i}"
+            video_path = default_video
+            description = default_desc
+            if cls == "Accounting 1" and topic_name == "Topic 1":
+                video_path = "/assets/videos/Accoounting1Topic1.mp4"
+                description = "Introduction to accounting."
+            rows.append((class_id, topic_name, video_path, description))
+    conn.executemany(
+        "INSERT INTO topics (class_id, topic_name, video_path, description) VALUES (?, ?, ?, ?)",
+        rows
+    )
+
+
+# -------------------------------------------------------------------
+# Migration steps
+# -------------------------------------------------------------------
+def _m001_base_schema(conn):
+    """Create the original users/classes/topics tables."""
+    conn.execute('''CREATE TABLE IF NOT EXISTS users (
+                        username TEXT PRIMARY KEY,
+                        password TEXT,
+                        status TEXT,
+                        grade TEXT
+                    )''')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS classes (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        class_name TEXT UNIQUE,
+                        grade TEXT
+                    )''')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS topics (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        topic_name TEXT,
+                        class_name TEXT,
+                        video_path TEXT,
+                        description TEXT,
+                        UNIQUE(topic_name, class_name)
+                    )''')
+
+
+def _m002_unique_topics(conn):
+    """Enforce one topic name per class on DBs created without the constraint.
+
+    Older DBs may already hold duplicates; the oldest row of each pair is
+    kept. A unique index enforces the same rule as UNIQUE(topic_name,
+    class_name) without rebuilding the table, and its (class_name,
+    topic_name) order lets it serve the per-class lookups as well.
+    """
+    conn.execute('''DELETE FROM topics
+                    WHERE id NOT IN (SELECT MIN(id) FROM topics GROUP BY class_name, topic_name)''')
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_topics_class_topic ON topics(class_name, topic_name)")
+
+
+def _m003_catalog_indexes(conn):
+    """Covering indexes for the class and user listings."""
+    # get_classes_by_grade / get_all_classes (ORDER BY grade)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_classes_grade ON classes(grade, class_name)")
+    # get_all_users (ORDER BY status)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_status ON users(status, grade, username)")
+
+
+def _m004_users_page_index(conn):
+    """Match the users index to the paginated ORDER BY status DESC, username."""
+    conn.execute("DROP INDEX IF EXISTS idx_users_status")
+    conn.execute("CREATE INDEX idx_users_status ON users(status DESC, username, grade)")
+
+
+def _m005_topic_class_ids(conn):
+    """Key topics by classes.id with ON DELETE CASCADE.
+
+    Class names are only unique per grade from here on, so "Paper
+    Discussions" can exist in both grades. Topics are rewritten to point
+    at the class id their name resolved to; topics whose class no longer
+    exists (left behind by the old delete_class) are dropped.
+    """
+    conn.execute('''CREATE TABLE classes_new (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        class_name TEXT NOT NULL,
+                        grade TEXT,
+                        UNIQUE(class_name, grade)
+                    )''')
+    conn.execute("INSERT INTO classes_new (id, class_name, grade) SELECT id, class_name, grade FROM classes")
+    conn.execute("DROP TABLE classes")
+    conn.execute("ALTER TABLE classes_new RENAME TO classes")
+    conn.execute("CREATE INDEX idx_classes_grade ON classes(grade, class_name)")
+
+    conn.execute('''CREATE TABLE topics_new (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+                        topic_name TEXT NOT NULL,
+                        video_path TEXT,
+                        description TEXT,
+                        UNIQUE(class_id, topic_name)
+                    )''')
+    conn.execute('''INSERT OR IGNORE INTO topics_new (id, class_id, topic_name, video_path, description)
+                    SELECT t.id, c.id, t.topic_name, t.video_path, t.description
+                    FROM topics t
+                    JOIN classes c ON c.id = (SELECT MIN(id) FROM classes WHERE class_name = t.class_name)
+                    WHERE t.topic_name IS NOT NULL
+                    ORDER BY t.id''')
+    conn.execute("DROP TABLE topics")
+    conn.execute("ALTER TABLE topics_new RENAME TO topics")
+
+
+def _m006_topic_search(conn):
+    """FTS5 index over topic names, descriptions and class names.
+
+    A standalone FTS table (rowid = topics.id) kept in sync by triggers;
+    it holds its own copy of each topic's class name, so ranking by class
+    name needs no join (snippets are built in Python from the topics
+    rows). Cascaded deletes from classes fire the topics triggers too.
+    """
+    conn.execute('''CREATE VIRTUAL TABLE topics_fts USING fts5(
+                        topic_name, description, class_name, grade UNINDEXED,
+                        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+                    )''')
+    conn.execute('''INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+                    SELECT t.id, t.topic_name, t.description, c.class_name, c.grade
+                    FROM topics t JOIN classes c ON c.id = t.class_id''')
+
+    conn.execute('''CREATE TRIGGER topics_fts_insert AFTER INSERT ON topics BEGIN
+                        INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+                        SELECT new.id, new.topic_name, new.description, c.class_name, c.grade
+                        FROM classes c WHERE c.id = new.class_id;
+                    END''')
+    conn.execute('''CREATE TRIGGER topics_fts_delete AFTER DELETE ON topics BEGIN
+                        DELETE FROM topics_fts WHERE rowid = old.id;
+                    END''')
+    conn.execute('''CREATE TRIGGER topics_fts_update AFTER UPDATE ON topics BEGIN
+                        DELETE FROM topics_fts WHERE rowid = old.id;
+                        INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+                        SELECT new.id, new.topic_name, new.description, c.class_name, c.grade
+                        FROM classes c WHERE c.id = new.class_id;
+                    END''')
+    conn.execute('''CREATE TRIGGER classes_fts_update AFTER UPDATE OF class_name, grade ON classes BEGIN
+                        UPDATE topics_fts SET class_name = new.class_name, grade = new.grade
+                        WHERE rowid IN (SELECT id FROM topics WHERE class_id = new.id);
+                    END''')
+
+
+def _m007_video_index(conn):
+    """Index of the files under assets/videos and their MP4 metadata (see db/videos.py).
+
+    Keyed by the project-relative path with forward slashes, the same
+    form topics.video_path normalizes to. size and mtime_ns decide
+    whether a rescan has to probe a file again; error holds why a file
+    could not be probed, so a broken file isn't re-read on every scan.
+    """
+    conn.execute('''CREATE TABLE videos (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        duration REAL,
+                        width INTEGER,
+                        height INTEGER,
+                        codec TEXT,
+                        audio_codec TEXT,
+                        error TEXT
+                    ) WITHOUT ROWID''')
+
+
+def _m008_search_rank(conn):
+    """Index the grade in topics_fts and store the search ranking in it.
+
+    grade becomes an indexed column so search_topics filters it inside
+    MATCH instead of on every ranked row. It is indexed without spaces
+    ("Grade12"): one token per grade keeps its doclist short, and bm25
+    reads the doclist of every phrase in the query. Prefixes up to 8
+    characters are indexed, so each keystroke of an as-you-type query
+    reads one doclist instead of merging every term it starts (this
+    about doubles the index). The bm25 column weights become the
+    table's rank function, so queries ORDER BY rank.
+    """
+    conn.execute("DROP TABLE topics_fts")
+    conn.execute('''CREATE VIRTUAL TABLE topics_fts USING fts5(
+                        topic_name, description, class_name, grade,
+                        prefix='2 3 4 5 6 7 8', tokenize='unicode61 remove_diacritics 2'
+                    )''')
+    conn.execute('''INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+                    SELECT t.id, t.topic_name, t.description, c.class_name, replace(c.grade, ' ', '')
+                    FROM topics t JOIN classes c ON c.id = t.class_id''')
+    # topic name > class name > description; grade only filters
+    conn.execute("INSERT INTO topics_fts (topics_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 4.0, 0.0)')")
+
+    for name in ("topics_fts_insert", "topics_fts_update", "classes_fts_update"):
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute('''CREATE TRIGGER topics_fts_insert AFTER INSERT ON topics BEGIN
+                        INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+                        SELECT new.id, new.topic_name, new.description, c.class_name, replace(c.grade, ' ', '')
+                        FROM classes c WHERE c.id = new.class_id;
+                    END''')
+    conn.execute('''CREATE TRIGGER topics_fts_update AFTER UPDATE ON topics BEGIN
+                        DELETE FROM topics_fts WHERE rowid = old.id;
+                        INSERT INTO topics_fts (rowid, topic_name, description, class_name, grade)
+                        SELECT new.id, new.topic_name, new.description, c.class_name, replace(c.grade, ' ', '')
+                        FROM classes c WHERE c.id = new.class_id;
+                    END''')
+    conn.execute('''CREATE TRIGGER classes_fts_update AFTER UPDATE OF class_name, grade ON classes BEGIN
+                        UPDATE topics_fts SET class_name = new.class_name, grade = replace(new.grade, ' ', '')
+                        WHERE rowid IN (SELECT id FROM topics WHERE class_id = new.id);
+                    END''')
+
+
+MIGRATIONS = [
+    _m001_base_schema,
+    _m002_unique_topics,
+    _m003_catalog_indexes,
+    _m004_users_page_index,
+    _m005_topic_class_ids,
+    _m006_topic_search,
+    _m007_video_index,
+    _m008_search_rank,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn=None):
+    """Return the schema version recorded in the database."""
+    conn = conn or get_connection()
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn=None):
+    """Apply any pending migrations. Returns the list of versions applied."""
+    conn = conn or get_connection()
+    current = get_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return []
+
+    # Table rebuilds must not trigger FK actions; this pragma is a no-op
+    # inside a transaction, so it is toggled around it and the result is
+    # checked with foreign_key_check before committing.
+    conn.execute("PRAGMA foreign_keys=OFF")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock in case another process migrated first.
+        current = get_schema_version(conn)
+        new_db = current == 0 and not _table_exists(conn, "users")
+        applied = []
+        for version, step in enumerate(MIGRATIONS[current:], start=current + 1):
+            step(conn)
+            conn.execute(f"PRAGMA user_version={version}")
+            applied.append(version)
+        if new_db:
+            _seed_defaults(conn)
+        problems = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if problems:
+            raise sqlite3.IntegrityError(f"foreign key violations after migration: {problems[:5]}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+    return applied
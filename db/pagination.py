@@ -0,0 +1,104 @@
+# db/pagination.py
+from collections import namedtuple
+
+from db.connection import get_connection
+
+# -------------------------------------------------------------------
+# Keyset (seek) pagination
+#
+# Pages are addressed by the sort key of their first/last row rather
+# than an OFFSET, so every page is an index seek + `limit` rows no
+# matter how deep into the list it is.
+# -------------------------------------------------------------------
+PAGE_SIZE = 50
+
+# rows:      the rows of this page, in display order
+# first/last: cursors to pass as before=/after= for the previous/next page
+Page = namedtuple("Page", "rows first last has_prev has_next")
+
+
+def _seek_terms(order, cursor, forward):
+    """WHERE fragments selecting rows strictly after (or before) `cursor`.
+
+    Term i keeps the first i sort columns equal to the cursor and steps
+    past it on the next one:  (k1 = v1 AND k2 > v2), then (k1 > v1).
+    The terms are disjoint, nearest rows first, and each is a single
+    index range, so mixed ASC/DESC orderings still seek directly to the
+    cursor instead of scanning everything that shares its first key.
+
+    NULL sorts before every value (as in SQLite's ORDER BY), so keys are
+    matched with IS, "after NULL" is IS NOT NULL, and a step towards the
+    end that NULLs sort at gets its own IS NULL term after the range.
+    """
+    terms = []
+    for i in range(len(order) - 1, -1, -1):
+        column, direction = order[i]
+        op = ">" if (direction == "ASC") == forward else "<"
+        equal = [f"{col} IS ?" for col, _ in order[:i]]
+        value = cursor[i]
+        if value is None:
+            steps = [(f"{column} IS NOT NULL", [])] if op == ">" else []
+        else:
+            steps = [(f"{column} {op} ?", [value])]
+            if op == "<":
+                steps.append((f"{column} IS NULL", []))
+        for step, step_params in steps:
+            terms.append((" AND ".join(equal + [step]), list(cursor[:i]) + step_params))
+    return terms
+
+
+def fetch_page(select, order, key, where=(), params=(), after=None, before=None, limit=PAGE_SIZE):
+    """Run a keyset-paginated query.
+
+    select: "SELECT ... FROM table" without WHERE/ORDER BY
+    order:  [(column, "ASC"|"DESC"), ...]; must end in a unique column
+    key:    function(row) -> cursor tuple matching `order`
+    where:  extra WHERE fragments (ANDed) with their `params`
+    """
+    forward = before is None
+    cursor = after if forward else before
+
+    flip = {"ASC": "DESC", "DESC": "ASC"}
+    order_sql = ", ".join(f"{col} {d if forward else flip[d]}" for col, d in order)
+
+    def query(extra_where, extra_params, count):
+        clauses = list(where) + extra_where
+        sql = select
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_sql} LIMIT ?"
+        return get_connection().execute(sql, list(params) + extra_params + [count]).fetchall()
+
+    if cursor is None:
+        rows = query([], [], limit + 1)
+    else:
+        rows = []
+        for clause, seek_params in _seek_terms(order, cursor, forward):
+            rows += query([clause], seek_params, limit + 1 - len(rows))
+            if len(rows) > limit:
+                break
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+
+    if forward:
+        has_prev, has_next = cursor is not None, more
+    else:
+        has_prev, has_next = more, True
+    return Page(
+        rows,
+        key(rows[0]) if rows else None,
+        key(rows[-1]) if rows else None,
+        has_prev,
+        has_next,
+    )
+
+
+def count_rows(table, where=(), params=()):
+    """COUNT(*) with optional filters (served from an index when one matches)."""
+    sql = f"SELECT COUNT(*) FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return get_connection().execute(sql, list(params)).fetchone()[0]
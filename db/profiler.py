@@ -0,0 +1,266 @@
+# db/profiler.py
+"""Query profiler and slow-query log.
+
+Off by default. When enabled, managed connections are reopened with a
+Connection subclass that times every statement (execute + fetches) and
+counts the rows it returned. Statements slower than the threshold are
+logged to the "lms.db.slow" logger with their EXPLAIN QUERY PLAN.
+
+    LMS_PROFILE=1            enable at startup and print a report at exit
+    LMS_SLOW_MS=50           slow-query threshold in milliseconds
+    LMS_SLOW_LOG=slow.log    also append slow queries to this file
+
+While disabled, connections are plain sqlite3.Connection objects, so
+there is no per-query cost at all.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+from db import connection
+
+DEFAULT_SLOW_MS = 50.0
+SAMPLES = 1000      # latencies kept per statement for the percentiles
+
+slow_log = logging.getLogger("lms.db.slow")
+
+
+class StatementStats:
+    __slots__ = ("sql", "count", "total", "rows", "max", "samples")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLES)
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = DEFAULT_SLOW_MS
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, sql, elapsed, rows):
+        key = " ".join(sql.split())
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats(key)
+            stats.count += 1
+            stats.total += elapsed
+            stats.rows += rows
+            stats.max = max(stats.max, elapsed)
+            stats.samples.append(elapsed)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Per-statement stats as dicts, slowest total first. Times in ms."""
+        with self._lock:
+            stats = list(self._stats.values())
+        stats.sort(key=lambda s: s.total, reverse=True)
+        return [{
+            "sql": s.sql,
+            "count": s.count,
+            "total_ms": s.total * 1000,
+            "p50_ms": s.percentile(50) * 1000,
+            "p99_ms": s.percentile(99) * 1000,
+            "max_ms": s.max * 1000,
+            "rows": s.rows,
+        } for s in stats]
+
+    def report(self, limit=25, width=90):
+        """Plain-text table of the top `limit` statements by total time."""
+        rows = self.snapshot()
+        if not self.enabled and not rows:
+            return "Query profiling is off (set LMS_PROFILE=1 or enable it from the admin dashboard)."
+        lines = [
+            f"Query profile: {len(rows)} statements, "
+            f"{sum(r['count'] for r in rows)} calls in {time.time() - self.started:.0f}s "
+            f"(slow threshold {self.slow_ms:g} ms)",
+            f"{'calls':>7}{'total ms':>11}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'rows':>9}  statement",
+        ]
+        for r in rows[:limit]:
+            sql = r["sql"] if len(r["sql"]) <= width else r["sql"][:width - 3] + "..."
+            lines.append(f"{r['count']:>7}{r['total_ms']:>11.1f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                         f"{r['max_ms']:>9.2f}{r['rows']:>9}  {sql}")
+        if len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more")
+        return "\n".join(lines)
+
+
+profiler = Profiler()
+
+
+# -------------------------------------------------------------------
+# Instrumented connection / cursor
+# -------------------------------------------------------------------
+def _explain(conn, sql, params):
+    try:
+        cur = sqlite3.Cursor(conn)      # plain cursor: not profiled itself
+        plan = cur.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return "\n".join(f"    {row[-1]}" for row in plan) or "    (no plan)"
+    except sqlite3.Error as e:
+        return f"    (no plan: {e})"
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Times execute() plus the fetches that follow it as one call."""
+
+    _call = None    # [sql, params, elapsed, rows] of the statement being read
+
+    def _finish(self):
+        call, self._call = self._call, None
+        if call is None:
+            return
+        sql, params, elapsed, rows = call
+        profiler.record(sql, elapsed, rows)
+        if elapsed * 1000 >= profiler.slow_ms:
+            slow_log.warning("slow query (%.1f ms, %d rows): %s\n%s", elapsed * 1000, rows,
+                             " ".join(sql.split()), _explain(self.connection, sql, params))
+
+    def _timed(self, start, rows, done):
+        if self._call is not None:
+            self._call[2] += time.perf_counter() - start
+            self._call[3] += rows
+            if done:
+                self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._call = [sql, parameters, time.perf_counter() - start, 0]
+            if self.description is None:
+                self._finish()      # no result set to read
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            profiler.record(sql, time.perf_counter() - start, 0)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._timed(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._timed(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._timed(start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._timed(start, 0, True)
+            raise
+        self._timed(start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class ProfilingConnection(sqlite3.Connection):
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# -------------------------------------------------------------------
+# Control
+# -------------------------------------------------------------------
+def enable(slow_ms=None):
+    """Start profiling; managed connections are reopened instrumented."""
+    if slow_ms is not None:
+        profiler.slow_ms = float(slow_ms)
+    if not profiler.enabled:
+        profiler.enabled = True
+        profiler.reset()
+        connection.set_connection_factory(ProfilingConnection)
+
+
+def disable():
+    """Stop profiling (collected stats are kept until reset())."""
+    if profiler.enabled:
+        profiler.enabled = False
+        connection.set_connection_factory(sqlite3.Connection)
+
+
+def is_enabled():
+    return profiler.enabled
+
+
+def reset():
+    profiler.reset()
+
+
+def report(limit=25):
+    return profiler.report(limit)
+
+
+def dump_report(out=None, limit=25):
+    """Write the report to `out` (default stderr)."""
+    print(profiler.report(limit), file=out or sys.stderr)
+
+
+def _enable_from_env():
+    if os.environ.get("LMS_PROFILE", "").lower() in ("", "0", "false", "no"):
+        return
+    log_path = os.environ.get("LMS_SLOW_LOG")
+    if log_path:
+        handler = logging.FileHandler(log_path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_log.addHandler(handler)
+    enable(os.environ.get("LMS_SLOW_MS"))
+    atexit.register(dump_report)
+
+
+_enable_from_env()
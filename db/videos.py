@@ -0,0 +1,313 @@
+# db/videos.py
+"""Index of the lecture videos under assets/videos.
+
+The videos table holds, per file, its project-relative path, size,
+mtime and the metadata utils/mp4.py reads from its moov box (duration,
+resolution, codecs), so the topic page and the video server look a
+video up in the database instead of checking the filesystem each time.
+
+scan() is incremental: files whose size and mtime match their row are
+not opened, new or changed files are probed, vanished files are
+dropped, and all of it is written in one transaction. sync() does the
+same for a batch of changes reported by the watcher (db/watcher.py),
+which also scans once when the app starts, and moves topics along
+with their videos. lookup() indexes a single file neither has seen yet.
+
+    python -m db.videos scan [DIR]      # refresh the index (default: assets/videos)
+    python -m db.videos list
+"""
+import argparse
+import logging
+import os
+import posixpath
+import sqlite3
+import stat
+from collections import namedtuple
+
+from db import connection
+from db.cache import cached, catalog_cache
+from db.migrations import migrate
+from utils import mp4
+
+VIDEO_DIR = posixpath.join("assets", "videos")
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".mov")
+
+# One row of the videos table.
+Video = namedtuple("Video", "path size mtime_ns duration width height codec audio_codec error")
+
+log = logging.getLogger("lms.db.videos")
+
+_COLUMNS = ", ".join(Video._fields)
+_INSERT = f"INSERT OR REPLACE INTO videos ({_COLUMNS}) VALUES ({', '.join('?' * len(Video._fields))})"
+
+
+# -------------------------------------------------------------------
+# Paths
+# -------------------------------------------------------------------
+def normalize(video_path):
+    """The index key of a stored video_path: project-relative, forward slashes.
+
+    Stored paths come from Windows and macOS alike, with either slash
+    and sometimes an accidental leading one.
+    """
+    video_path = video_path.strip().replace("\\", "/").lstrip("/")
+    return posixpath.normpath(video_path) if video_path else ""
+
+
+def absolute(path):
+    """Absolute filesystem path of an index key (relative to the project dir)."""
+    return os.path.abspath(os.path.join(os.getcwd(), path))
+
+
+def _probe(path, st):
+    """A Video row for the file at index key `path` with stat result `st`."""
+    try:
+        info = mp4.probe(absolute(path))
+    except (mp4.Mp4Error, OSError) as e:
+        return Video(path, st.st_size, st.st_mtime_ns, None, None, None, None, None, str(e))
+    return Video(path, st.st_size, st.st_mtime_ns, info.duration, info.width, info.height,
+                 info.codec, info.audio_codec, None)
+
+
+# -------------------------------------------------------------------
+# Reads
+# -------------------------------------------------------------------
+@cached(lambda path: [("video", path)])
+def get_video(path):
+    """The Video row of index key `path`, or None if it isn't indexed."""
+    row = connection.get_connection().execute(
+        f"SELECT {_COLUMNS} FROM videos WHERE path=?", (path,)
+    ).fetchone()
+    return Video(*row) if row else None
+
+
+def lookup(video_path):
+    """The Video row of a topic's video_path, indexing the file if needed; None if it doesn't exist."""
+    path = normalize(video_path)
+    if not path:
+        return None
+    video = get_video(path)
+    if video is not None:
+        return video
+    try:
+        st = os.stat(absolute(path))
+    except OSError:
+        return None
+    video = _probe(path, st)
+    conn = connection.get_connection()
+    with conn:
+        conn.execute(_INSERT, video)
+    catalog_cache.invalidate(("video", path))
+    return video
+
+
+def describe(video):
+    """Short label for the topic page, e.g. "Duration 12:34 · 1920×1080 · H.264"."""
+    parts = []
+    if video.duration:
+        minutes, seconds = divmod(int(round(video.duration)), 60)
+        hours, minutes = divmod(minutes, 60)
+        parts.append(f"Duration {hours}:{minutes:02d}:{seconds:02d}" if hours else f"Duration {minutes}:{seconds:02d}")
+    if video.width and video.height:
+        parts.append(f"{video.width}×{video.height}")
+    if video.codec:
+        parts.append(mp4.codec_name(video.codec))
+    return " · ".join(parts)
+
+
+# -------------------------------------------------------------------
+# Scanning
+# -------------------------------------------------------------------
+def _walk(directory):
+    """(index key, stat result) of every video file under `directory`."""
+    for dirpath, _, filenames in os.walk(absolute(directory)):
+        relative = os.path.relpath(dirpath, os.getcwd()).replace(os.sep, "/")
+        for name in filenames:
+            if not name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            try:
+                st = os.stat(os.path.join(dirpath, name))
+            except OSError:
+                continue        # removed while we were walking
+            yield posixpath.normpath(posixpath.join(relative, name)), st
+
+
+def _rows_under(conn, directory):
+    """{index key: Video} of the indexed files under `directory`."""
+    if directory == ".":
+        rows = conn.execute(f"SELECT {_COLUMNS} FROM videos")
+    else:
+        # "0" sorts right after "/": every key under directory/
+        rows = conn.execute(f"SELECT {_COLUMNS} FROM videos WHERE path > ? AND path < ?",
+                            (directory + "/", directory + "0"))
+    return {row[0]: Video(*row) for row in rows}
+
+
+def _stat(path):
+    """Stat result of the video file at index key `path`, or None if there is none."""
+    if not path.lower().endswith(VIDEO_EXTENSIONS):
+        return None
+    try:
+        st = os.stat(absolute(path))
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _follow(conn, renamed, moved_dirs, gone):
+    """(topic id, class id, new video_path) for topics whose file moved (new path) or is gone (None)."""
+    updates = []
+    # Without directory moves only topics ending in one of the file names can match.
+    names = None if moved_dirs else tuple({posixpath.basename(p) for p in (*renamed, *gone)})
+    for topic_id, class_id, video_path in conn.execute(
+            "SELECT id, class_id, video_path FROM topics WHERE video_path IS NOT NULL AND video_path != ''"):
+        if names is not None and not video_path.rstrip().endswith(names):
+            continue
+        path = normalize(video_path)
+        target = renamed.get(path)
+        if target is None:
+            for old, new in moved_dirs:
+                if path.startswith(old + "/"):
+                    target = new + path[len(old):]
+                    break
+        if target is not None:
+            updates.append((topic_id, class_id, "/" + target))
+        elif path in gone:
+            updates.append((topic_id, class_id, None))
+    return updates
+
+
+def sync(paths=(), moves=(), directories=(), update_topics=True):
+    """Apply a batch of filesystem changes to the index in one transaction.
+
+    paths        index keys of files that were created, modified or deleted
+    moves        (old key, new key) pairs of moved files or directories
+    directories  index keys of directories to rescan as a whole
+
+    Only files whose size or mtime changed are probed again; a moved
+    file keeps its row. With update_topics, topics whose video moved
+    follow it to its new path, and topics whose video was deleted lose
+    their video_path. Returns counts per outcome.
+    """
+    conn = connection.get_connection()
+    known = {}          # index key -> Video row (None: not indexed) for every key looked at
+    check = {}          # index key -> stat result (None: no such file)
+    renamed = {}        # old key -> new key of moved files
+    moved_dirs = []
+
+    def look(key):
+        if key not in known:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM videos WHERE path=?", (key,)).fetchone()
+            known[key] = Video(*row) if row else None
+        return known[key]
+
+    for old, new in moves:
+        old, new = normalize(old), normalize(new)
+        # moved again within the batch: earlier moves now end up under `new`
+        for key, target in renamed.items():
+            if target == old or target.startswith(old + "/"):
+                renamed[key] = new + target[len(old):]
+        moved_dirs = [(o, new + n[len(old):]) if n == old or n.startswith(old + "/") else (o, n)
+                      for o, n in moved_dirs]
+        moved_dirs.append((old, new))
+        under = _rows_under(conn, old)
+        known.update(under)
+        for key in under:
+            renamed[key] = new + key[len(old):]
+        if look(old) is not None or old.lower().endswith(VIDEO_EXTENSIONS) or new.lower().endswith(VIDEO_EXTENSIONS):
+            renamed[old] = new
+    for old, new in renamed.items():
+        check[old] = _stat(old)
+        check[new] = _stat(new)
+
+    for directory in directories:
+        directory = normalize(directory)
+        under = _rows_under(conn, directory)
+        known.update(under)
+        check.update(dict.fromkeys(under))
+        for key, st in _walk(directory):
+            known.setdefault(key, None)
+            check[key] = st
+
+    for key in paths:
+        key = normalize(key)
+        check[key] = _stat(key)
+
+    sources = {new: old for old, new in renamed.items() if known.get(old) is not None}
+    upserts, removed, gone = [], [], set()
+    for key, st in check.items():
+        row = look(key)
+        if st is None:
+            gone.add(key)
+            if row is not None:
+                removed.append(key)
+        elif row is None or (row.size, row.mtime_ns) != (st.st_size, st.st_mtime_ns):
+            previous = known.get(sources.get(key))
+            if previous is not None and (previous.size, previous.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                upserts.append(previous._replace(path=key))
+            else:
+                upserts.append(_probe(key, st))
+
+    topics = []
+    if update_topics and (renamed or gone):
+        live = {old: new for old, new in renamed.items() if check[new] is not None}
+        topics = _follow(conn, live, [(o, n) for o, n in moved_dirs if os.path.isdir(absolute(n))], gone)
+
+    if upserts or removed or topics:
+        with conn:
+            conn.executemany(_INSERT, upserts)
+            conn.executemany("DELETE FROM videos WHERE path=?", [(key,) for key in removed])
+            conn.executemany("UPDATE topics SET video_path=? WHERE id=?",
+                             [(video_path, topic_id) for topic_id, _, video_path in topics])
+        catalog_cache.invalidate(*[("video", v.path) for v in upserts], *[("video", key) for key in removed],
+                                 *{("topics", class_id) for _, class_id, _ in topics})
+    cleared = [topic_id for topic_id, _, video_path in topics if video_path is None]
+    if cleared:
+        log.warning("video deleted: video_path cleared on %d topic(s) (ids %s)", len(cleared),
+                    ", ".join(map(str, cleared[:10])) + (", ..." if len(cleared) > 10 else ""))
+    return {
+        "files": sum(1 for st in check.values() if st is not None),
+        "added": sum(1 for v in upserts if known.get(v.path) is None),
+        "updated": sum(1 for v in upserts if known.get(v.path) is not None),
+        "removed": len(removed),
+        "errors": sum(1 for v in upserts if v.error),
+        "topics_moved": sum(1 for t in topics if t[2] is not None),
+        "topics_cleared": len(cleared),
+    }
+
+
+def scan(directory=VIDEO_DIR):
+    """Bring the index up to date with `directory` (topics are left alone); returns counts per outcome."""
+    return sync(directories=[directory], update_topics=False)
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m db.videos", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=connection.DEFAULT_DB_PATH, help="database file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_scan = sub.add_parser("scan", help="refresh the index")
+    p_scan.add_argument("directory", nargs="?", default=VIDEO_DIR)
+    sub.add_parser("list", help="show the indexed videos")
+    args = parser.parse_args(argv)
+
+    connection.configure(args.db)
+    try:
+        migrate()
+        if args.command == "scan":
+            counts = scan(args.directory)
+            print(", ".join(f"{count} {name}" for name, count in counts.items()))
+        else:
+            for video in map(Video._make, connection.get_connection().execute(
+                    f"SELECT {_COLUMNS} FROM videos ORDER BY path")):
+                print(f"{video.path:<50}{video.size:>14,}  {video.error or describe(video)}")
+    except sqlite3.Error as e:
+        parser.exit(1, f"error: {e}\n")
+    finally:
+        connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# db/watcher.py
+"""Keeps the video index in step with assets/videos while the app runs.
+
+A watchdog observer reports file events, which are collected rather
+than acted on: once the folder has been quiet for DEBOUNCE_SECONDS (or
+MAX_DELAY_SECONDS into a burst that doesn't stop), the whole batch
+goes to videos.sync() as one transaction. Copying a folder of 500
+lectures is a handful of writes, not 500 (or thousands, counting the
+modified events of every copy). Topics follow their video when it is
+moved or renamed and lose their video_path when it is deleted, so a
+missing file shows in the catalog instead of as "File Missing" in
+front of a student.
+
+The thread waits START_DELAY_SECONDS (importing watchdog takes longer
+than the rest of startup), starts the observer and then scans the
+folder once, so changes made while the app was closed, or during the
+scan, are not missed.
+
+    LMS_VIDEO_WATCH=0   no observer (the startup scan still runs)
+    LMS_VIDEO_SCAN=0    no startup scan
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from db import connection, videos
+
+DEBOUNCE_SECONDS = 1.0
+MAX_DELAY_SECONDS = 10.0
+START_DELAY_SECONDS = 3.0
+
+log = logging.getLogger("lms.db.watcher")
+
+
+class VideoWatcher(threading.Thread):
+    """Collects filesystem events under `directory` and applies them to the index in batches."""
+
+    def __init__(self, directory=videos.VIDEO_DIR, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS,
+                 start_delay=START_DELAY_SECONDS, watch=True, scan=True):
+        super().__init__(name="VideoWatcher", daemon=True)
+        self.directory = videos.normalize(directory)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.start_delay = start_delay
+        self.watch = watch
+        self.scan = scan
+        self.root = os.getcwd()     # index keys are relative to the project dir
+        self.ready = threading.Event()      # set once the observer runs and the scan is done
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._paths = set()
+        self._moves = []
+        self._directories = set()
+        self._first = self._last = None
+        self.events = 0
+        self.batches = 0
+        self.last_counts = None
+
+    # --- Events (called on the observer thread) ---
+    def _key(self, path):
+        return os.path.relpath(os.fsdecode(path), self.root).replace(os.sep, "/")
+
+    def dispatch(self, event):
+        """watchdog's event handler interface."""
+        kind = event.event_type
+        if kind in ("opened", "closed_no_write") or (kind == "modified" and event.is_directory):
+            return
+        source = self._key(event.src_path)
+        with self._lock:
+            if kind == "moved":
+                self._moves.append((source, self._key(event.dest_path)))
+            elif event.is_directory:
+                self._directories.add(source)       # created (copied in) or deleted as a whole
+            elif source.lower().endswith(videos.VIDEO_EXTENSIONS):
+                self._paths.add(source)             # created, modified, closed or deleted
+            else:
+                return
+            self.events += 1
+            self._last = time.monotonic()
+            if self._first is None:
+                self._first = self._last
+        self._wake.set()
+
+    # --- Batches (called on this thread) ---
+    def _take_batch(self):
+        """The pending batch once it is due, else None; also returns the seconds to wait."""
+        with self._lock:
+            if self._first is None:
+                return None, None
+            due = min(self._last + self.debounce, self._first + self.max_delay)
+            wait = due - time.monotonic()
+            if wait > 0:
+                return None, wait
+            batch = (self._paths, self._moves, self._directories)
+            self._paths, self._moves, self._directories = set(), [], set()
+            self._first = self._last = None
+            self._wake.clear()
+            return batch, None
+
+    def _apply(self, paths, moves, directories):
+        start = time.perf_counter()
+        try:
+            counts = videos.sync(paths, moves, directories)
+        except (sqlite3.Error, OSError):
+            log.exception("could not apply %d video changes (the next startup scan will)",
+                          len(paths) + len(moves) + len(directories))
+            return
+        self.batches += 1
+        self.last_counts = counts
+        log.info("video batch in %.2fs: %s", time.perf_counter() - start, counts)
+
+    def run(self):
+        if self._stop_event.wait(self.start_delay):
+            return
+        observer = self._start_observer() if self.watch else None
+        try:
+            if self.scan:
+                try:
+                    log.info("video scan: %s", videos.scan(self.directory))
+                except (sqlite3.Error, OSError):
+                    log.exception("video scan failed")
+            self.ready.set()
+            while observer is not None and not self._stop_event.is_set():
+                self._wake.wait()
+                batch, wait = self._take_batch()
+                if batch is not None:
+                    self._apply(*batch)
+                elif wait is not None:
+                    self._stop_event.wait(wait)
+        finally:
+            self.ready.set()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            connection.close_connection()
+
+    def _start_observer(self):
+        try:
+            from watchdog.observers import Observer     # slow import, kept off the startup path
+        except ImportError:
+            log.warning("watchdog is not installed: %s is only scanned at startup", self.directory)
+            return None
+        path = videos.absolute(self.directory)
+        os.makedirs(path, exist_ok=True)
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(self, path, recursive=True)
+        observer.start()
+        return observer
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    def pending(self):
+        """True while events are waiting for their batch."""
+        with self._lock:
+            return self._first is not None
+
+
+_watcher = None
+
+
+def start_watcher(directory=videos.VIDEO_DIR):
+    """Start the watcher thread once (see LMS_VIDEO_WATCH / LMS_VIDEO_SCAN)."""
+    global _watcher
+    watch = os.environ.get("LMS_VIDEO_WATCH", "1") != "0"
+    scan = os.environ.get("LMS_VIDEO_SCAN", "1") != "0"
+    if not (watch or scan):
+        return None
+    if _watcher is None or not _watcher.is_alive():
+        _watcher = VideoWatcher(directory, watch=watch, scan=scan)
+        _watcher.start()
+    return _watcher
+
+
+def stop_watcher():
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
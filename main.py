@@ -1,30 +1,31 @@
 # main.py
+from utils import startup     # first, so LMS_STARTUP=1 times every import below
 import tkinter as tk
 from db.database import init_db
+from db import backup, maintenance, watcher
+from ui.router import Router
 from ui.login_page import open_login_page
 from ui.student_dashboard import open_student_dashboard
-from ui.class_page import open_class_page
 from ui.admin_dashboard import open_admin_dashboard  # ✅ added
 from utils import styles
 
+startup.mark("imports")
 
-def next_page(root, username, status, grade):
+
+def next_page(router, username, status, grade):
     # Student flow
     if status == "student":
-        open_student_dashboard(
-            root,
-            username,
-            grade,
-            lambda r, u, g, c: open_class_page(r, u, g, c, open_student_dashboard)
-        )
+        router.reset(open_student_dashboard, username, grade)
     # Admin flow
     elif status == "admin":
-        open_admin_dashboard(root, username, open_login_page)
+        router.reset(open_admin_dashboard, username)
     else:
-        frame = tk.Frame(root, bg=styles.BG_COLOR)
-        frame.pack(fill="both", expand=True)
-        tk.Label(frame, text="Invalid user role.",
-                 font=styles.FONT_TITLE, fg=styles.FG_COLOR, bg=styles.BG_COLOR).pack(expand=True)
+        router.reset(open_invalid_role)
+
+
+def open_invalid_role(page):
+    tk.Label(page.frame, text="Invalid user role.",
+             font=styles.FONT_TITLE, fg=styles.FG_COLOR, bg=styles.BG_COLOR).pack(expand=True)
 
 
 if __name__ == "__main__":
@@ -37,7 +38,17 @@ if __name__ == "__main__":
         root.attributes("-zoomed", True)  # macOS/Linux fallback
 
     root.configure(bg=styles.BG_COLOR)
+    startup.mark("tk root")
 
     init_db()
-    open_login_page(root, next_page)
-    root.mainloop()
\ No newline at end of file
+    startup.mark("init_db")
+    backup.start_scheduler()        # periodic snapshots (LMS_BACKUP_INTERVAL minutes)
+    maintenance.start_scheduler()   # optimize/vacuum/checkpoint while idle
+    watcher.start_watcher()         # keep the video index in step with assets/videos
+    startup.mark("schedulers")
+    router = Router(root)
+    router.set_home(open_login_page, next_page)
+    router.home()
+    startup.mark("login page built")
+    startup.watch_first_frame(root, router.current.frame)
+    root.mainloop()
@@ -0,0 +1,289 @@
+# server/async_app.py
+import asyncio
+import json
+import logging
+import mimetypes
+import os
+import stat
+from email.utils import formatdate
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+from server import video, player, files, chunks
+
+# -------------------------------------------------------------------
+# asyncio video server (LMS_VIDEO_SERVER=asyncio)
+#
+# A small HTTP/1.1 server for the /topic/<id> player pages and
+# /video/<path>. One event loop on the server thread handles every
+# connection (database lookups go to worker threads); files (or
+# the byte ranges of them a request asks for, see server/files.py) go
+# out from the shared block cache (server/chunks.py; blocks it doesn't
+# hold are read on worker threads), or, with the cache off, with
+# loop.sendfile, which is os.sendfile (zero-copy) on Linux and macOS
+# and a read/write loop elsewhere. Connections are kept alive
+# between requests until they idle for KEEPALIVE_TIMEOUT seconds, and
+# writes wait for the client to drain (backpressure) so a slow viewer
+# holds no more than WRITE_HIGH_WATER bytes in memory.
+# -------------------------------------------------------------------
+MAX_CONNECTIONS = 256           # served at once; more wait for a free slot
+KEEPALIVE_TIMEOUT = 15.0        # seconds an idle connection is kept
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024      # request bodies are read and dropped
+WRITE_HIGH_WATER = 256 * 1024   # buffered bytes per connection before writes wait
+SERVER_NAME = "lms-video"
+
+log = logging.getLogger("lms.video")
+
+
+class HTTPError(Exception):
+    """Ends the request with `status`; the connection is closed after it."""
+
+    def __init__(self, status, message=""):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    __slots__ = ("method", "path", "version", "headers")
+
+    def __init__(self, method, path, version, headers):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers      # lower-case name -> value
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
+
+class Response:
+    """A status, headers and a body of pieces: bytes, or (offset, count) slices of `file`."""
+
+    __slots__ = ("status", "headers", "pieces", "file", "stat")
+
+    def __init__(self, status=200, headers=None, pieces=(), file=None, stat=None):
+        self.status = status
+        self.headers = headers or {}
+        self.pieces = pieces
+        self.file = file
+        self.stat = stat        # of `file`, for the block cache
+
+    @classmethod
+    def html(cls, text, status=200):
+        return cls(status, {"Content-Type": "text/html; charset=utf-8"}, [text.encode("utf-8")])
+
+    @property
+    def length(self):
+        return sum(len(p) if isinstance(p, bytes) else p[1] for p in self.pieces)
+
+
+def _open_file(path):
+    """(open binary file, its stat result); blocking, so run on a worker thread."""
+    f = open(path, "rb")
+    try:
+        return f, os.fstat(f.fileno())
+    except OSError:
+        f.close()
+        raise
+
+
+# -------------------------------------------------------------------
+# Server
+# -------------------------------------------------------------------
+class VideoServer:
+    """Serves the player page and VIDEO_DIR; one instance per event loop."""
+
+    def __init__(self, video_dir=None, max_connections=MAX_CONNECTIONS):
+        self.video_dir = os.path.abspath(video_dir or video.VIDEO_DIR)
+        self.slots = asyncio.Semaphore(max_connections)
+        self.active = 0             # connections being served
+        self.requests = 0
+        self.server = None
+
+    async def start(self, host, port):
+        self.server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER_BYTES)
+        return self.server
+
+    async def serve_forever(self, host, port):
+        await self.start(host, port)
+        async with self.server:
+            await self.server.serve_forever()
+
+    # --- Connections ---
+    async def _handle(self, reader, writer):
+        async with self.slots:
+            self.active += 1
+            writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+            try:
+                while True:
+                    try:
+                        request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_TIMEOUT)
+                    except HTTPError as error:
+                        await self._send(writer, None, self._error(error.status), keep_alive=False)
+                        break
+                    if request is None:
+                        break
+                    self.requests += 1
+                    keep_alive = request.keep_alive
+                    await self._send(writer, request, await self._route(request), keep_alive)
+                    if not keep_alive:
+                        break
+            except (asyncio.TimeoutError, ConnectionError):
+                pass                # idle too long, or the client went away
+            except Exception:
+                log.exception("video server: request failed")
+            finally:
+                self.active -= 1
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def _read_request(self, reader):
+        """The next request on the connection; None once the client closed it."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise HTTPError(HTTPStatus.BAD_REQUEST)
+            return None
+
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        method, target, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(HTTPStatus.BAD_REQUEST)
+            name = name.strip().lower()
+            value = value.strip()
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+        if "transfer-encoding" in headers:
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED)
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        if length:
+            await reader.readexactly(length)
+        return Request(method, unquote(urlsplit(target).path), version, headers)
+
+    async def _send(self, writer, request, response, keep_alive):
+        status = HTTPStatus(response.status)
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Date: {formatdate(usegmt=True)}",
+            f"Server: {SERVER_NAME}",
+        ]
+        if response.status != HTTPStatus.NOT_MODIFIED:
+            head.append(f"Content-Length: {response.length}")
+        head += [f"{name}: {value}" for name, value in response.headers.items()]
+        head.append(f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+
+        try:
+            if request is None or request.method != "HEAD":
+                loop = asyncio.get_running_loop()
+                for piece in response.pieces:
+                    if isinstance(piece, bytes):
+                        writer.write(piece)
+                    elif chunks.cache.enabled:
+                        await self._send_cached(writer, response, *piece)
+                    else:
+                        await writer.drain()
+                        await loop.sendfile(writer.transport, response.file, *piece)
+            await writer.drain()
+        finally:
+            if response.file is not None:
+                response.file.close()
+
+    async def _send_cached(self, writer, response, offset, count):
+        """Write file bytes [offset, offset + count) from the block cache."""
+        cache = chunks.cache
+        path, st = response.file.name, response.stat
+        loop = asyncio.get_running_loop()
+        for number, start, end in cache.spans(offset, count):
+            data = cache.get(path, st, number)
+            if data is None:
+                data = await loop.run_in_executor(None, cache.block, response.file, path, st, number)
+            view = memoryview(data)
+            # Slices of WRITE_HIGH_WATER mostly go straight to the socket
+            # instead of being copied into the transport's buffer first.
+            for pos in range(start, end, WRITE_HIGH_WATER):
+                writer.write(view[pos:min(pos + WRITE_HIGH_WATER, end)])
+                await writer.drain()
+
+    # --- Routes ---
+    async def _route(self, request):
+        if request.method not in ("GET", "HEAD"):
+            response = self._error(HTTPStatus.METHOD_NOT_ALLOWED)
+            response.headers["Allow"] = "GET, HEAD"
+            return response
+        if request.path == "/":
+            return self._document(player.NO_VIDEO, request.headers)
+        if request.path.startswith("/topic/"):
+            return await self.topic(request.path[len("/topic/"):], request.headers)
+        if request.path.startswith("/video/"):
+            return await self.serve_video(request.path[len("/video/"):], request.headers)
+        if request.path == "/stats/cache":
+            body = json.dumps(chunks.cache.stats()).encode("utf-8")
+            return Response(200, {"Content-Type": "application/json", "Cache-Control": "no-store"}, [body])
+        return self._error(HTTPStatus.NOT_FOUND)
+
+    async def topic(self, topic_id, headers):
+        """The HTML5 player page of one topic."""
+        if not topic_id.isdigit():
+            return self._error(HTTPStatus.NOT_FOUND)
+        # The lookup queries SQLite, so it runs on a worker thread, not the event loop.
+        loop = asyncio.get_running_loop()
+        document = await loop.run_in_executor(None, player.topic_page, int(topic_id))
+        if document is None:
+            return Response.html("<h3>Topic not found</h3>", HTTPStatus.NOT_FOUND)
+        return self._document(document, headers)
+
+    def _document(self, document, headers):
+        plan = document.plan(lambda name: headers.get(name.lower()))
+        return Response(plan.status, plan.headers, plan.pieces)
+
+    async def serve_video(self, filename, headers):
+        """The video file (or the ranges asked for), streamed from the block cache or with sendfile."""
+        file_path = os.path.normpath(os.path.join(self.video_dir, filename))
+        if not file_path.startswith(self.video_dir + os.sep):
+            return self._error(HTTPStatus.NOT_FOUND)
+        # open() and fstat() can block on a slow or network disk: keep them off the event loop.
+        loop = asyncio.get_running_loop()
+        try:
+            f, st = await loop.run_in_executor(None, _open_file, file_path)
+        except (OSError, ValueError):     # ValueError: a NUL byte (%00) in the path
+            return self._error(HTTPStatus.NOT_FOUND)
+        if not stat.S_ISREG(st.st_mode):
+            f.close()
+            return self._error(HTTPStatus.NOT_FOUND)
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        plan = files.plan(lambda name: headers.get(name.lower()), st, content_type)
+        return Response(plan.status, plan.headers, plan.pieces, file=f, stat=st)
+
+    def _error(self, status):
+        status = HTTPStatus(status)
+        return Response.html(f"<h3>{status.value} {status.phrase}</h3>", status)
+
+
+def run():
+    """Serve until the process exits (called on the server thread)."""
+    asyncio.run(VideoServer().serve_forever(video.HOST, video.PORT))
@@ -0,0 +1,153 @@
+# server/chunks.py
+"""Shared in-memory cache of video file blocks, used by both engines.
+
+In a classroom most viewers watch the same lecture within the same
+minute, so the engines read video files through one LRU of BLOCK_SIZE
+blocks keyed by (file path, block number) and bounded by a byte budget
+(LMS_VIDEO_CACHE_MB). A range request is cut into the blocks it
+overlaps: resident blocks come from memory, a missing block is read
+once (viewers asking for it meanwhile wait for that read instead of
+each reading it) and kept. A file's blocks are dropped as soon as a
+request sees it with a different size or mtime.
+
+LMS_VIDEO_CACHE_MB=0 turns the cache off: the Flask engine then reads
+through mmap and the asyncio engine uses sendfile.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+BLOCK_SIZE = 1024 * 1024
+BUDGET_BYTES = int(float(os.environ.get("LMS_VIDEO_CACHE_MB", "256")) * 1024 * 1024)
+
+
+class ChunkCache:
+    """Byte-budgeted LRU of file blocks with single-flight reads."""
+
+    def __init__(self, budget=BUDGET_BYTES, block_size=BLOCK_SIZE):
+        self.budget = budget
+        self.block_size = block_size
+        self._blocks = OrderedDict()    # (path, block number) -> bytes
+        self._files = {}                # path -> [(size, mtime_ns), set of resident block numbers]
+        self._loading = {}              # (path, block number) -> Event set when its read is done
+        self._lock = threading.Lock()
+        self.resident = 0               # bytes held
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.budget >= self.block_size
+
+    def spans(self, offset, count):
+        """(block number, start, end) of the blocks covering file bytes [offset, offset + count)."""
+        end = offset + count
+        for number in range(offset // self.block_size, (end - 1) // self.block_size + 1 if count else 0):
+            base = number * self.block_size
+            yield number, max(offset, base) - base, min(end, base + self.block_size) - base
+
+    # --- Lookups ---
+    def _check(self, path, st):
+        """Drop `path`'s blocks if the file changed since they were read (lock held)."""
+        signature = (st.st_size, st.st_mtime_ns)
+        entry = self._files.get(path)
+        if entry is None:
+            self._files[path] = [signature, set()]
+        elif entry[0] != signature:
+            for number in entry[1]:
+                self.resident -= len(self._blocks.pop((path, number)))
+            self.invalidations += len(entry[1])
+            self._files[path] = [signature, set()]
+
+    def get(self, path, st, number):
+        """The block if it is resident (a hit), else None; never reads the file."""
+        key = (path, number)
+        with self._lock:
+            self._check(path, st)
+            data = self._blocks.get(key)
+            if data is not None:
+                self._blocks.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def block(self, f, path, st, number):
+        """Block `number` of open file `f` (at `path`, stat result `st`): from memory, or read and kept.
+
+        Blocking: the asyncio engine calls it on a worker thread.
+        """
+        key = (path, number)
+        while True:
+            with self._lock:
+                self._check(path, st)
+                data = self._blocks.get(key)
+                if data is not None:
+                    self._blocks.move_to_end(key)
+                    self.hits += 1
+                    return data
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    break
+            loading.wait()      # another viewer is reading this block; it will be resident (or failed)
+
+        data = None
+        try:
+            f.seek(number * self.block_size)
+            data = f.read(self.block_size)
+        finally:
+            with self._lock:
+                del self._loading[key]
+                self.misses += 1
+                signature = (st.st_size, st.st_mtime_ns)
+                entry = self._files.setdefault(path, [signature, set()])
+                if data is not None and entry[0] == signature:
+                    self._blocks[key] = data
+                    entry[1].add(number)
+                    self.resident += len(data)
+                    self._evict()
+            loading.set()       # after storing, so waiters find it resident
+        return data
+
+    def _evict(self):
+        while self.resident > self.budget and self._blocks:
+            (path, number), data = self._blocks.popitem(last=False)
+            numbers = self._files[path][1]
+            numbers.discard(number)
+            if not numbers:
+                del self._files[path]
+            self.resident -= len(data)
+            self.evictions += 1
+
+    def iter_range(self, f, path, st, offset, count):
+        """Yield file bytes [offset, offset + count) block by block (for the Flask engine)."""
+        for number, start, end in self.spans(offset, count):
+            data = self.block(f, path, st, number)
+            yield data if (start, end) == (0, len(data)) else data[start:end]
+
+    # --- Stats ---
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "budget": self.budget,
+                "block_size": self.block_size,
+                "resident": self.resident,
+                "blocks": len(self._blocks),
+                "files": sum(1 for _, numbers in self._files.values() if numbers),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._files.clear()
+            self.resident = 0
+
+
+cache = ChunkCache()
@@ -0,0 +1,182 @@
+# server/files.py
+"""How a video file is answered, independent of the server engine.
+
+plan() reads the request's conditional and Range headers and returns a
+responses.Plan: the status, the response headers and the body as a list
+of pieces, each either bytes (multipart separators) or an (offset, count)
+slice of the file. The engines read the slices through the shared
+block cache (server/chunks.py; iter_pieces for Flask), or, with it
+off, with sendfile (asyncio) or from an mmap of the file (Flask), so a
+seek to minute 40 reads just the bytes asked for.
+
+Ranges follow RFC 9110: single ranges get a 206 with Content-Range,
+several get multipart/byteranges, overlapping ones are merged, and a
+header that is malformed or asks for more than MAX_RANGES ranges is
+ignored (the whole file is sent). If none is satisfiable the answer is
+416. If-Range only honours a strong ETag or the exact Last-Modified.
+
+Before any of that, a matching If-None-Match (or, without one, an
+If-Modified-Since no older than the file) gets a bodiless 304, and
+every answer carries VIDEO_CACHE_CONTROL, so a reopened lecture is
+revalidated rather than downloaded again.
+"""
+import mmap
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from server import chunks
+from server.responses import Plan, not_modified, not_modified_plan
+
+MAX_RANGES = 16             # more than this (after merging) and the Range header is ignored
+CHUNK = 256 * 1024          # bytes per piece yielded by iter_pieces from mmap
+VIDEO_CACHE_CONTROL = "public, max-age=3600"    # then revalidated; replacing a file changes its ETag
+
+
+# -------------------------------------------------------------------
+# Validators
+# -------------------------------------------------------------------
+def etag(st):
+    """Strong ETag from size and mtime (changes whenever the file is replaced or edited)."""
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def last_modified(st):
+    return formatdate(st.st_mtime, usegmt=True)
+
+
+def _if_range_matches(value, st):
+    value = value.strip()
+    if value.startswith('"'):
+        return value == etag(st)
+    if value.startswith("W/"):
+        return False            # weak tags never validate a range
+    try:
+        return int(parsedate_to_datetime(value).timestamp()) == int(st.st_mtime)
+    except (TypeError, ValueError):
+        return False
+
+
+# -------------------------------------------------------------------
+# Ranges
+# -------------------------------------------------------------------
+class Unsatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """[(start, end)] (end exclusive) for a Range header, or None to send everything.
+
+    Raises Unsatisfiable when the header is valid but no range overlaps the file.
+    """
+    unit, sep, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not sep:
+        return None
+    ranges = []
+    for item in spec.split(","):
+        first, dash, last = item.strip().partition("-")
+        first, last = first.strip(), last.strip()
+        if not dash or (last and not last.isdigit()):
+            return None
+        if not first:
+            if not last:
+                return None
+            suffix = int(last)      # "-500": the last 500 bytes
+            if suffix:
+                ranges.append((max(size - suffix, 0), size))
+            continue
+        if not first.isdigit():
+            return None
+        start = int(first)
+        if last and int(last) < start:
+            return None         # "5-2" is malformed, not unsatisfiable
+        end = int(last) + 1 if last else size
+        if start < size:
+            ranges.append((start, min(end, size)))
+    if not ranges:
+        raise Unsatisfiable()
+
+    if any(a[1] > b[0] for a, b in zip(sorted(ranges), sorted(ranges)[1:])):
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        ranges = merged
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+
+def plan(get_header, st, content_type):
+    """The response for a GET/HEAD of a file with stat `st`; get_header(name) reads a request header."""
+    size = st.st_size
+    headers = {
+        "Content-Type": content_type,
+        "Accept-Ranges": "bytes",
+        "ETag": etag(st),
+        "Last-Modified": last_modified(st),
+        "Cache-Control": VIDEO_CACHE_CONTROL,
+    }
+    if not_modified(get_header, {headers["ETag"]}, st.st_mtime):
+        return not_modified_plan(headers)
+    whole = Plan(200, headers, [(0, size)] if size else [])
+
+    range_header = get_header("Range")
+    if not range_header:
+        return whole
+    if_range = get_header("If-Range")
+    if if_range and not _if_range_matches(if_range, st):
+        return whole
+    try:
+        ranges = parse_range(range_header, size)
+    except Unsatisfiable:
+        headers["Content-Range"] = f"bytes */{size}"
+        headers["Content-Type"] = "text/plain; charset=utf-8"
+        return Plan(416, headers, [b"Requested range not satisfiable"])
+    if ranges is None:
+        return whole
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+        return Plan(206, headers, [(start, end - start)])
+
+    boundary = uuid.uuid4().hex
+    headers["Content-Type"] = f"multipart/byteranges; boundary={boundary}"
+    pieces = []
+    for start, end in ranges:
+        pieces.append(f"\r\n--{boundary}\r\nContent-Type: {content_type}\r\n"
+                      f"Content-Range: bytes {start}-{end - 1}/{size}\r\n\r\n".encode("latin-1"))
+        pieces.append((start, end - start))
+    pieces.append(f"\r\n--{boundary}--\r\n".encode("latin-1"))
+    return Plan(206, headers, pieces)
+
+
+def iter_pieces(f, st, pieces):
+    """Yield the body of a plan as bytes, reading file slices of open file `f` (stat result `st`).
+
+    Slices come from the shared block cache (server/chunks.py), or
+    through mmap when it is off. The caller closes `f` (the generator
+    may never be started).
+    """
+    if chunks.cache.enabled:
+        for piece in pieces:
+            if isinstance(piece, bytes):
+                yield piece
+            else:
+                yield from chunks.cache.iter_range(f, f.name, st, *piece)
+        return
+    mapped = None
+    try:
+        for piece in pieces:
+            if isinstance(piece, bytes):
+                yield piece
+                continue
+            offset, count = piece
+            if mapped is None:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            for pos in range(offset, offset + count, CHUNK):
+                yield mapped[pos:min(pos + CHUNK, offset + count)]
+    finally:
+        if mapped is not None:
+            mapped.close()
@@ -0,0 +1,76 @@
+# server/flask_app.py
+import mimetypes
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request
+from werkzeug.security import safe_join
+from server import video, player, files, chunks
+
+# -------------------------------------------------------------------
+# Flask video server (imported by server.video on first use)
+# -------------------------------------------------------------------
+app = Flask(__name__)
+
+# The dev server runs each request on a new thread, which would open (and
+# tune) a new SQLite connection per page; lookups run on these long-lived
+# threads instead, each keeping its managed connection.
+_db = ThreadPoolExecutor(max_workers=2, thread_name_prefix="VideoDB")
+
+
+def _document_response(document):
+    plan = document.plan(request.headers.get)
+    return Response(plan.pieces, plan.status, plan.headers)
+
+
+@app.route('/')
+def index():
+    return _document_response(player.NO_VIDEO)
+
+
+@app.route('/topic/<int:topic_id>')
+def topic(topic_id):
+    """Render the HTML5 video player page of one topic."""
+    document = _db.submit(player.topic_page, topic_id).result()
+    if document is None:
+        return "<h3>Topic not found</h3>", 404
+    return _document_response(document)
+
+
+@app.route('/stats/cache')
+def cache_stats():
+    """Hit ratio and resident size of the video block cache, as JSON."""
+    return chunks.cache.stats()
+
+
+@app.route('/video/<path:filename>')
+def serve_video(filename):
+    """Serve the video file (or the byte ranges asked for) to the HTML5 player."""
+    file_path = safe_join(video.VIDEO_DIR, filename)
+    f = st = None
+    try:
+        if file_path is not None:
+            f = open(file_path, "rb")
+            st = os.fstat(f.fileno())
+    except (OSError, ValueError):     # ValueError: a NUL byte (%00) in the path
+        pass
+    if st is None or not stat.S_ISREG(st.st_mode):
+        if f is not None:
+            f.close()
+        return "<h3>404 Not Found</h3>", 404
+    # One open and one fstat per request; the body is read from the same
+    # descriptor, and the file is closed with the response (also for
+    # HEAD and 304, where the body generator never starts).
+    content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    plan = files.plan(request.headers.get, st, content_type)
+    headers = dict(plan.headers)
+    if plan.status != 304:
+        headers["Content-Length"] = str(plan.length)
+    response = Response(files.iter_pieces(f, st, plan.pieces), plan.status, headers, direct_passthrough=True)
+    response.call_on_close(f.close)
+    return response
+
+
+def run():
+    """Serve until the process exits (called on the server thread)."""
+    app.run(host=video.HOST, port=video.PORT, debug=False, use_reloader=False)
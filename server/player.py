@@ -0,0 +1,93 @@
+# server/player.py
+import functools
+import html
+from string import Template
+from urllib.parse import quote
+from db import videos
+from db.database import get_topic
+from server import video
+from server.responses import Document
+
+# -------------------------------------------------------------------
+# HTML5 player page, shared by the video server engines
+#
+# The template is parsed once at import; each (video, title) page is
+# rendered, hashed and compressed once and then reused (see
+# responses.Document), so serving it again costs a cache lookup.
+# topic_page() is what /topic/<id> serves on both engines; the line
+# under the title (duration, resolution, codec) comes from the video
+# index (db/videos.py), not from the file.
+# -------------------------------------------------------------------
+PAGES_CACHED = 64
+
+_TEMPLATE = Template("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>$title</title>
+        <style>
+            body {
+                background-color: #212121;
+                color: #FFFFFF;
+                display: flex;
+                flex-direction: column;
+                align-items: center;
+                justify-content: flex-start;
+                height: 100vh;
+                margin: 0;
+            }
+            video {
+                width: 80%;
+                max-width: 960px;
+                border-radius: 12px;
+                box-shadow: 0 0 20px rgba(0,0,0,0.5);
+                margin-top: 40px;
+            }
+            h2 {
+                font-family: Inter, sans-serif;
+                font-size: 24px;
+                margin-top: 20px;
+                margin-bottom: 10px;
+            }
+            .details {
+                font-family: Inter, sans-serif;
+                font-size: 14px;
+                color: #BDBDBD;
+                margin: 0;
+            }
+        </style>
+    </head>
+    <body>
+        <h2>🎬 $title</h2>
+        <p class="details">$details</p>
+        <video controls autoplay>
+            <source src="/video/$video_file" type="video/mp4">
+            Your browser does not support the video tag.
+        </video>
+    </body>
+    </html>
+    """)
+
+
+@functools.lru_cache(maxsize=PAGES_CACHED)
+def page(video_file, title, details=""):
+    """The player page Document for `video_file` (a name under VIDEO_DIR)."""
+    return Document.html(_TEMPLATE.substitute(title=html.escape(title), details=html.escape(details),
+                                              video_file=html.escape(quote(video_file))))
+
+
+def topic_page(topic_id):
+    """The player page Document of topic `topic_id`; None if there is no such topic or video.
+
+    Runs on a server thread (it queries the database).
+    """
+    topic = get_topic(topic_id)
+    if topic is None or not topic[3]:
+        return None
+    class_name, _, topic_name, video_path, _ = topic
+    indexed = videos.lookup(video_path)
+    return page(video.video_name(video.resolve(video_path)), f"{class_name} - {topic_name}",
+                videos.describe(indexed) if indexed else "")
+
+
+NO_VIDEO = Document.html("<h3>No video selected</h3>")
@@ -0,0 +1,131 @@
+# server/responses.py
+"""Engine-independent responses: conditional GET and compressed documents.
+
+A Plan is what the engines send: a status, headers and the body as a
+list of pieces, each bytes or an (offset, count) slice of a file (see
+server/files.py). Document is an in-memory body (the player page)
+with a strong ETag and gzip (and brotli, if installed) variants
+compressed once when it is built, so repeat requests cost a dict
+lookup and revisits with a matching If-None-Match get a bodiless 304.
+"""
+import gzip
+import hashlib
+from email.utils import parsedate_to_datetime
+
+try:
+    import brotli
+except ImportError:     # optional: pip install brotli
+    brotli = None
+
+MIN_COMPRESS_BYTES = 256    # smaller bodies are sent as they are
+PAGE_CACHE_CONTROL = "no-cache"     # always revalidated (cheap: ETag -> 304)
+
+
+class Plan:
+    __slots__ = ("status", "headers", "pieces")
+
+    def __init__(self, status, headers, pieces):
+        self.status = status
+        self.headers = headers
+        self.pieces = pieces    # bytes, or (offset, count) slices of a file
+
+    @property
+    def length(self):
+        return sum(len(p) if isinstance(p, bytes) else p[1] for p in self.pieces)
+
+
+# -------------------------------------------------------------------
+# Conditional requests
+# -------------------------------------------------------------------
+def _tags(header):
+    """Entity tags of an If-None-Match header, weak prefixes dropped."""
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def not_modified(get_header, etags, mtime=None):
+    """True if the client's copy is current (If-None-Match, else If-Modified-Since).
+
+    `etags` are the tags this resource may have been sent with.
+    """
+    none_match = get_header("If-None-Match")
+    if none_match:
+        tags = _tags(none_match)
+        return "*" in tags or not tags.isdisjoint(etags)
+    since = get_header("If-Modified-Since")
+    if since and mtime is not None:
+        try:
+            return int(mtime) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_plan(headers):
+    """304 with just the validators and caching headers of `headers`."""
+    keep = ("ETag", "Last-Modified", "Cache-Control", "Vary")
+    return Plan(304, {name: headers[name] for name in keep if name in headers}, [])
+
+
+# -------------------------------------------------------------------
+# Compression
+# -------------------------------------------------------------------
+def choose_encoding(accept_encoding, available):
+    """The best of `available` (server preference order) the client accepts; None = identity."""
+    weights = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class Document:
+    """An in-memory body, its ETag and its precompressed variants."""
+
+    def __init__(self, body, content_type, cache_control=PAGE_CACHE_CONTROL):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self.variants = {None: body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body)
+            self.variants["gzip"] = gzip.compress(body, 6, mtime=0)
+        self._etags = {self._etag(encoding) for encoding in self.variants}
+
+    @classmethod
+    def html(cls, text, cache_control=PAGE_CACHE_CONTROL):
+        return cls(text.encode("utf-8"), "text/html; charset=utf-8", cache_control)
+
+    def _etag(self, encoding):
+        # Each encoding is a different representation, so it gets its own tag.
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+    def plan(self, get_header):
+        encoding = choose_encoding(get_header("Accept-Encoding"), [e for e in self.variants if e])
+        headers = {
+            "Content-Type": self.content_type,
+            "Cache-Control": self.cache_control,
+            "ETag": self._etag(encoding),
+        }
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if not_modified(get_header, self._etags):
+            return not_modified_plan(headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Plan(200, headers, [self.variants[encoding]])
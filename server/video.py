@@ -0,0 +1,97 @@
+# server/video.py
+import importlib
+import os
+import socket
+import threading
+import time
+from db import videos
+
+# -------------------------------------------------------------------
+# Video server for the topic page, started on first use
+#
+# Importing this module is cheap: the engine (and Flask, if that is the
+# one configured) is only imported on the server thread when start() is
+# first called, so it never delays startup or blocks the Tk thread.
+#
+#     LMS_VIDEO_SERVER=flask     Flask's built-in server (default)
+#     LMS_VIDEO_SERVER=asyncio   server/async_app.py: sendfile, keep-alive,
+#                                many concurrent streams
+#     LMS_VIDEO_HOST=0.0.0.0     also serve other machines on the LAN
+#
+# The server keeps no "current video": each topic's player is at
+# /topic/<id>, looked up in the database per request, so any number of
+# windows or LAN clients can watch different lectures at once.
+# -------------------------------------------------------------------
+ENGINES = {
+    "flask": "server.flask_app",
+    "asyncio": "server.async_app",
+}
+ENGINE = os.environ.get("LMS_VIDEO_SERVER", "flask").lower()
+
+HOST = os.environ.get("LMS_VIDEO_HOST", "127.0.0.1")
+PORT = 5000
+VIDEO_DIR = os.path.join(os.getcwd(), "assets", "videos")
+
+_thread = None
+_lock = threading.Lock()
+
+
+def _serve():
+    importlib.import_module(ENGINES[ENGINE]).run()
+
+
+def start():
+    """Start the server thread once; later calls do nothing."""
+    global _thread
+    if ENGINE not in ENGINES:
+        raise ValueError(f"LMS_VIDEO_SERVER must be one of {', '.join(ENGINES)}, not {ENGINE!r}")
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_serve, daemon=True, name="VideoServer")
+            _thread.start()
+
+
+def wait_ready(timeout=10.0):
+    """Block until the server accepts connections; False on timeout."""
+    start()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((_local_host(), PORT), timeout=0.5).close()
+            return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+
+def _local_host():
+    return "127.0.0.1" if HOST in ("", "0.0.0.0") else HOST
+
+
+def url(path="/"):
+    return f"http://{_local_host()}:{PORT}{path}"
+
+
+def topic_url(topic_id):
+    """The player page of topic `topic_id`."""
+    return url(f"/topic/{topic_id}")
+
+
+# -------------------------------------------------------------------
+# Video paths
+# -------------------------------------------------------------------
+def resolve(video_path):
+    """Absolute path of a topic's stored video_path (relative to the project dir)."""
+    return videos.absolute(videos.normalize(video_path))
+
+
+def video_name(abs_path):
+    """The name /video/<name> serves `abs_path` under (its path in VIDEO_DIR)."""
+    try:
+        relative = os.path.relpath(abs_path, VIDEO_DIR)
+    except ValueError:
+        relative = ".."                     # another drive (Windows)
+    if relative.startswith(".."):
+        return os.path.basename(abs_path)   # outside VIDEO_DIR: looked up by name, as before
+    return relative.replace(os.sep, "/")
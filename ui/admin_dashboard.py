@@ -1,22 +1,19 @@
 # ui/admin_dashboard.py
 import tkinter as tk
-from tkinter import ttk
 from utils import styles
+from ui.scroll_area import ScrollArea
 from ui.edit_users import open_edit_users
-from ui.login_page import open_login_page
 from ui.edit_classes import open_edit_classes
 from ui.edit_topics import open_edit_topics
+from ui.query_profile import open_query_profile
 
 
-def open_admin_dashboard(root, username, open_login_page_func):
-    """Displays the admin dashboard with 3 main cards."""
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
+def open_admin_dashboard(page, username):
+    """Displays the admin dashboard with its 4 main cards."""
+    router = page.router
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page.frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -31,7 +28,7 @@ def open_admin_dashboard(root, username, open_login_page_func):
     tk.Button(
         top_frame,
         text="Logout",
-        command=lambda: open_login_page(root, open_login_page_func),
+        command=router.home,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -42,21 +39,10 @@ def open_admin_dashboard(root, username, open_login_page_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Main Frame -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    # Scrollable canvas
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    area = ScrollArea(page.frame)
+    area.frame.pack(fill="both", expand=True)
+    scroll_frame = area.body
+    page.scrolls(area.canvas)
 
     # ----- Title -----
     tk.Label(
@@ -95,28 +81,19 @@ def open_admin_dashboard(root, username, open_login_page_func):
         ).pack(pady=(0, 15))
 
     # Cards
-    create_card(scroll_frame, "Edit Users", lambda: open_edit_users(root, username, open_admin_dashboard))
-    create_card(scroll_frame, "Edit Classes", lambda: open_edit_classes(root, username, open_admin_dashboard))
-    create_card(scroll_frame, "Edit Topics", lambda: open_edit_topics(root, username, open_admin_dashboard))
-
-    # Enable mouse scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    create_card(scroll_frame, "Edit Users", lambda: router.open(open_edit_users, username))
+    create_card(scroll_frame, "Edit Classes", lambda: router.open(open_edit_classes, username))
+    create_card(scroll_frame, "Edit Topics", lambda: router.open(open_edit_topics, username))
+    create_card(scroll_frame, "Query Profile", lambda: router.open(open_query_profile, username))
 
 
 # -------------------------------------------------------------------
 # Placeholder Pages
 # -------------------------------------------------------------------
-def open_placeholder_page(root, username, open_admin_dashboard_func, page_name):
+def open_placeholder_page(page, username, page_name):
     """Simple placeholder until actual admin pages are built."""
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
-
     # Top Bar
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page.frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -130,7 +107,7 @@ def open_placeholder_page(root, username, open_admin_dashboard_func, page_name):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_admin_dashboard_func(root, username, open_login_page),
+        command=page.router.back,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -141,7 +118,7 @@ def open_placeholder_page(root, username, open_admin_dashboard_func, page_name):
     ).pack(side="right", padx=25, pady=10)
 
     tk.Label(
-        root,
+        page.frame,
         text=f"{page_name} Page",
         font=(styles.FONT_FAMILY, 26, "bold"),
         fg=styles.FG_COLOR,
@@ -149,7 +126,7 @@ def open_placeholder_page(root, username, open_admin_dashboard_func, page_name):
     ).pack(pady=(200, 20))
 
     tk.Label(
-        root,
+        page.frame,
         text="(This section is under development)",
         font=(styles.FONT_FAMILY, 14),
         fg=styles.FG_COLOR,
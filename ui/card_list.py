@@ -0,0 +1,96 @@
+# ui/card_list.py
+
+# Rows per admin list page. Only the rows in view get widgets (see
+# ui/virtual_list.py), so pages can be much longer than the DB default.
+PAGE_SIZE = 500
+
+
+class CardList:
+    """The rows of one page of an admin list, kept in step with edits.
+
+    Rows are kept in query order and shown through a VirtualList. After
+    an add or delete only the model changes and the visible rows are
+    re-bound; nothing is re-queried and the scroll position is kept.
+
+    ident(row)     -> the row's identity (what delete functions take)
+    sort_key(row)  -> the page cursor tuple, ordered by `directions`
+    """
+
+    def __init__(self, view, ident, sort_key, directions):
+        self.view = view
+        self.ident = ident
+        self.sort_key = sort_key
+        self.directions = directions
+        self.rows = []
+        self._idents = set()
+
+    def show(self, rows):
+        """Replace everything with `rows` (a freshly loaded page)."""
+        self.rows = list(rows)
+        self._idents = {self.ident(row) for row in self.rows}
+        self.view.set_rows(self.rows)
+
+    # --- Diffs ---
+    def _precedes(self, a, b):
+        """True if cursor `a` sorts before cursor `b`."""
+        for x, y, direction in zip(a, b, self.directions):
+            if x != y:
+                # None sorts first, as NULL does in SQLite
+                lower = y is not None and (x is None or x < y)
+                return lower == (direction == "ASC")
+        return False
+
+    def insert(self, row, has_prev=False, has_next=False):
+        """Add a new row where the query would have put it.
+
+        Rows that sort before the first row while there is a previous
+        page (or after the last row while there is a next page) belong
+        to another page and are not shown. Returns True if the row was added.
+        """
+        key = self.sort_key(row)
+        if self.rows:
+            if has_prev and self._precedes(key, self.sort_key(self.rows[0])):
+                return False
+            if has_next and self._precedes(self.sort_key(self.rows[-1]), key):
+                return False
+        position = len(self.rows)
+        for i, other in enumerate(self.rows):
+            if self._precedes(key, self.sort_key(other)):
+                position = i
+                break
+        self.rows.insert(position, row)
+        self._idents.add(self.ident(row))
+        self.view.set_rows(self.rows)
+        return True
+
+    def extend(self, rows):
+        """Append rows that follow the last row (e.g. to refill a page)."""
+        for row in rows:
+            if self.ident(row) not in self._idents:
+                self.rows.append(row)
+                self._idents.add(self.ident(row))
+        self.view.set_rows(self.rows)
+
+    def remove(self, idents):
+        """Drop the rows of `idents` that are shown. Returns how many were."""
+        idents = self._idents.intersection(idents)
+        if idents:
+            self.rows = [row for row in self.rows if self.ident(row) not in idents]
+            self._idents -= idents
+            self.view.set_rows(self.rows)
+        return len(idents)
+
+    def update(self, rows):
+        """Replace rows in place (their sort keys must not change)."""
+        changed = {self.ident(row): row for row in rows if self.ident(row) in self._idents}
+        if changed:
+            self.rows = [changed.get(self.ident(row), row) for row in self.rows]
+            self.view.rows = list(self.rows)
+            self.view.refresh()
+        return len(changed)
+
+    def first(self):
+        return self.sort_key(self.rows[0]) if self.rows else None
+
+    def last(self):
+        return self.sort_key(self.rows[-1]) if self.rows else None
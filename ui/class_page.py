@@ -1,17 +1,24 @@
 # ui/class_page.py
 import tkinter as tk
 from utils import styles
-from db.database import get_topics_by_class
+from db.database import get_class_id, get_topics_by_class_id
 from ui.topic_page import open_topic_page
+from ui.db_worker import run_async
+from ui.virtual_list import VirtualList
 
-def open_class_page(root, username, grade, class_name, open_student_dashboard_func):
-    for widget in root.winfo_children():
-        widget.destroy()
 
-    root.configure(bg=styles.BG_COLOR)
+def _load_topics(class_name, grade):
+    """Runs on the DB worker: the class id (for invalidation) and its topics."""
+    class_id = get_class_id(class_name, grade)
+    return class_id, get_topics_by_class_id(class_id) if class_id is not None else []
+
+
+def open_class_page(page, username, grade, class_name):
+    router = page.router
+    page.track(("class", class_name))
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page.frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -25,10 +32,7 @@ def open_class_page(root, username, grade, class_name, open_student_dashboard_fu
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_student_dashboard_func(
-            root, username, grade,
-            lambda r, u, g, c: open_class_page(r, u, g, c, open_student_dashboard_func)
-        ),
+        command=router.back,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -42,7 +46,7 @@ def open_class_page(root, username, grade, class_name, open_student_dashboard_fu
 
     # ----- Class Title -----
     tk.Label(
-        root,
+        page.frame,
         text=class_name,
         font=(styles.FONT_FAMILY, 28, "bold"),
         fg=styles.FG_COLOR,
@@ -50,68 +54,29 @@ def open_class_page(root, username, grade, class_name, open_student_dashboard_fu
     ).pack(pady=(80, 30))
 
     # ----- Scrollable Section -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    def resize_canvas(event):
-        canvas.itemconfig(canvas_window, width=event.width)
-    canvas.bind("<Configure>", resize_canvas)
-
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True, padx=100)
-    scrollbar.pack(side="right", fill="y")
-
-    # ----- Load Topics -----
-    topics = get_topics_by_class(class_name)
-
-    if not topics:
-        tk.Label(
-            scroll_frame,
-            text="No topics available for this class yet.",
-            font=(styles.FONT_FAMILY, 14),
-            fg=styles.FG_COLOR,
-            bg=styles.BG_COLOR
-        ).pack(pady=20)
-        return
-
-    # Center content
-    content_wrapper = tk.Frame(scroll_frame, bg=styles.BG_COLOR)
-    content_wrapper.pack(anchor="center")
-
-    for topic in topics:
+    # Only the topic cards in view exist as widgets (recycled on scroll).
+    def make_card(parent):
         topic_card = tk.Frame(
-            content_wrapper,
+            parent,
             bg=styles.ENTRY_BG,
             relief="flat",
             width=700,
             height=80
         )
-        topic_card.pack(pady=15)
         topic_card.pack_propagate(False)
 
-        tk.Label(
+        topic_card.title = tk.Label(
             topic_card,
-            text=topic,
             font=(styles.FONT_FAMILY, 16, "bold"),
             fg=styles.FG_COLOR,
             bg=styles.ENTRY_BG
-        ).pack(pady=(10, 5))
+        )
+        topic_card.title.pack(pady=(10, 5))
 
-        tk.Button(
+        topic_card.view = tk.Button(
             topic_card,
             text="View",
-            command=lambda t=topic: open_topic_page(root, username, grade, class_name, t, open_class_page, open_student_dashboard_func),
+            command=lambda: router.open(open_topic_page, username, grade, class_name, topic_card.topic),
             font=(styles.FONT_FAMILY, 12, "bold"),
             bg=styles.BUTTON_PRIMARY,
             fg=styles.BG_COLOR,
@@ -119,9 +84,25 @@ def open_class_page(root, username, grade, class_name, open_student_dashboard_fu
             width=14,
             height=2,
             cursor="hand2"
-        ).pack(pady=(0, 10))
-
-    # Enable mouse wheel scrolling
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        )
+        topic_card.view.pack(pady=(0, 10))
+        return topic_card
+
+    def fill_card(topic_card, topic):
+        topic_card.topic = topic
+        topic_card.title.config(text=topic)
+
+    topic_list = VirtualList(page.frame, row_height=110, make_row=make_card, fill_row=fill_card,
+                             empty_text="No topics available for this class yet.", padx=100)
+    topic_list.frame.pack(fill="both", expand=True)
+    page.scrolls(topic_list.canvas)
+
+    # ----- Load Topics (off the Tk thread) -----
+    def show_topics(result):
+        class_id, topics = result
+        if class_id is not None:
+            page.track(("topics", class_id))
+        topic_list.set_rows(topics)
+
+    topic_list.set_message("Loading topics...")
+    run_async(topic_list.frame, _load_topics, class_name, grade, on_done=show_topics)
@@ -0,0 +1,157 @@
+# ui/db_worker.py
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+# -------------------------------------------------------------------
+# Off-main-thread database access for the Tk UI
+#
+# DB functions run on a small thread pool (each worker keeps its own
+# managed connection). Results are handed back through a queue that the
+# Tk loop polls with root.after while work is outstanding, so callbacks
+# always run on the Tk thread. Every task belongs to an owner widget;
+# destroying the owner (i.e. navigating away) cancels its tasks.
+# -------------------------------------------------------------------
+POLL_MS = 15
+
+
+class Task:
+    """Handle for a submitted DB call."""
+
+    def __init__(self, owner, on_done, on_error):
+        self.owner = owner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop the result; skip the call entirely if it hasn't started."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class DBWorker:
+    def __init__(self, root, max_workers=2):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DBWorker")
+        self._results = queue.Queue()
+        self._pending = 0
+        self._polling = False
+        self._by_owner = {}
+
+    def submit(self, owner, func, *args, on_done=None, on_error=None):
+        """Run func(*args) off the Tk thread.
+
+        on_done(result) / on_error(exc) are called on the Tk thread unless
+        the task was cancelled or `owner` has been destroyed meanwhile.
+        Unhandled errors go to Tk's report_callback_exception.
+        """
+        task = Task(owner, on_done, on_error)
+        self._track(task)
+
+        def run():
+            if task.cancelled:
+                return None
+            return func(*args)
+
+        task.future = self._executor.submit(run)
+        self._pending += 1
+        task.future.add_done_callback(lambda f: self._results.put(task))
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+        return task
+
+    # --- Owner tracking ---
+    def _track(self, task):
+        if task.owner is None:
+            return
+        key = str(task.owner)
+        if key not in self._by_owner:
+            self._by_owner[key] = []
+            task.owner.bind("<Destroy>", lambda e, k=key: self._owner_destroyed(e, k), add="+")
+        self._by_owner[key].append(task)
+
+    def _owner_destroyed(self, event, key):
+        if str(event.widget) != key:
+            return      # a child of a toplevel owner, not the owner itself
+        for task in self._by_owner.pop(key, []):
+            task.cancel()
+
+    def cancel_all(self, owner):
+        """Cancel every outstanding task of `owner`."""
+        for task in self._by_owner.pop(str(owner), []):
+            task.cancel()
+
+    # --- Delivery on the Tk thread ---
+    def _poll(self):
+        while True:
+            try:
+                task = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._deliver(task)
+
+        if self._pending:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, task):
+        tasks = self._by_owner.get(str(task.owner))
+        if tasks and task in tasks:
+            tasks.remove(task)
+        if task.cancelled or task.future.cancelled():
+            return
+        if task.owner is not None and not task.owner.winfo_exists():
+            return
+
+        error = task.future.exception()
+        if error is None:
+            if task.on_done is not None:
+                task.on_done(task.future.result())
+        elif task.on_error is not None:
+            task.on_error(error)
+        else:
+            self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_worker(root):
+    """Return the DBWorker for this Tk root, creating it on first use."""
+    worker = getattr(root, "_db_worker", None)
+    if worker is None:
+        worker = root._db_worker = DBWorker(root)
+    return worker
+
+
+def run_async(owner, func, *args, on_done=None, on_error=None):
+    """Shortcut: submit func(*args) on the worker of owner's Tk root."""
+    return get_worker(owner.winfo_toplevel()).submit(owner, func, *args, on_done=on_done, on_error=on_error)
+
+
+def run_save(button, name, func, *args, on_saved, taken):
+    """Save a form's row with func(*args), `button` disabled while it runs.
+
+    A truthy result goes to on_saved(result). A falsy one (the row
+    already exists) or an error re-enables the button and shows `taken`
+    or "Could not add '<name>'".
+    """
+    def done(result):
+        if result:
+            on_saved(result)
+        else:
+            button.config(state="normal")
+            messagebox.showerror("Error", taken)
+
+    def failed(exc):
+        button.config(state="normal")
+        messagebox.showerror("Error", f"Could not add '{name}': {exc}")
+
+    button.config(state="disabled")
+    return run_async(button, func, *args, on_done=done, on_error=failed)
@@ -2,21 +2,29 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils import styles
-from db.database import get_all_classes, delete_class, add_new_class
+from db.database import get_classes_page, count_classes, delete_class_by_id, delete_classes, add_new_class
+from ui.pager import create_pager
+from ui.selection import Selection
+from ui.card_list import CardList, PAGE_SIZE
+from ui.virtual_list import VirtualList
+from ui.db_worker import run_async, run_save
+from ui.scroll_area import ScrollArea
 
 
 # -------------------------------------------------------------------
 # Edit Classes Page
 # -------------------------------------------------------------------
-def open_edit_classes(root, username, open_admin_dashboard_func):
+def open_edit_classes(page, username):
     """Display list of classes with delete and add functionality."""
-    for widget in root.winfo_children():
-        widget.destroy()
+    page.track("classes")
 
-    root.configure(bg=styles.BG_COLOR)
+    # Everything lives in one frame, so the list can be hidden (not
+    # destroyed) while the add form is open.
+    page_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    page_frame.pack(fill="both", expand=True)
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page_frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -30,7 +38,7 @@ def open_edit_classes(root, username, open_admin_dashboard_func):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_admin_dashboard_func(root, username, None),
+        command=page.router.back,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -41,20 +49,16 @@ def open_edit_classes(root, username, open_admin_dashboard_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Scrollable Main Area -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    # Only the class cards in view exist as widgets; the title, forms and
+    # pager above them live in the list's header and scroll with it.
+    class_list = VirtualList(page_frame, row_height=160,
+                           make_row=lambda parent: make_card(parent),
+                           fill_row=lambda card, row: fill_card(card, row),
+                           empty_text="No classes found in the database.")
+    class_list.frame.pack(fill="both", expand=True)
+    canvas = class_list.canvas
+    page.scrolls(canvas)
+    scroll_frame = class_list.header
 
     # ----- Title -----
     tk.Label(
@@ -81,7 +85,7 @@ def open_edit_classes(root, username, open_admin_dashboard_func):
     tk.Button(
         add_card,
         text="Open",
-        command=lambda: open_add_class_page(root, username, open_admin_dashboard_func),
+        command=lambda: open_add(),
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -91,44 +95,140 @@ def open_edit_classes(root, username, open_admin_dashboard_func):
         cursor="hand2"
     ).pack(pady=(0, 10))
 
-    # ----- Load Classes -----
-    classes = get_all_classes()
+    # ----- Filter -----
+    grade_filter = ttk.Combobox(scroll_frame, values=["All grades", "Grade 12", "Grade 13"], state="readonly", width=15)
+    grade_filter.set("All grades")
+    grade_filter.pack(pady=(10, 0))
 
-    if not classes:
-        tk.Label(
-            scroll_frame,
-            text="No classes found in the database.",
-            font=(styles.FONT_FAMILY, 14),
-            fg=styles.FG_COLOR,
-            bg=styles.BG_COLOR
-        ).pack(pady=40)
-        return
+    # ----- Batch Actions -----
+    selection = Selection(scroll_frame, "classes", page_keys=lambda: [row[0] for row in cards.rows])
 
-    for cname, grade in classes:
-        card = tk.Frame(scroll_frame, bg=styles.ENTRY_BG, relief="flat", width=700, height=130)
-        card.pack(pady=15)
-        card.pack_propagate(False)
+    def batch_delete(class_ids):
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(class_ids)} classes and all of their topics?"):
+            return
+        selection.run(class_list.frame, delete_classes, class_ids,
+                      on_done=lambda count: rows_deleted(class_ids, count, f"{count} classes removed successfully."))
+
+    selection.add_action("Delete Selected", batch_delete)
+
+    # ----- Pager + Class List -----
+    state = {"page": None, "after": None, "before": None, "total": 0, "task": None, "refill": None}
+
+    def current_grade():
+        grade = grade_filter.get()
+        return None if grade == "All grades" else grade
+
+    def query_page(after, before, grade):
+        """Runs on the DB worker: one page of classes plus the total count."""
+        keyset = get_classes_page(after=after, before=before, limit=PAGE_SIZE, grade=grade)
+        if not keyset.rows and after is not None:
+            after, before = None, after         # last row of the page was deleted
+            keyset = get_classes_page(before=before, limit=PAGE_SIZE, grade=grade)
+        return keyset, after, before, count_classes(grade)
+
+    def query_more(after, limit, grade):
+        """Runs on the DB worker: rows to refill the page after deletes."""
+        return get_classes_page(after=after, limit=limit, grade=grade)
+
+    def load_page(after=None, before=None):
+        """Load one page of classes (queried off the Tk thread)."""
+        for key in ("task", "refill"):
+            if state[key] is not None:
+                state[key].cancel()
+        state["task"] = run_async(class_list.frame, query_page, after, before, current_grade(), on_done=show_page)
+
+    def show_page(result):
+        keyset, after, before, total = result
+        state.update(page=keyset, after=after, before=before, total=total, task=None)
+
+        cards.show(keyset.rows)
+        update_pager(keyset, total, "classes")
+        canvas.yview_moveto(0)
+
+    # --- In-place edits: only the affected cards change ---
+    def sync_pager(**changes):
+        keyset = state["page"]._replace(rows=cards.rows, first=cards.first(), last=cards.last(), **changes)
+        state["page"] = keyset
+        update_pager(keyset, state["total"], "classes")
+
+    def rows_deleted(class_ids, count, message):
+        messagebox.showinfo("Deleted", message)
+        selection.forget(class_ids)
+        state["total"] = max(0, state["total"] - count)
+        removed = cards.remove(class_ids)
+        if not cards.rows:
+            load_page(after=state["after"], before=state["before"])
+            return
+        sync_pager()
+        if removed and state["page"].has_next:
+            state["refill"] = run_async(class_list.frame, query_more, cards.last(), removed, current_grade(),
+                                        on_done=refilled)
+
+    def refilled(more):
+        state["refill"] = None
+        cards.extend(more.rows)
+        sync_pager(has_next=more.has_next)
+
+    def row_added(row):
+        if current_grade() not in (None, row[2]):
+            return
+        state["total"] += 1
+        if state["page"] is None:
+            return
+        cards.insert(row, state["page"].has_prev, state["page"].has_next)
+        sync_pager()
+
+    def open_add():
+        page_frame.pack_forget()
+        open_add_class_page(page, username, on_close=add_closed)
+
+    def add_closed(row):
+        page_frame.pack(fill="both", expand=True)
+        page.scrolls(canvas)
+        if row is not None:
+            row_added(row)
+
+    update_pager = create_pager(
+        scroll_frame,
+        on_prev=lambda: load_page(before=state["page"].first),
+        on_next=lambda: load_page(after=state["page"].last)
+    )
+
+    class_list.set_message("Loading classes...")
+
+    def confirm_delete(target, target_id, button):
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the '{target}' class and all of its topics?"):
+            return
 
-        info_text = f"🏫 {cname}   |   Grade: {grade}"
+        def deleted(count):
+            button.config(state="normal")
+            rows_deleted([target_id], count, f"Class '{target}' removed successfully.")
 
-        tk.Label(
+        def failed(exc):
+            button.config(state="normal")
+            messagebox.showerror("Error", f"Could not delete '{target}': {exc}")
+
+        button.config(state="disabled")
+        run_async(class_list.frame, delete_class_by_id, target_id, on_done=deleted, on_error=failed)
+
+    def make_card(parent):
+        card = tk.Frame(parent, bg=styles.ENTRY_BG, relief="flat", width=700, height=130)
+        card.pack_propagate(False)
+        card.check = selection.checkbox(card)
+        card.check.place(x=15, rely=0.5, anchor="w")
+
+        card.info = tk.Label(
             card,
-            text=info_text,
             font=(styles.FONT_FAMILY, 14),
             fg=styles.FG_COLOR,
             bg=styles.ENTRY_BG
-        ).pack(pady=(20, 10))
+        )
+        card.info.pack(pady=(20, 10))
 
-        def confirm_delete(target=cname):
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the '{target}' class?"):
-                delete_class(target)
-                messagebox.showinfo("Deleted", f"Class '{target}' removed successfully.")
-                open_edit_classes(root, username, open_admin_dashboard_func)
-
-        tk.Button(
+        card.delete = tk.Button(
             card,
             text="Delete Class",
-            command=confirm_delete,
+            command=lambda: confirm_delete(card.row[1], card.row[0], card.delete),
             font=(styles.FONT_FAMILY, 12, "bold"),
             bg=styles.BUTTON_PRIMARY,
             fg=styles.BG_COLOR,
@@ -136,26 +236,49 @@ def open_edit_classes(root, username, open_admin_dashboard_func):
             width=14,
             height=1,
             cursor="hand2"
-        ).pack()
+        )
+        card.delete.pack()
+        return card
+
+    def fill_card(card, row):
+        card.row = row
+        class_id, cname, grade = row
+        card.info.config(text=f"🏫 {cname}   |   Grade: {grade}")
+        selection.bind(card.check, class_id)
+
+    cards = CardList(class_list, ident=lambda row: row[0], sort_key=lambda row: (row[2], row[1]),
+                     directions=("ASC", "ASC"))
+
+    def filter_changed(event):
+        selection.clear()
+        load_page()
 
-    # Mouse scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    grade_filter.bind("<<ComboboxSelected>>", filter_changed)
+    load_page()
 
 
 # -------------------------------------------------------------------
 # Add Class Page (functional)
 # -------------------------------------------------------------------
-def open_add_class_page(root, username, open_admin_dashboard_func):
-    """Add New Class Form Page."""
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
+def open_add_class_page(page, username, on_close=None):
+    """Add New Class Form Page.
+
+    With on_close, the form is shown while the class list is hidden and
+    on_close(new_row or None) is called when it closes; otherwise Back
+    and Save go back to the previous page.
+    """
+    form_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    form_frame.pack(fill="both", expand=True)
+
+    def close(row=None):
+        if on_close is None:
+            page.router.back()
+        else:
+            form_frame.destroy()
+            on_close(row)
 
     # Top bar
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(form_frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -169,7 +292,7 @@ def open_add_class_page(root, username, open_admin_dashboard_func):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_edit_classes(root, username, open_admin_dashboard_func),
+        command=close,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -180,19 +303,10 @@ def open_add_class_page(root, username, open_admin_dashboard_func):
     ).pack(side="right", padx=25, pady=10)
 
     # Scrollable form
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    area = ScrollArea(form_frame)
+    area.frame.pack(fill="both", expand=True)
+    scroll_frame = area.body
+    page.scrolls(area.canvas)
 
     # Title
     tk.Label(
@@ -233,14 +347,14 @@ def open_add_class_page(root, username, open_admin_dashboard_func):
             messagebox.showerror("Error", "A class must be assigned to Grade 12 or Grade 13.")
             return
 
-        success = add_new_class(cname, grade)
-        if success:
+        def saved(class_id):
             messagebox.showinfo("Success", f"Class '{cname}' added successfully.")
-            open_edit_classes(root, username, open_admin_dashboard_func)
-        else:
-            messagebox.showerror("Error", f"Class '{cname}' already exists.")
+            close((class_id, cname, grade))
 
-    tk.Button(
+        run_save(save_button, cname, add_new_class, cname, grade,
+                 on_saved=saved, taken=f"Class '{cname}' already exists.")
+
+    save_button = tk.Button(
         scroll_frame,
         text="Save Class",
         command=save_class,
@@ -251,9 +365,5 @@ def open_add_class_page(root, username, open_admin_dashboard_func):
         width=20,
         height=2,
         cursor="hand2"
-    ).pack(pady=(10, 40))
-
-    # Mouse scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
\ No newline at end of file
+    )
+    save_button.pack(pady=(10, 40))
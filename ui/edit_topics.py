@@ -2,21 +2,30 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils import styles
-from db.database import get_all_topics, delete_topic, get_all_class_names, add_new_topic
+from db.database import (get_topics_page, count_topics, delete_topic_by_id, delete_topics, move_topics,
+                         get_class_choices, add_topic_to_class)
+from ui.pager import create_pager
+from ui.selection import Selection
+from ui.card_list import CardList, PAGE_SIZE
+from ui.virtual_list import VirtualList
+from ui.db_worker import run_async, run_save
+from ui.scroll_area import ScrollArea
 
 
 # -------------------------------------------------------------------
 # Edit Topics Page
 # -------------------------------------------------------------------
-def open_edit_topics(root, username, open_admin_dashboard_func):
+def open_edit_topics(page, username):
     """Display list of topics with delete and add functionality."""
-    for widget in root.winfo_children():
-        widget.destroy()
+    page.track("classes", "topics")
 
-    root.configure(bg=styles.BG_COLOR)
+    # Everything lives in one frame, so the list can be hidden (not
+    # destroyed) while the add form is open.
+    page_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    page_frame.pack(fill="both", expand=True)
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page_frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -30,7 +39,7 @@ def open_edit_topics(root, username, open_admin_dashboard_func):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_admin_dashboard_func(root, username, None),
+        command=page.router.back,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -41,20 +50,16 @@ def open_edit_topics(root, username, open_admin_dashboard_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Scrollable Main Area -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    # Only the topic cards in view exist as widgets; the title, forms and
+    # pager above them live in the list's header and scroll with it.
+    topic_list = VirtualList(page_frame, row_height=160,
+                           make_row=lambda parent: make_card(parent),
+                           fill_row=lambda card, row: fill_card(card, row),
+                           empty_text="No topics found in the database.")
+    topic_list.frame.pack(fill="both", expand=True)
+    canvas = topic_list.canvas
+    page.scrolls(canvas)
+    scroll_frame = topic_list.header
 
     # ----- Title -----
     tk.Label(
@@ -81,7 +86,7 @@ def open_edit_topics(root, username, open_admin_dashboard_func):
     tk.Button(
         add_card,
         text="Open",
-        command=lambda: open_add_topic_page(root, username, open_admin_dashboard_func),
+        command=lambda: open_add(),
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -91,44 +96,185 @@ def open_edit_topics(root, username, open_admin_dashboard_func):
         cursor="hand2"
     ).pack(pady=(0, 10))
 
-    # ----- Load Topics -----
-    topics = get_all_topics()
+    # ----- Filter -----
+    class_ids = {}
+    class_info = {}             # class_id -> (class_name, grade), for rows moved between classes
+    class_filter = ttk.Combobox(scroll_frame, values=["All classes"], state="readonly", width=30)
+    class_filter.set("All classes")
+    class_filter.pack(pady=(10, 0))
 
-    if not topics:
-        tk.Label(
-            scroll_frame,
-            text="No topics found in the database.",
-            font=(styles.FONT_FAMILY, 14),
-            fg=styles.FG_COLOR,
-            bg=styles.BG_COLOR
-        ).pack(pady=40)
-        return
+    def fill_class_filter(choices):
+        class_ids.update({f"{cname} ({grade})": class_id for class_id, cname, grade in choices})
+        class_info.update({class_id: (cname, grade) for class_id, cname, grade in choices})
+        class_filter.config(values=["All classes"] + list(class_ids))
+        move_target.config(values=list(class_ids))
 
-    for topic_name, class_name in topics:
-        card = tk.Frame(scroll_frame, bg=styles.ENTRY_BG, relief="flat", width=700, height=130)
-        card.pack(pady=15)
-        card.pack_propagate(False)
+    # ----- Batch Actions -----
+    selection = Selection(scroll_frame, "topics", page_keys=lambda: [row[0] for row in cards.rows])
+
+    def batch_delete(topic_ids):
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(topic_ids)} topics?"):
+            return
+        selection.run(topic_list.frame, delete_topics, topic_ids,
+                      on_done=lambda count: rows_deleted(topic_ids, count, f"{count} topics removed successfully."))
+
+    def batch_move(topic_ids):
+        target = move_target.get()
+        if target not in class_ids:
+            messagebox.showerror("Error", "Choose the class to move the topics to first.")
+            return
 
-        info_text = f"📘 {topic_name}   |   Class: {class_name}"
+        def moved(result):
+            moved_ids, skipped_ids = result
+            note = (f"\n{len(skipped_ids)} were skipped because '{target}' already has a topic with that name."
+                    if skipped_ids else "")
+            messagebox.showinfo("Moved", f"{len(moved_ids)} topics moved to '{target}'.{note}")
+            rows_moved(moved_ids, class_ids[target])
+
+        selection.run(topic_list.frame, move_topics, topic_ids, class_ids[target], on_done=moved)
+
+    selection.add_action("Delete Selected", batch_delete)
+    move_target = ttk.Combobox(selection.bar, values=[], state="readonly", width=24)
+    move_target.set("Move to class...")
+    move_target.pack(side="left", padx=(15, 5))
+    selection.add_action("Move", batch_move, width=8)
+
+    run_async(class_filter, get_class_choices, on_done=fill_class_filter)
+
+    # ----- Pager + Topic List -----
+    state = {"page": None, "after": None, "before": None, "total": 0, "task": None, "refill": None}
+
+    def current_class():
+        return class_ids.get(class_filter.get())
+
+    def query_page(after, before, class_id):
+        """Runs on the DB worker: one page of topics plus the total count."""
+        keyset = get_topics_page(after=after, before=before, limit=PAGE_SIZE, class_id=class_id)
+        if not keyset.rows and after is not None:
+            after, before = None, after         # last row of the page was deleted
+            keyset = get_topics_page(before=before, limit=PAGE_SIZE, class_id=class_id)
+        return keyset, after, before, count_topics(class_id)
+
+    def query_more(after, limit, class_id):
+        """Runs on the DB worker: rows to refill the page after deletes."""
+        return get_topics_page(after=after, limit=limit, class_id=class_id)
+
+    def load_page(after=None, before=None):
+        """Load one page of topics (queried off the Tk thread)."""
+        for key in ("task", "refill"):
+            if state[key] is not None:
+                state[key].cancel()
+        state["task"] = run_async(topic_list.frame, query_page, after, before, current_class(), on_done=show_page)
+
+    def show_page(result):
+        keyset, after, before, total = result
+        state.update(page=keyset, after=after, before=before, total=total, task=None)
+
+        cards.show(keyset.rows)
+        update_pager(keyset, total, "topics")
+        canvas.yview_moveto(0)
+
+    # --- In-place edits: only the affected cards change ---
+    def sync_pager(**changes):
+        keyset = state["page"]._replace(rows=cards.rows, first=cards.first(), last=cards.last(), **changes)
+        state["page"] = keyset
+        update_pager(keyset, state["total"], "topics")
+
+    def rows_deleted(topic_ids, count, message):
+        messagebox.showinfo("Deleted", message)
+        selection.forget(topic_ids)
+        state["total"] = max(0, state["total"] - count)
+        rows_removed(cards.remove(topic_ids))
+
+    def rows_removed(removed):
+        if not cards.rows:
+            load_page(after=state["after"], before=state["before"])
+            return
+        sync_pager()
+        if removed and state["page"].has_next:
+            state["refill"] = run_async(topic_list.frame, query_more, cards.last(), removed, current_class(),
+                                        on_done=refilled)
+
+    def refilled(more):
+        state["refill"] = None
+        cards.extend(more.rows)
+        sync_pager(has_next=more.has_next)
+
+    def rows_moved(topic_ids, class_id):
+        moving = set(topic_ids)
+        moved = [row for row in cards.rows if row[0] in moving]
+        removed = cards.remove(moving)
+        if current_class() is not None:
+            # the moved topics left the filtered class
+            state["total"] = max(0, state["total"] - len(topic_ids))
+            rows_removed(removed)
+            return
+        cname, grade = class_info[class_id]
+        keyset = state["page"]
+        kept = sum(cards.insert((topic_id, topic_name, class_id, cname, grade), keyset.has_prev, keyset.has_next)
+                   for topic_id, topic_name, _, _, _ in moved)
+        rows_removed(removed - kept)
+
+    def row_added(row):
+        if current_class() not in (None, row[2]):
+            return
+        state["total"] += 1
+        if state["page"] is None:
+            return
+        cards.insert(row, state["page"].has_prev, state["page"].has_next)
+        sync_pager()
+
+    def open_add():
+        page_frame.pack_forget()
+        open_add_topic_page(page, username, on_close=add_closed)
 
-        tk.Label(
+    def add_closed(row):
+        page_frame.pack(fill="both", expand=True)
+        page.scrolls(canvas)
+        if row is not None:
+            row_added(row)
+
+    update_pager = create_pager(
+        scroll_frame,
+        on_prev=lambda: load_page(before=state["page"].first),
+        on_next=lambda: load_page(after=state["page"].last)
+    )
+
+    topic_list.set_message("Loading topics...")
+
+    def confirm_delete(target_t, target_c, target_id, button):
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the '{target_t}' topic from '{target_c}'?"):
+            return
+
+        def deleted(count):
+            button.config(state="normal")
+            rows_deleted([target_id], count, f"Topic '{target_t}' from '{target_c}' removed successfully.")
+
+        def failed(exc):
+            button.config(state="normal")
+            messagebox.showerror("Error", f"Could not delete '{target_t}': {exc}")
+
+        button.config(state="disabled")
+        run_async(topic_list.frame, delete_topic_by_id, target_id, on_done=deleted, on_error=failed)
+
+    def make_card(parent):
+        card = tk.Frame(parent, bg=styles.ENTRY_BG, relief="flat", width=700, height=130)
+        card.pack_propagate(False)
+        card.check = selection.checkbox(card)
+        card.check.place(x=15, rely=0.5, anchor="w")
+
+        card.info = tk.Label(
             card,
-            text=info_text,
             font=(styles.FONT_FAMILY, 14),
             fg=styles.FG_COLOR,
             bg=styles.ENTRY_BG
-        ).pack(pady=(20, 10))
-
-        def confirm_delete(target_t=topic_name, target_c=class_name):
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the '{target_t}' topic from '{target_c}'?"):
-                delete_topic(target_t, target_c)
-                messagebox.showinfo("Deleted", f"Topic '{target_t}' from '{target_c}' removed successfully.")
-                open_edit_topics(root, username, open_admin_dashboard_func)
+        )
+        card.info.pack(pady=(20, 10))
 
-        tk.Button(
+        card.delete = tk.Button(
             card,
             text="Delete Topic",
-            command=confirm_delete,
+            command=lambda: confirm_delete(card.row[1], card.row[3], card.row[0], card.delete),
             font=(styles.FONT_FAMILY, 12, "bold"),
             bg=styles.BUTTON_PRIMARY,
             fg=styles.BG_COLOR,
@@ -136,26 +282,49 @@ def open_edit_topics(root, username, open_admin_dashboard_func):
             width=14,
             height=1,
             cursor="hand2"
-        ).pack()
+        )
+        card.delete.pack()
+        return card
+
+    def fill_card(card, row):
+        card.row = row
+        topic_id, topic_name, _, class_name, grade = row
+        card.info.config(text=f"📘 {topic_name}   |   Class: {class_name} ({grade})")
+        selection.bind(card.check, topic_id)
+
+    cards = CardList(topic_list, ident=lambda row: row[0], sort_key=lambda row: (row[2], row[1]),
+                     directions=("ASC", "ASC"))
+
+    def filter_changed(event):
+        selection.clear()
+        load_page()
 
-    # Mouse scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    class_filter.bind("<<ComboboxSelected>>", filter_changed)
+    load_page()
 
 
 # -------------------------------------------------------------------
 # Add Topic Page (Functional)
 # -------------------------------------------------------------------
-def open_add_topic_page(root, username, open_admin_dashboard_func):
-    """Add New Topic Form Page."""
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
+def open_add_topic_page(page, username, on_close=None):
+    """Add New Topic Form Page.
+
+    With on_close, the form is shown while the topic list is hidden and
+    on_close(new_row or None) is called when it closes; otherwise Back
+    and Save go back to the previous page.
+    """
+    form_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    form_frame.pack(fill="both", expand=True)
+
+    def close(row=None):
+        if on_close is None:
+            page.router.back()
+        else:
+            form_frame.destroy()
+            on_close(row)
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(form_frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -169,7 +338,7 @@ def open_add_topic_page(root, username, open_admin_dashboard_func):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_edit_topics(root, username, open_admin_dashboard_func),
+        command=close,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -180,18 +349,10 @@ def open_add_topic_page(root, username, open_admin_dashboard_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Scrollable Form -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    area = ScrollArea(form_frame)
+    area.frame.pack(fill="both", expand=True)
+    scroll_frame = area.body
+    page.scrolls(area.canvas)
 
     # ----- Title -----
     tk.Label(
@@ -214,11 +375,17 @@ def open_add_topic_page(root, username, open_admin_dashboard_func):
     tk.Label(scroll_frame, text="Select Class:", font=styles.FONT_LABEL,
              fg=styles.FG_COLOR, bg=styles.BG_COLOR).pack()
     class_var = tk.StringVar()
-    class_list = get_all_class_names()
-    class_dropdown = ttk.Combobox(scroll_frame, textvariable=class_var, values=class_list, state="readonly", width=37)
+    class_choices = {}         # label -> (class_id, class_name, grade)
+    class_dropdown = ttk.Combobox(scroll_frame, textvariable=class_var, values=[], state="readonly", width=37)
     class_dropdown.pack(pady=(5, 25))
     class_dropdown.set("Select Class")
 
+    def fill_class_dropdown(choices):
+        class_choices.update({f"{cname} ({grade})": (class_id, cname, grade) for class_id, cname, grade in choices})
+        class_dropdown.config(values=list(class_choices))
+
+    run_async(class_dropdown, get_class_choices, on_done=fill_class_dropdown)
+
     # ----- Description -----
     tk.Label(scroll_frame, text="Topic Description:", font=styles.FONT_LABEL,
              fg=styles.FG_COLOR, bg=styles.BG_COLOR).pack()
@@ -245,14 +412,16 @@ def open_add_topic_page(root, username, open_admin_dashboard_func):
             messagebox.showerror("Error", "All fields must be filled.")
             return
 
-        success = add_new_topic(tname, cname, vpath, desc)
-        if success:
+        class_id, class_name, grade = class_choices[cname]
+
+        def saved(topic_id):
             messagebox.showinfo("Success", f"Topic '{tname}' added to '{cname}' successfully.")
-            open_edit_topics(root, username, open_admin_dashboard_func)
-        else:
-            messagebox.showerror("Error", f"Topic '{tname}' already exists in '{cname}'.")
+            close((topic_id, tname, class_id, class_name, grade))
 
-    tk.Button(
+        run_save(save_button, tname, add_topic_to_class, class_id, tname, vpath, desc,
+                 on_saved=saved, taken=f"Topic '{tname}' already exists in '{cname}'.")
+
+    save_button = tk.Button(
         scroll_frame,
         text="Save Topic",
         command=save_topic,
@@ -263,9 +432,5 @@ def open_add_topic_page(root, username, open_admin_dashboard_func):
         width=20,
         height=2,
         cursor="hand2"
-    ).pack(pady=(10, 40))
-
-    # Mouse scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
\ No newline at end of file
+    )
+    save_button.pack(pady=(10, 40))
@@ -2,21 +2,29 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils import styles
-from db.database import get_all_users, delete_user, add_new_user
+from db.database import get_users_page, count_users, delete_user, delete_users, set_students_grade, add_new_user
+from ui.pager import create_pager
+from ui.selection import Selection
+from ui.card_list import CardList, PAGE_SIZE
+from ui.virtual_list import VirtualList
+from ui.db_worker import run_async, run_save
+from ui.scroll_area import ScrollArea
 
 
 # -------------------------------------------------------------------
 # Edit Users Page
 # -------------------------------------------------------------------
-def open_edit_users(root, username, open_admin_dashboard_func):
+def open_edit_users(page, username):
     """Display list of users with delete and add functionality."""
-    for widget in root.winfo_children():
-        widget.destroy()
+    page.track("users")
 
-    root.configure(bg=styles.BG_COLOR)
+    # Everything lives in one frame, so the list can be hidden (not
+    # destroyed) while the add form is open.
+    page_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    page_frame.pack(fill="both", expand=True)
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page_frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -30,7 +38,7 @@ def open_edit_users(root, username, open_admin_dashboard_func):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_admin_dashboard_func(root, username, None),
+        command=page.router.back,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -41,20 +49,16 @@ def open_edit_users(root, username, open_admin_dashboard_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Scrollable Main Area -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    # Only the user cards in view exist as widgets; the title, forms and
+    # pager above them live in the list's header and scroll with it.
+    user_list = VirtualList(page_frame, row_height=160,
+                            make_row=lambda parent: make_card(parent),
+                            fill_row=lambda card, row: fill_card(card, row),
+                            empty_text="No users found in the database.")
+    user_list.frame.pack(fill="both", expand=True)
+    canvas = user_list.canvas
+    page.scrolls(canvas)
+    scroll_frame = user_list.header
 
     # ----- Title -----
     tk.Label(
@@ -81,7 +85,7 @@ def open_edit_users(root, username, open_admin_dashboard_func):
     tk.Button(
         add_card,
         text="Open",
-        command=lambda: open_add_user_page(root, username, open_admin_dashboard_func),
+        command=lambda: open_add(),
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -91,46 +95,186 @@ def open_edit_users(root, username, open_admin_dashboard_func):
         cursor="hand2"
     ).pack(pady=(0, 10))
 
-    # ----- Load Users -----
-    users = get_all_users()
+    # ----- Filters -----
+    filter_frame = tk.Frame(scroll_frame, bg=styles.BG_COLOR)
+    filter_frame.pack(pady=(10, 0))
 
-    if not users:
-        tk.Label(
-            scroll_frame,
-            text="No users found in the database.",
-            font=(styles.FONT_FAMILY, 14),
-            fg=styles.FG_COLOR,
-            bg=styles.BG_COLOR
-        ).pack(pady=40)
-        return
+    role_filter = ttk.Combobox(filter_frame, values=["All roles", "admin", "student"], state="readonly", width=15)
+    role_filter.set("All roles")
+    role_filter.pack(side="left", padx=10)
 
-    for uname, status, grade in users:
-        card = tk.Frame(scroll_frame, bg=styles.ENTRY_BG, relief="flat", width=700, height=130)
-        card.pack(pady=15)
-        card.pack_propagate(False)
+    grade_filter = ttk.Combobox(filter_frame, values=["All grades", "Grade 12", "Grade 13"], state="readonly", width=15)
+    grade_filter.set("All grades")
+    grade_filter.pack(side="left", padx=10)
 
-        info_text = f"👤 {uname}   |   Role: {status}"
-        if status == "student" and grade:
-            info_text += f"   |   Grade: {grade}"
+    # ----- Batch Actions -----
+    selection = Selection(scroll_frame, "users", page_keys=lambda: [row[0] for row in cards.rows])
+
+    def batch_delete(usernames):
+        if username in usernames:
+            messagebox.showerror("Error", "You cannot delete the account you are logged in with.")
+            return
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(usernames)} users?"):
+            return
 
-        tk.Label(
+        selection.run(user_list.frame, delete_users, usernames,
+                      on_done=lambda count: rows_deleted(usernames, count, f"{count} users removed successfully."))
+
+    def batch_grade(usernames):
+        grade = batch_grade_choice.get()
+        if grade not in ("Grade 12", "Grade 13"):
+            messagebox.showerror("Error", "Choose the grade to assign first.")
+            return
+
+        def updated(count):
+            skipped = len(usernames) - count
+            note = f" ({skipped} admins or missing users skipped)" if skipped else ""
+            messagebox.showinfo("Updated", f"{count} students moved to {grade}{note}.")
+            rows_regraded(usernames, grade)
+
+        selection.run(user_list.frame, set_students_grade, usernames, grade, on_done=updated)
+
+    selection.add_action("Delete Selected", batch_delete)
+    batch_grade_choice = ttk.Combobox(selection.bar, values=["Grade 12", "Grade 13"], state="readonly", width=10)
+    batch_grade_choice.set("Grade...")
+    batch_grade_choice.pack(side="left", padx=(15, 5))
+    selection.add_action("Set Grade", batch_grade, width=10)
+
+    # ----- Pager + User List -----
+    state = {"page": None, "after": None, "before": None, "total": 0, "task": None, "refill": None}
+
+    def current_filters():
+        role = role_filter.get()
+        grade = grade_filter.get()
+        return {
+            "status": None if role == "All roles" else role,
+            "grade": None if grade == "All grades" else grade,
+        }
+
+    def matches_filters(row):
+        filters = current_filters()
+        return filters["status"] in (None, row[1]) and filters["grade"] in (None, row[2])
+
+    def query_page(after, before, filters):
+        """Runs on the DB worker: one page of users plus the total count."""
+        keyset = get_users_page(after=after, before=before, limit=PAGE_SIZE, **filters)
+        if not keyset.rows and after is not None:
+            after, before = None, after         # last row of the page was deleted
+            keyset = get_users_page(before=before, limit=PAGE_SIZE, **filters)
+        return keyset, after, before, count_users(**filters)
+
+    def query_more(after, limit, filters):
+        """Runs on the DB worker: rows to refill the page after deletes."""
+        return get_users_page(after=after, limit=limit, **filters)
+
+    def load_page(after=None, before=None):
+        """Load one page of users (queried off the Tk thread)."""
+        for key in ("task", "refill"):
+            if state[key] is not None:
+                state[key].cancel()
+        state["task"] = run_async(user_list.frame, query_page, after, before, current_filters(), on_done=show_page)
+
+    def show_page(result):
+        keyset, after, before, total = result
+        state.update(page=keyset, after=after, before=before, total=total, task=None)
+
+        cards.show(keyset.rows)
+        update_pager(keyset, total, "users")
+        canvas.yview_moveto(0)
+
+    # --- In-place edits: only the affected cards change ---
+    def sync_pager(**changes):
+        keyset = state["page"]._replace(rows=cards.rows, first=cards.first(), last=cards.last(), **changes)
+        state["page"] = keyset
+        update_pager(keyset, state["total"], "users")
+
+    def rows_deleted(usernames, count, message):
+        messagebox.showinfo("Deleted", message)
+        selection.forget(usernames)
+        state["total"] = max(0, state["total"] - count)
+        removed = cards.remove(usernames)
+        if not cards.rows:
+            load_page(after=state["after"], before=state["before"])
+            return
+        sync_pager()
+        if removed and state["page"].has_next:
+            state["refill"] = run_async(user_list.frame, query_more, cards.last(), removed, current_filters(),
+                                        on_done=refilled)
+
+    def refilled(more):
+        state["refill"] = None
+        cards.extend(more.rows)
+        sync_pager(has_next=more.has_next)
+
+    def rows_regraded(usernames, grade):
+        if current_filters()["grade"] is not None:
+            # rows may have left the filtered set; the total has to be recounted
+            load_page(after=state["after"], before=state["before"])
+            return
+        targets = set(usernames)
+        cards.update([(uname, status, grade) for uname, status, _ in cards.rows
+                      if uname in targets and status == "student"])
+
+    def row_added(row):
+        if not matches_filters(row):
+            return
+        state["total"] += 1
+        if state["page"] is None:
+            return
+        cards.insert(row, state["page"].has_prev, state["page"].has_next)
+        sync_pager()
+
+    def open_add():
+        page_frame.pack_forget()
+        open_add_user_page(page, username, on_close=add_closed)
+
+    def add_closed(row):
+        page_frame.pack(fill="both", expand=True)
+        page.scrolls(canvas)
+        if row is not None:
+            row_added(row)
+
+    update_pager = create_pager(
+        scroll_frame,
+        on_prev=lambda: load_page(before=state["page"].first),
+        on_next=lambda: load_page(after=state["page"].last)
+    )
+
+    user_list.set_message("Loading users...")
+
+    def confirm_delete(target, button):
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{target}'?"):
+            return
+
+        def deleted(count):
+            button.config(state="normal")
+            rows_deleted([target], count, f"User '{target}' removed successfully.")
+
+        def failed(exc):
+            button.config(state="normal")
+            messagebox.showerror("Error", f"Could not delete '{target}': {exc}")
+
+        button.config(state="disabled")
+        run_async(user_list.frame, delete_user, target, on_done=deleted, on_error=failed)
+
+    def make_card(parent):
+        card = tk.Frame(parent, bg=styles.ENTRY_BG, relief="flat", width=700, height=130)
+        card.pack_propagate(False)
+        card.check = selection.checkbox(card)
+        card.check.place(x=15, rely=0.5, anchor="w")
+
+        card.info = tk.Label(
             card,
-            text=info_text,
             font=(styles.FONT_FAMILY, 14),
             fg=styles.FG_COLOR,
             bg=styles.ENTRY_BG
-        ).pack(pady=(20, 10))
+        )
+        card.info.pack(pady=(20, 10))
 
-        def confirm_delete(target=uname):
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{target}'?"):
-                delete_user(target)
-                messagebox.showinfo("Deleted", f"User '{target}' removed successfully.")
-                open_edit_users(root, username, open_admin_dashboard_func)
-
-        tk.Button(
+        card.delete = tk.Button(
             card,
             text="Delete User",
-            command=confirm_delete,
+            command=lambda: confirm_delete(card.row[0], card.delete),
             font=(styles.FONT_FAMILY, 12, "bold"),
             bg=styles.BUTTON_PRIMARY,
             fg=styles.BG_COLOR,
@@ -138,26 +282,53 @@ def open_edit_users(root, username, open_admin_dashboard_func):
             width=14,
             height=1,
             cursor="hand2"
-        ).pack()
+        )
+        card.delete.pack()
+        return card
 
-    # Mouse scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    def fill_card(card, row):
+        card.row = row
+        uname, status, grade = row
+        info_text = f"👤 {uname}   |   Role: {status}"
+        if status == "student" and grade:
+            info_text += f"   |   Grade: {grade}"
+        card.info.config(text=info_text)
+        selection.bind(card.check, uname)
+
+    cards = CardList(user_list, ident=lambda row: row[0], sort_key=lambda row: (row[1], row[0]),
+                     directions=("DESC", "ASC"))
+
+    def filter_changed(event):
+        selection.clear()
+        load_page()
+
+    role_filter.bind("<<ComboboxSelected>>", filter_changed)
+    grade_filter.bind("<<ComboboxSelected>>", filter_changed)
+    load_page()
 
 
 # -------------------------------------------------------------------
 # Add User Page (functional)
 # -------------------------------------------------------------------
-def open_add_user_page(root, username, open_admin_dashboard_func):
-    """Add New User Form Page."""
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
+def open_add_user_page(page, username, on_close=None):
+    """Add New User Form Page.
+
+    With on_close, the form is shown while the user list is hidden and
+    on_close(new_row or None) is called when it closes; otherwise Back
+    and Save go back to the previous page.
+    """
+    form_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    form_frame.pack(fill="both", expand=True)
+
+    def close(row=None):
+        if on_close is None:
+            page.router.back()
+        else:
+            form_frame.destroy()
+            on_close(row)
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(form_frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -171,7 +342,7 @@ def open_add_user_page(root, username, open_admin_dashboard_func):
     tk.Button(
         top_frame,
         text="Back",
-        command=lambda: open_edit_users(root, username, open_admin_dashboard_func),
+        command=close,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -182,18 +353,10 @@ def open_add_user_page(root, username, open_admin_dashboard_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Scrollable Content -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
-    main_frame.pack(fill="both", expand=True)
-
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-    scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas_window = canvas.create_window((0, 0), window=scroll_frame, anchor="n")
-    canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-    canvas.configure(yscrollcommand=scrollbar.set)
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    area = ScrollArea(form_frame)
+    area.frame.pack(fill="both", expand=True)
+    scroll_frame = area.body
+    page.scrolls(area.canvas)
 
     # ----- Title -----
     tk.Label(
@@ -270,14 +433,16 @@ def open_add_user_page(root, username, open_admin_dashboard_func):
             messagebox.showerror("Error", "Admins must have grade set to 'none'.")
             return
 
-        success = add_new_user(uname, pw, role, None if grade == "none" else grade)
-        if success:
+        stored_grade = None if grade == "none" else grade
+
+        def saved(success):
             messagebox.showinfo("Success", f"User '{uname}' added successfully.")
-            open_edit_users(root, username, open_admin_dashboard_func)
-        else:
-            messagebox.showerror("Error", f"Username '{uname}' already exists.")
+            close((uname, role, stored_grade))
 
-    tk.Button(
+        run_save(save_button, uname, add_new_user, uname, pw, role, stored_grade,
+                 on_saved=saved, taken=f"Username '{uname}' already exists.")
+
+    save_button = tk.Button(
         scroll_frame,
         text="Save User",
         command=save_user,
@@ -288,8 +453,5 @@ def open_add_user_page(root, username, open_admin_dashboard_func):
         width=20,
         height=2,
         cursor="hand2"
-    ).pack(pady=(10, 40))
-
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
\ No newline at end of file
+    )
+    save_button.pack(pady=(10, 40))
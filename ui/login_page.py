@@ -3,16 +3,11 @@ import tkinter as tk
 from tkinter import messagebox
 from db.database import check_login
 from utils import styles
+from ui.db_worker import run_async
 
-def open_login_page(root, open_next_page):
-    # Clear previous widgets (in case of logout)
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
-
+def open_login_page(page, open_next_page):
     # Outer full-screen frame
-    outer_frame = tk.Frame(root, bg=styles.BG_COLOR)
+    outer_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
     outer_frame.pack(fill="both", expand=True)
 
     # Centered login card
@@ -84,15 +79,22 @@ def open_login_page(root, open_next_page):
     def login():
         username = username_entry.get().strip()
         password = password_entry.get().strip()
-        result = check_login(username, password)
+        login_button.config(state="disabled", text="Checking...")
 
-        if result:
-            status, grade = result
-            # messagebox.showinfo("Success", f"Welcome {username}! You are logged in as {status}.")
-            outer_frame.destroy()
-            open_next_page(root, username, status, grade)
-        else:
-            messagebox.showerror("Error", "Invalid username or password")
+        def checked(result):
+            if result:
+                status, grade = result
+                # messagebox.showinfo("Success", f"Welcome {username}! You are logged in as {status}.")
+                open_next_page(page.router, username, status, grade)
+            else:
+                login_button.config(state="normal", text="Login")
+                messagebox.showerror("Error", "Invalid username or password")
+
+        def failed(exc):
+            login_button.config(state="normal", text="Login")
+            messagebox.showerror("Error", f"Could not check the login: {exc}")
+
+        run_async(outer_frame, check_login, username, password, on_done=checked, on_error=failed)
 
     # --- Login Button ---
     login_button = tk.Button(
@@ -0,0 +1,40 @@
+# ui/pager.py
+import tkinter as tk
+from utils import styles
+
+
+def create_pager(parent, on_prev, on_next):
+    """Previous/Next bar for keyset-paginated lists.
+
+    Returns update(page, total, noun) which refreshes the label and
+    enables/disables the buttons for a db.pagination.Page.
+    """
+    bar = tk.Frame(parent, bg=styles.BG_COLOR)
+    bar.pack(pady=(10, 10))
+
+    button_opts = dict(
+        font=(styles.FONT_FAMILY, 12, "bold"),
+        bg=styles.BUTTON_PRIMARY,
+        fg=styles.BG_COLOR,
+        relief="flat",
+        width=12,
+        height=1,
+        cursor="hand2"
+    )
+
+    prev_btn = tk.Button(bar, text="◀  Previous", command=on_prev, **button_opts)
+    prev_btn.pack(side="left", padx=10)
+
+    info = tk.Label(bar, text="", font=(styles.FONT_FAMILY, 12),
+                    fg=styles.FG_COLOR, bg=styles.BG_COLOR, width=28)
+    info.pack(side="left", padx=10)
+
+    next_btn = tk.Button(bar, text="Next  ▶", command=on_next, **button_opts)
+    next_btn.pack(side="left", padx=10)
+
+    def update(page, total, noun):
+        info.config(text=f"{len(page.rows)} shown  |  {total} {noun} total")
+        prev_btn.config(state="normal" if page.has_prev else "disabled")
+        next_btn.config(state="normal" if page.has_next else "disabled")
+
+    return update
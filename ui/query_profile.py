@@ -0,0 +1,120 @@
+# ui/query_profile.py
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from utils import styles
+from db import profiler, maintenance
+from db.database import get_cache_stats
+from server import chunks
+
+
+# -------------------------------------------------------------------
+# Query Profile Page (admin)
+# -------------------------------------------------------------------
+def open_query_profile(page, username):
+    """Show the query profiler report with enable/reset/save controls."""
+    # ----- Top Bar -----
+    top_frame = tk.Frame(page.frame, bg=styles.ENTRY_BG, height=70)
+    top_frame.pack(fill="x", side="top")
+
+    tk.Label(
+        top_frame,
+        text=f"Logged in as: {username} (Admin)",
+        font=(styles.FONT_FAMILY, 14),
+        fg=styles.FG_COLOR,
+        bg=styles.ENTRY_BG
+    ).pack(side="left", padx=25, pady=10)
+
+    tk.Button(
+        top_frame,
+        text="Back",
+        command=page.router.back,
+        font=(styles.FONT_FAMILY, 12, "bold"),
+        bg=styles.BUTTON_PRIMARY,
+        fg=styles.BG_COLOR,
+        relief="flat",
+        width=12,
+        height=1,
+        cursor="hand2"
+    ).pack(side="right", padx=25, pady=10)
+
+    # ----- Title -----
+    tk.Label(
+        page.frame,
+        text="Query Profile",
+        font=(styles.FONT_FAMILY, 26, "bold"),
+        fg=styles.FG_COLOR,
+        bg=styles.BG_COLOR
+    ).pack(pady=(30, 15))
+
+    # ----- Controls -----
+    controls = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    controls.pack(pady=(0, 15))
+
+    button_opts = dict(
+        font=(styles.FONT_FAMILY, 12, "bold"),
+        bg=styles.BUTTON_PRIMARY,
+        fg=styles.BG_COLOR,
+        relief="flat",
+        width=16,
+        height=1,
+        cursor="hand2"
+    )
+
+    def toggle():
+        if profiler.is_enabled():
+            profiler.disable()
+        else:
+            profiler.enable()
+        refresh()
+
+    def reset():
+        profiler.reset()
+        refresh()
+
+    def save():
+        path = filedialog.asksaveasfilename(defaultextension=".txt", initialfile="query_profile.txt")
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                profiler.dump_report(f, limit=1000)
+            messagebox.showinfo("Saved", f"Report written to:\n{path}")
+
+    toggle_btn = tk.Button(controls, command=toggle, **button_opts)
+    toggle_btn.pack(side="left", padx=8)
+    tk.Button(controls, text="Refresh", command=lambda: refresh(), **button_opts).pack(side="left", padx=8)
+    tk.Button(controls, text="Reset", command=reset, **button_opts).pack(side="left", padx=8)
+    tk.Button(controls, text="Save Report", command=save, **button_opts).pack(side="left", padx=8)
+
+    # ----- Report -----
+    text_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
+    text_frame.pack(fill="both", expand=True, padx=40, pady=(0, 30))
+
+    report_text = tk.Text(text_frame, font=("Courier", 11), bg=styles.ENTRY_BG, fg=styles.FG_COLOR,
+                          relief="flat", wrap="none")
+    scrollbar = tk.Scrollbar(text_frame, orient="vertical", command=report_text.yview)
+    report_text.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side="right", fill="y")
+    report_text.pack(side="left", fill="both", expand=True)
+
+    def refresh():
+        toggle_btn.config(text="Disable Profiling" if profiler.is_enabled() else "Enable Profiling")
+        cache = get_cache_stats()
+        report = profiler.report(limit=200)
+        report += (f"\n\nCatalog cache: {cache['hits']} hits, {cache['misses']} misses, "
+                   f"{cache['size']} entries")
+        blocks = chunks.cache.stats()
+        report += (f"\nVideo block cache: {blocks['hit_ratio']:.0%} hits ({blocks['hits']}/"
+                   f"{blocks['hits'] + blocks['misses']}), {blocks['resident'] / 1e6:.0f} of "
+                   f"{blocks['budget'] / 1e6:.0f} MB in {blocks['files']} file(s)")
+        runs = maintenance.history()[-15:]
+        if runs:
+            report += "\n\nMaintenance (latest last):"
+            for run in runs:
+                stamp = time.strftime("%H:%M:%S", time.localtime(run.started))
+                report += f"\n  {stamp}  {run.task:<20}{run.status:<12}{run.seconds:>7.2f}s  {run.detail}"
+        report_text.config(state="normal")
+        report_text.delete("1.0", tk.END)
+        report_text.insert("1.0", report)
+        report_text.config(state="disabled")
+
+    refresh()
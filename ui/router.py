@@ -0,0 +1,165 @@
+# ui/router.py
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from utils import styles
+from db.cache import catalog_cache
+from ui.db_worker import run_async
+
+# -------------------------------------------------------------------
+# Page navigation with a cache of live pages
+#
+# A page is a function open_x(page, *args) that builds its screen into
+# page.frame. Navigating away hides the frame (pack_forget) instead of
+# destroying it, so Back restores the page as it was, scroll position
+# included, without re-querying. At most MAX_PAGES pages stay alive;
+# older ones are destroyed and rebuilt if Back reaches them. Pages that
+# track catalog cache tags are rebuilt instead of restored once one of
+# those tags is invalidated while they are hidden.
+# -------------------------------------------------------------------
+MAX_PAGES = 5       # live pages, the visible one included
+
+
+class Page:
+    """One screen: its frame plus what the router keeps about it."""
+
+    def __init__(self, router, key):
+        self.router = router
+        self.key = key              # (open function, args)
+        self.frame = tk.Frame(router.root, bg=styles.BG_COLOR)
+        self.canvas = None
+        self.scroll = 0.0
+        self.stale = False
+        self._tags = set()
+
+    def track(self, *tags):
+        """Rebuild this page instead of restoring it once any of `tags` changes.
+
+        A tag is a catalog cache tag such as ("topics", 3), or just its
+        kind ("topics") to match every tag of that kind.
+        """
+        self._tags.update(tags)
+
+    def scrolls(self, canvas):
+        """Set the canvas whose scroll position is kept while the page is hidden."""
+        self.canvas = canvas
+
+    def depends_on(self, tags):
+        if not self._tags:
+            return False
+        if tags is None:
+            return True
+        return any(tag in self._tags or tag[0] in self._tags for tag in tags)
+
+
+class Router:
+    """Owns the pages of one Tk root and the Back history between them."""
+
+    def __init__(self, root, max_pages=MAX_PAGES):
+        self.root = root
+        self.max_pages = max_pages
+        self.current = None
+        self._pages = OrderedDict()     # key -> Page, least recently shown first
+        self._history = []              # keys of the pages behind the current one
+        self._home = None
+        self._lock = threading.Lock()   # _pages is also read by _invalidated
+        root.configure(bg=styles.BG_COLOR)
+        catalog_cache.add_listener(self._invalidated)
+
+    # --- Navigation ---
+    def set_home(self, func, *args):
+        """The page home() starts over from (the login page)."""
+        self._home = (func, args)
+
+    def home(self):
+        func, args = self._home
+        return self.reset(func, *args)
+
+    def open(self, func, *args):
+        """Show page func(page, *args), keeping the current one for Back."""
+        key = (func, args)
+        if self.current is not None:
+            if self.current.key == key:
+                return self.current
+            self._history.append(self.current.key)
+        return self._show(key)
+
+    def back(self):
+        """Return to the previous page; restored if still cached and fresh."""
+        if not self._history:
+            return None
+        return self._show(self._history.pop())
+
+    def reset(self, func, *args):
+        """Drop every page and the history, then show func(page, *args)."""
+        self._history.clear()
+        for page in list(self._pages.values()):
+            self._discard(page)
+        self.current = None
+        return self._show((func, args))
+
+    # --- Page cache ---
+    def _show(self, key):
+        if self.current is not None:
+            self._hide(self.current)
+            self.current = None
+
+        page = self._pages.get(key)
+        if page is not None and page.stale:
+            self._discard(page)
+            page = None
+
+        if page is None:
+            page = Page(self, key)
+            with self._lock:
+                self._pages[key] = page
+            self.current = page
+            page.frame.pack(fill="both", expand=True)
+            func, args = key
+            func(page, *args)
+        else:
+            with self._lock:
+                self._pages.move_to_end(key)
+            self.current = page
+            page.frame.pack(fill="both", expand=True)
+            if page.canvas is not None:
+                page.canvas.yview_moveto(page.scroll)
+            # Writes by other processes are only noticed on the next
+            # catalog lookup; check now and rebuild if there were any.
+            run_async(page.frame, catalog_cache.poll,
+                      on_done=lambda changed: changed and self._reload(page))
+
+        self._evict()
+        return page
+
+    def _hide(self, page):
+        if page.canvas is not None and page.canvas.winfo_exists():
+            page.scroll = page.canvas.yview()[0]
+        page.frame.pack_forget()
+
+    def _reload(self, page):
+        if page is self.current and page.depends_on(None):
+            self._discard(page)
+            self.current = None
+            self._show(page.key)
+
+    def _discard(self, page):
+        with self._lock:
+            self._pages.pop(page.key, None)
+        page.frame.destroy()
+
+    def _evict(self):
+        while len(self._pages) > self.max_pages:
+            oldest = next(iter(self._pages.values()))
+            self._discard(oldest)
+
+    def _invalidated(self, tags):
+        """Catalog cache listener; runs on the thread that did the write.
+
+        The visible page is left alone: it either made the change itself
+        (and updated in place) or is refreshed on the next visit.
+        """
+        with self._lock:
+            for page in self._pages.values():
+                if page is not self.current and page.depends_on(tags):
+                    page.stale = True
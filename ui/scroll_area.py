@@ -0,0 +1,117 @@
+# ui/scroll_area.py
+import tkinter as tk
+from tkinter import ttk
+from utils import styles
+
+# -------------------------------------------------------------------
+# Scrollable page area
+#
+# A Canvas + Scrollbar with a frame (`body`) scrolling inside it. The
+# mouse wheel is bound (bind_all) only while the pointer is over the
+# area and unbound when it leaves or the area is destroyed, so visited
+# pages leave no global handlers behind. The scripts bound are Tcl
+# commands registered once per area, never a new one per bind. Bursts
+# of <Configure> events become a single layout pass per idle cycle.
+# -------------------------------------------------------------------
+WHEEL_EVENTS = {
+    "<MouseWheel>": "%D",       # Windows / macOS (and Tk 8.7+ on X11)
+    "<Button-4>": "1",          # X11 wheel up
+    "<Button-5>": "-1",         # X11 wheel down
+}
+
+
+class ScrollArea:
+    """Vertically scrolling area; pack `frame`, put content in `body`."""
+
+    _wheel_owner = None         # the area the wheel is currently bound to
+
+    def __init__(self, parent, padx=0):
+        self.frame = tk.Frame(parent, bg=styles.BG_COLOR)
+        self.canvas = tk.Canvas(self.frame, bg=styles.BG_COLOR, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=padx)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.frame._scroll_area = self
+        self.body = tk.Frame(self.canvas, bg=styles.BG_COLOR)
+        self._body_item = self.canvas.create_window((0, 0), window=self.body, anchor="nw")
+        self._layout_pending = None
+
+        scroll = self.frame.register(self._on_wheel)
+        self._wheel_scripts = {seq: f"{scroll} {arg}" for seq, arg in WHEEL_EVENTS.items()}
+
+        self.body.bind("<Configure>", self.schedule_layout)
+        self.canvas.bind("<Configure>", self.schedule_layout)
+        for widget in (self.frame, self.canvas):
+            widget.bind("<Enter>", self._on_enter)
+            widget.bind("<Leave>", self._on_leave)
+        self.frame.bind("<Destroy>", self._on_destroy)
+
+    # --- Layout ---
+    def schedule_layout(self, event=None):
+        """Run layout() once when Tk is next idle, however often this is called."""
+        if self._layout_pending is None:
+            self._layout_pending = self.canvas.after_idle(self._run_layout)
+
+    def _run_layout(self):
+        self._layout_pending = None
+        self.layout()
+
+    def layout(self):
+        """Stretch the body to the canvas width and fit the scroll region to it."""
+        width = self.canvas.winfo_width()
+        self.canvas.itemconfig(self._body_item, width=width)
+        self.canvas.configure(scrollregion=(0, 0, width, self.body.winfo_reqheight()))
+
+    # --- Mouse wheel ---
+    def _on_wheel(self, delta):
+        area = self._area_at_pointer()
+        if area is not self:
+            # The page changed under a still pointer (no <Leave> came):
+            # hand the wheel to whichever area is there now.
+            self._release_wheel()
+            if area is None:
+                return
+            area._on_enter(None)
+        delta = float(delta)
+        if delta:
+            area.canvas.yview_scroll(-1 if delta > 0 else 1, "units")
+
+    def _area_at_pointer(self):
+        x, y = self.frame.winfo_pointerxy()
+        try:
+            widget = self.frame.winfo_containing(x, y)
+        except KeyError:
+            return None         # a Tk-internal window (e.g. a combobox popdown)
+        while widget is not None:
+            area = getattr(widget, "_scroll_area", None)
+            if area is not None:
+                return area
+            widget = widget.master
+        return None
+
+    def _on_enter(self, event):
+        if ScrollArea._wheel_owner is not self:
+            for sequence, script in self._wheel_scripts.items():
+                self.frame.bind_all(sequence, script)
+            ScrollArea._wheel_owner = self
+
+    def _on_leave(self, event):
+        # Moving onto a child also sends <Leave>; only unbind when the
+        # pointer really left the area.
+        if self._area_at_pointer() is not self:
+            self._release_wheel()
+
+    def _release_wheel(self):
+        if ScrollArea._wheel_owner is self:
+            for sequence in self._wheel_scripts:
+                self.frame.unbind_all(sequence)
+            ScrollArea._wheel_owner = None
+
+    def _on_destroy(self, event):
+        if event.widget is self.frame:
+            self._release_wheel()
+            if self._layout_pending is not None:
+                self.canvas.after_cancel(self._layout_pending)
+                self._layout_pending = None
@@ -0,0 +1,145 @@
+# ui/selection.py
+import tkinter as tk
+from tkinter import messagebox
+from utils import styles
+from ui.db_worker import run_async
+
+
+class Selection:
+    """Multi-select state plus a batch action bar for paginated admin lists.
+
+    Selected keys survive page changes, so a batch can span pages. Row
+    widgets are recycled by the virtual list, so each gets a checkbox
+    from checkbox() once and is pointed at its current row with bind().
+    Actions added with add_action() receive the selected keys and are
+    disabled while nothing is selected or while a batch runs.
+    """
+
+    def __init__(self, parent, noun, page_keys):
+        self.noun = noun
+        self._page_keys = page_keys   # () -> keys of every row on the current page
+        self._chosen = {}           # key -> None, in the order it was ticked
+        self._boxes = []
+        self._buttons = []
+        self._busy = False
+
+        self.bar = tk.Frame(parent, bg=styles.BG_COLOR)
+        self.bar.pack(pady=(15, 0))
+
+        button_opts = dict(
+            font=(styles.FONT_FAMILY, 11, "bold"),
+            bg=styles.ENTRY_BG,
+            fg=styles.FG_COLOR,
+            relief="flat",
+            width=11,
+            height=1,
+            cursor="hand2"
+        )
+        tk.Button(self.bar, text="Select Page", command=lambda: self.set_page(True), **button_opts).pack(side="left", padx=5)
+        tk.Button(self.bar, text="Clear", command=self.clear, **button_opts).pack(side="left", padx=5)
+
+        self._info = tk.Label(self.bar, text="", font=(styles.FONT_FAMILY, 12),
+                              fg=styles.FG_COLOR, bg=styles.BG_COLOR, width=16)
+        self._info.pack(side="left", padx=10)
+        self._refresh()
+
+    # --- Rows ---
+    def checkbox(self, parent):
+        """A checkbox for a row widget; bind() points it at a row."""
+        var = tk.BooleanVar(value=False)
+        box = tk.Checkbutton(
+            parent,
+            variable=var,
+            command=lambda: self._toggle(box.key, var.get()),
+            bg=styles.ENTRY_BG,
+            activebackground=styles.ENTRY_BG,
+            selectcolor=styles.BG_COLOR,
+            fg=styles.FG_COLOR,
+            highlightthickness=0,
+            cursor="hand2"
+        )
+        box.var = var
+        box.key = None
+        self._boxes.append(box)
+        return box
+
+    def bind(self, box, key):
+        box.key = key
+        box.var.set(key in self._chosen)
+
+    def forget(self, keys):
+        """Drop rows that no longer exist from the selection."""
+        for key in keys:
+            self._chosen.pop(key, None)
+        self._refresh()
+
+    def _toggle(self, key, on):
+        if on:
+            self._chosen[key] = None
+        else:
+            self._chosen.pop(key, None)
+        self._refresh()
+
+    # --- Selection ---
+    def selected(self):
+        return list(self._chosen)
+
+    def set_page(self, on):
+        for key in self._page_keys():
+            if on:
+                self._chosen[key] = None
+            else:
+                self._chosen.pop(key, None)
+        self._refresh()
+
+    def clear(self):
+        self._chosen.clear()
+        self._refresh()
+
+    # --- Actions ---
+    def add_action(self, text, command, width=14):
+        """Add a batch button; command(keys) gets the selected keys."""
+        button = tk.Button(
+            self.bar,
+            text=text,
+            command=lambda: command(self.selected()),
+            font=(styles.FONT_FAMILY, 11, "bold"),
+            bg=styles.BUTTON_PRIMARY,
+            fg=styles.BG_COLOR,
+            relief="flat",
+            width=width,
+            height=1,
+            cursor="hand2"
+        )
+        button.pack(side="left", padx=5)
+        self._buttons.append(button)
+        self._refresh()
+        return button
+
+    def run(self, owner, func, *args, on_done):
+        """Run one batch call on the DB worker with the buttons disabled.
+
+        On success the selection is cleared before on_done(result).
+        """
+        def done(result):
+            self._busy = False
+            self.clear()
+            on_done(result)
+
+        def failed(exc):
+            self._busy = False
+            self._refresh()
+            messagebox.showerror("Error", f"Nothing was changed: {exc}")
+
+        self._busy = True
+        self._refresh()
+        return run_async(owner, func, *args, on_done=done, on_error=failed)
+
+    def _refresh(self):
+        for box in self._boxes:
+            box.var.set(box.key in self._chosen)
+        count = len(self._chosen)
+        self._info.config(text=f"{count} {self.noun} selected")
+        state = "normal" if count and not self._busy else "disabled"
+        for button in self._buttons:
+            button.config(state=state)
@@ -1,19 +1,19 @@
 # ui/student_dashboard.py
 import tkinter as tk
 from utils import styles
-from db.database import get_classes_by_grade
-from ui.login_page import open_login_page
+from db.database import get_classes_by_grade, search_topics
+from ui.class_page import open_class_page
+from ui.topic_page import open_topic_page
+from ui.db_worker import run_async
+from ui.virtual_list import VirtualList
 
 
-def open_student_dashboard(root, username, grade, open_class_page_func):
-    # Clear existing widgets
-    for widget in root.winfo_children():
-        widget.destroy()
-
-    root.configure(bg=styles.BG_COLOR)
+def open_student_dashboard(page, username, grade):
+    router = page.router
+    page.track(("classes", grade))
 
     # ----- Top Bar -----
-    top_frame = tk.Frame(root, bg=styles.ENTRY_BG, height=70)
+    top_frame = tk.Frame(page.frame, bg=styles.ENTRY_BG, height=70)
     top_frame.pack(fill="x", side="top")
 
     tk.Label(
@@ -24,13 +24,10 @@ def open_student_dashboard(root, username, grade, open_class_page_func):
         bg=styles.ENTRY_BG
     ).pack(side="left", padx=25, pady=10)
 
-    def logout():
-        open_login_page(root, lambda r, u=None, s=None, g=None: None)
-
     tk.Button(
         top_frame,
         text="Logout",
-        command=logout,
+        command=router.home,
         font=(styles.FONT_FAMILY, 12, "bold"),
         bg=styles.BUTTON_PRIMARY,
         fg=styles.BG_COLOR,
@@ -43,7 +40,7 @@ def open_student_dashboard(root, username, grade, open_class_page_func):
     ).pack(side="right", padx=25, pady=10)
 
     # ----- Main Frame -----
-    main_frame = tk.Frame(root, bg=styles.BG_COLOR)
+    main_frame = tk.Frame(page.frame, bg=styles.BG_COLOR)
     main_frame.pack(fill="both", expand=True)
 
     # Title
@@ -55,72 +52,103 @@ def open_student_dashboard(root, username, grade, open_class_page_func):
         bg=styles.BG_COLOR
     ).pack(pady=(30, 20))
 
-    # ----- Scrollable Canvas -----
-    canvas = tk.Canvas(main_frame, bg=styles.BG_COLOR, highlightthickness=0)
-    scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-    scroll_frame = tk.Frame(canvas, bg=styles.BG_COLOR)
-
-    scroll_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-
-    # Create window to center content horizontally
-    canvas_window = canvas.create_window(
-        (0, 0),
-        window=scroll_frame,
-        anchor="n"
+    # ----- Topic Search -----
+    search_entry = tk.Entry(
+        main_frame,
+        width=50,
+        font=styles.FONT_ENTRY,
+        bg=styles.ENTRY_BG,
+        fg=styles.FG_COLOR,
+        insertbackground=styles.FG_COLOR,
+        relief="flat",
+        justify="center"
     )
+    search_entry.pack(pady=(0, 10), ipady=8)
+
+    results_frame = tk.Frame(main_frame, bg=styles.BG_COLOR)
+    results_frame.pack(fill="x")
+
+    # Searches run on the DB worker; only the latest query's results are
+    # shown and an older in-flight search is cancelled.
+    search_state = {"task": None, "debounce": None}
+
+    def start_search():
+        search_state["debounce"] = None
+        if search_state["task"] is not None:
+            search_state["task"].cancel()
+            search_state["task"] = None
+        text = search_entry.get().strip()
+        if not text:
+            show_results(None)
+            return
+        search_state["task"] = run_async(
+            results_frame, search_topics, text, grade, 8,
+            on_done=show_results,
+            on_error=lambda e: show_results([])
+        )
 
-    def resize_canvas(event):
-        canvas.itemconfig(canvas_window, width=event.width)
-    canvas.bind("<Configure>", resize_canvas)
-
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True, padx=100)
-    scrollbar.pack(side="right", fill="y")
-
-    # ----- Load Classes -----
-    classes = get_classes_by_grade(grade)
-
-    if not classes:
-        tk.Label(
-            scroll_frame,
-            text="No classes assigned for this grade yet.",
-            font=(styles.FONT_FAMILY, 14),
-            fg=styles.FG_COLOR,
-            bg=styles.BG_COLOR
-        ).pack(pady=20)
-        return
-
-    # ----- Center container for class cards -----
-    content_wrapper = tk.Frame(scroll_frame, bg=styles.BG_COLOR)
-    content_wrapper.pack(anchor="center")
-
-    for cls in classes:
+    def on_key(event):
+        if search_state["debounce"] is not None:
+            search_entry.after_cancel(search_state["debounce"])
+        search_state["debounce"] = search_entry.after(150, start_search)
+
+    def show_results(results):
+        for widget in results_frame.winfo_children():
+            widget.destroy()
+        if results is None:
+            return
+        if not results:
+            tk.Label(results_frame, text="No matching topics.", font=(styles.FONT_FAMILY, 12),
+                     fg=styles.FG_COLOR, bg=styles.BG_COLOR).pack(pady=(0, 10))
+            return
+
+        for _, topic_name, class_name, _, snippet in results:
+            row = tk.Frame(results_frame, bg=styles.ENTRY_BG, width=700, height=60)
+            row.pack(pady=4)
+            row.pack_propagate(False)
+
+            tk.Button(
+                row,
+                text="View",
+                command=lambda c=class_name, t=topic_name: router.open(open_topic_page, username, grade, c, t),
+                font=(styles.FONT_FAMILY, 11, "bold"),
+                bg=styles.BUTTON_PRIMARY,
+                fg=styles.BG_COLOR,
+                relief="flat",
+                width=8,
+                cursor="hand2"
+            ).pack(side="right", padx=10)
+
+            tk.Label(row, text=f"{topic_name}  —  {class_name}", font=(styles.FONT_FAMILY, 12, "bold"),
+                     fg=styles.FG_COLOR, bg=styles.ENTRY_BG, anchor="w").pack(fill="x", padx=10, pady=(6, 0))
+            tk.Label(row, text=snippet, font=(styles.FONT_FAMILY, 10),
+                     fg=styles.FG_COLOR, bg=styles.ENTRY_BG, anchor="w").pack(fill="x", padx=10)
+
+    search_entry.bind("<KeyRelease>", on_key)
+
+    # ----- Class List (only the cards in view exist as widgets) -----
+    def make_card(parent):
         class_card = tk.Frame(
-            content_wrapper,
+            parent,
             bg=styles.ENTRY_BG,
             relief="flat",
             width=700,
             height=100
         )
-        class_card.pack(pady=20)
         class_card.pack_propagate(False)
 
-        tk.Label(
+        class_card.title = tk.Label(
             class_card,
-            text=cls,
             font=(styles.FONT_FAMILY, 16, "bold"),
             fg=styles.FG_COLOR,
             bg=styles.ENTRY_BG
-        ).pack(pady=(10, 5))
+        )
+        class_card.title.pack(pady=(10, 5))
 
-        tk.Button(
+        class_card.view = tk.Button(
             class_card,
             text="View",
-            command=lambda c=cls: open_class_page_func(root, username, grade, c),
+            command=lambda: router.open(open_class_page, username, grade, class_card.cls),
             font=(styles.FONT_FAMILY, 12, "bold"),
             bg=styles.BUTTON_PRIMARY,
             fg=styles.BG_COLOR,
@@ -128,9 +156,19 @@ def open_student_dashboard(root, username, grade, open_class_page_func):
             width=14,
             height=2,
             cursor="hand2"
-        ).pack(pady=(0, 10))
+        )
+        class_card.view.pack(pady=(0, 10))
+        return class_card
+
+    def fill_card(class_card, cls):
+        class_card.cls = cls
+        class_card.title.config(text=cls)
+
+    class_list = VirtualList(main_frame, row_height=140, make_row=make_card, fill_row=fill_card,
+                             empty_text="No classes assigned for this grade yet.", padx=100)
+    class_list.frame.pack(fill="both", expand=True)
+    page.scrolls(class_list.canvas)
 
-    # Enable mouse wheel scroll
-    def _on_mousewheel(event):
-        canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    # ----- Load Classes (off the Tk thread) -----
+    class_list.set_message("Loading classes...")
+    run_async(class_list.frame, get_classes_by_grade, grade, on_done=class_list.set_rows)
@@ -0,0 +1,128 @@
+# ui/virtual_list.py
+import tkinter as tk
+from utils import styles
+from ui.scroll_area import ScrollArea
+
+OFFSCREEN = -10000      # x of parked (unused) row widgets
+
+
+class VirtualList(ScrollArea):
+    """Scrolling list that only has widgets for the rows in view.
+
+    Rows all take `row_height` pixels. make_row(parent) builds an empty
+    row widget and fill_row(widget, row) points it at a row; widgets are
+    recycled as rows scroll in and out, so a list of 10k rows costs the
+    same number of widgets as one screenful (plus `overscan` rows above
+    and below). fill_row runs on every scroll step, so it should only
+    set text and attributes; give buttons their command in make_row
+    (configuring a new Python callback each time leaks Tcl commands).
+
+    Anything packed into `header` scrolls with the list, above the rows.
+    Pack `frame` to show the list.
+    """
+
+    def __init__(self, parent, row_height, make_row, fill_row, empty_text="", overscan=3, padx=0):
+        super().__init__(parent, padx=padx)
+        self.row_height = row_height
+        self.make_row = make_row
+        self.fill_row = fill_row
+        self.empty_text = empty_text
+        self.overscan = overscan
+        self.rows = []
+
+        self.header = self.body
+        self.canvas.configure(yscrollcommand=self._on_view_change)
+        self._header_height = 0
+        self._message_text = None
+        self._message = tk.Label(self.canvas, text="", font=(styles.FONT_FAMILY, 14),
+                                 fg=styles.FG_COLOR, bg=styles.BG_COLOR)
+        self._message_item = self.canvas.create_window((OFFSCREEN, 0), window=self._message, anchor="n")
+
+        self._width = 1
+        self._bound = {}            # row index -> widget showing it
+        self._items = {}            # widget -> canvas window item
+        self._free = []             # parked widgets, ready for reuse
+
+    # --- Data ---
+    def set_rows(self, rows):
+        """Show `rows`; only the visible ones are (re)bound, the scroll position is kept."""
+        self.rows = list(rows)
+        self._release(list(self._bound))
+        self._message_text = None if self.rows else self.empty_text
+        self._fit()
+
+    def set_message(self, text):
+        """Replace the rows with a one-line message (e.g. "Loading...")."""
+        self.rows = []
+        self._release(list(self._bound))
+        self._message_text = text
+        self._fit()
+
+    def refresh(self):
+        """Re-fill the visible rows (after their data changed in place)."""
+        for index, widget in self._bound.items():
+            self.fill_row(widget, self.rows[index])
+
+    def scroll_to_top(self):
+        self.canvas.yview_moveto(0)
+
+    def widget_count(self):
+        """Row widgets created so far (bound + parked)."""
+        return len(self._items)
+
+    # --- Layout ---
+    def layout(self):
+        """Header or canvas size changed (coalesced by ScrollArea): re-place everything."""
+        self._width = max(self.canvas.winfo_width(), 1)
+        self._header_height = self.header.winfo_reqheight()
+        self.canvas.itemconfig(self._body_item, width=self._width)
+        for index, widget in self._bound.items():
+            self._place(widget, index)
+        self._fit()
+
+    def _fit(self):
+        height = self._header_height + len(self.rows) * self.row_height
+        if self._message_text:
+            self._message.config(text=self._message_text)
+            self.canvas.coords(self._message_item, self._width / 2, self._header_height + 20)
+            height += 80
+        else:
+            self.canvas.coords(self._message_item, OFFSCREEN, 0)
+        self.canvas.configure(scrollregion=(0, 0, self._width, max(height, 1)))
+        self._update_visible()
+
+    def _on_view_change(self, first, last):
+        self.scrollbar.set(first, last)
+        self._update_visible()
+
+    def _place(self, widget, index):
+        y = self._header_height + index * self.row_height + self.row_height / 2
+        self.canvas.coords(self._items[widget], self._width / 2, y)
+
+    def _visible_range(self):
+        top = self.canvas.canvasy(0) - self._header_height
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        first = max(0, int(top // self.row_height) - self.overscan)
+        last = min(len(self.rows), int(bottom // self.row_height) + 1 + self.overscan)
+        return first, last
+
+    def _release(self, indexes):
+        for index in indexes:
+            widget = self._bound.pop(index)
+            self.canvas.coords(self._items[widget], OFFSCREEN, 0)
+            self._free.append(widget)
+
+    def _update_visible(self):
+        first, last = self._visible_range()
+        self._release([i for i in self._bound if not first <= i < last])
+        for index in range(first, last):
+            if index in self._bound:
+                continue
+            if self._free:
+                widget = self._free.pop()
+            else:
+                widget = self.make_row(self.canvas)
+                self._items[widget] = self.canvas.create_window((OFFSCREEN, 0), window=widget, anchor="center")
+            self.fill_row(widget, self.rows[index])
+            self._bound[index] = widget
+            self._place(widget, index)
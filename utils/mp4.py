@@ -0,0 +1,189 @@
+# utils/mp4.py
+"""Duration, resolution and codecs of an MP4/MOV file, read from its boxes.
+
+Only the moov box is read (wherever it is in the file: streaming-
+friendly files have it first, camera files after a huge mdat), so
+probing a 2 GB lecture costs a few small reads and no external tools:
+
+    moov/mvhd                       timescale and duration
+    moov/trak/tkhd                  display width and height (16.16 fixed point)
+    moov/trak/mdia/hdlr             track kind ("vide", "soun")
+    moov/trak/mdia/minf/stbl/stsd   first sample entry = codec fourcc
+
+probe(path) returns a VideoInfo; files that are not MP4 or are cut
+short raise Mp4Error.
+"""
+import os
+import struct
+
+MAX_MOOV_BYTES = 64 * 1024 * 1024   # refuse absurd moov sizes instead of reading them
+
+CODEC_NAMES = {
+    "avc1": "H.264", "avc3": "H.264",
+    "hvc1": "HEVC", "hev1": "HEVC",
+    "av01": "AV1", "vp09": "VP9", "vp08": "VP8",
+    "mp4v": "MPEG-4", "mp4a": "AAC", "ac-3": "AC-3", "ec-3": "E-AC-3",
+    "opus": "Opus", "Opus": "Opus", ".mp3": "MP3", "fLaC": "FLAC",
+}
+
+
+class Mp4Error(ValueError):
+    pass
+
+
+class VideoInfo:
+    __slots__ = ("duration", "width", "height", "codec", "audio_codec")
+
+    def __init__(self, duration=None, width=None, height=None, codec=None, audio_codec=None):
+        self.duration = duration        # seconds
+        self.width = width
+        self.height = height
+        self.codec = codec              # fourcc of the first video track, e.g. "avc1"
+        self.audio_codec = audio_codec  # fourcc of the first audio track, e.g. "mp4a"
+
+    def __repr__(self):
+        return (f"VideoInfo(duration={self.duration!r}, width={self.width!r}, height={self.height!r}, "
+                f"codec={self.codec!r}, audio_codec={self.audio_codec!r})")
+
+
+# -------------------------------------------------------------------
+# Boxes
+# -------------------------------------------------------------------
+def _read_header(f, end):
+    """(type, payload start, box end) of the box at f's position, or None at `end`."""
+    start = f.tell()
+    if start + 8 > end:
+        return None
+    header = f.read(8)
+    if len(header) < 8:
+        return None
+    size, kind = struct.unpack(">I4s", header)
+    payload = start + 8
+    if size == 1:
+        large = f.read(8)
+        if len(large) < 8:
+            raise Mp4Error("truncated 64-bit box size")
+        size = struct.unpack(">Q", large)[0]
+        payload += 8
+    elif size == 0:
+        size = end - start      # box runs to the end of the file
+    if size < payload - start or start + size > end:
+        raise Mp4Error(f"bad size for box {kind!r} at {start}")
+    return kind.decode("latin-1"), payload, start + size
+
+
+def _children(data, start=0, end=None):
+    """Yield (type, payload, box end) for the boxes in data[start:end]."""
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, pos)
+        payload = pos + 8
+        if size == 1:
+            if pos + 16 > end:
+                raise Mp4Error("truncated 64-bit box size")
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            payload += 8
+        elif size == 0:
+            size = end - pos
+        if size < payload - pos or pos + size > end:
+            raise Mp4Error(f"bad size for box {kind!r} at {pos}")
+        yield kind.decode("latin-1"), payload, pos + size
+        pos += size
+
+
+def _find(data, path, start=0, end=None):
+    """Payload (start, end) of the first box at `path` (e.g. "mdia/minf/stbl"), or None."""
+    first, _, rest = path.partition("/")
+    for kind, payload, box_end in _children(data, start, end):
+        if kind == first:
+            return (payload, box_end) if not rest else _find(data, rest, payload, box_end)
+    return None
+
+
+# -------------------------------------------------------------------
+# Parsing
+# -------------------------------------------------------------------
+def _read_moov(f, file_size):
+    f.seek(0)
+    while True:
+        box = _read_header(f, file_size)
+        if box is None:
+            raise Mp4Error("no moov box")
+        kind, payload, box_end = box
+        if kind == "moov":
+            if box_end - payload > MAX_MOOV_BYTES:
+                raise Mp4Error("moov box too large")
+            data = f.read(box_end - payload)
+            if len(data) < box_end - payload:
+                raise Mp4Error("truncated moov box")
+            return data
+        f.seek(box_end)
+
+
+def _mvhd_duration(data, start):
+    version = data[start]
+    if version == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, start + 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, start + 12)
+    if not timescale or not duration or duration in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+        return None
+    return duration / timescale
+
+
+def _tkhd_size(data, start):
+    # width/height are the last two 16.16 fields: after the version-
+    # dependent times, 8 reserved bytes, layer/group/volume and the matrix.
+    offset = start + (88 if data[start] == 1 else 76)
+    width, height = struct.unpack_from(">II", data, offset)
+    return width >> 16, height >> 16
+
+
+def _track(data, start, end):
+    """(handler, codec fourcc, width, height) of one trak box."""
+    handler = codec = None
+    width = height = None
+    tkhd = _find(data, "tkhd", start, end)
+    if tkhd:
+        width, height = _tkhd_size(data, tkhd[0])
+    hdlr = _find(data, "mdia/hdlr", start, end)
+    if hdlr:
+        handler = data[hdlr[0] + 8:hdlr[0] + 12].decode("latin-1")
+    stsd = _find(data, "mdia/minf/stbl/stsd", start, end)
+    if stsd:
+        entries = list(_children(data, stsd[0] + 8, stsd[1]))
+        if entries:
+            codec, payload, _ = entries[0]
+            if handler == "vide" and not (width and height):
+                # no usable tkhd size: take the coded size from the visual sample entry
+                width, height = struct.unpack_from(">HH", data, payload + 24)
+    return handler, codec, width, height
+
+
+def probe(path):
+    """VideoInfo of the MP4/MOV file at `path`; raises Mp4Error (or OSError)."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        try:
+            data = _read_moov(f, size)
+            info = VideoInfo()
+            mvhd = _find(data, "mvhd")
+            if mvhd:
+                info.duration = _mvhd_duration(data, mvhd[0])
+            for kind, payload, box_end in _children(data):
+                if kind != "trak":
+                    continue
+                handler, codec, width, height = _track(data, payload, box_end)
+                if handler == "vide" and info.codec is None:
+                    info.codec, info.width, info.height = codec, width, height
+                elif handler == "soun" and info.audio_codec is None:
+                    info.audio_codec = codec
+            return info
+        except struct.error as error:
+            raise Mp4Error(f"truncated box: {error}") from None
+
+
+def codec_name(fourcc):
+    """Readable codec name ("H.264") for a fourcc, or the fourcc itself."""
+    return CODEC_NAMES.get(fourcc, fourcc)
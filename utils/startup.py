@@ -0,0 +1,130 @@
+# utils/startup.py
+"""Startup timeline: where the time goes before the login screen shows.
+
+Off by default; main.py imports this module first so the import hook
+sees everything loaded after it.
+
+    LMS_STARTUP=1                 record and print the timeline to stderr
+    LMS_STARTUP_JSON=start.json   also write it as JSON
+    LMS_STARTUP_EXIT=1            quit once the first frame is drawn
+                                  (used by benchmarks/bench_startup.py)
+
+The timeline has the phases marked by main.py (imports, Tk root,
+init_db, ...) and "first frame drawn", all in ms since this module was
+imported, plus the slowest imports with their inclusive and self time.
+While disabled every function here returns at once.
+"""
+import atexit
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+
+TOP_IMPORTS = 15    # imports listed in the printed report
+
+enabled = os.environ.get("LMS_STARTUP", "").lower() not in ("", "0", "false", "no")
+
+_t0 = time.perf_counter()
+_marks = []                 # (label, seconds since _t0)
+_imports = {}               # module name -> [inclusive s, self s]
+_stack = []                 # child import time of each import in progress
+_reported = False
+_main_thread = threading.get_ident()
+_original_import = builtins.__import__
+
+
+# -------------------------------------------------------------------
+# Import timing
+# -------------------------------------------------------------------
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Already-loaded modules and other threads go straight through
+    # ("from pkg import sub" may still load sub, so it is timed).
+    if threading.get_ident() != _main_thread or (level == 0 and not fromlist and name in sys.modules):
+        return _original_import(name, globals, locals, fromlist, level)
+    loaded = len(sys.modules)
+    key = name if level == 0 else "." * level + name
+    if fromlist:
+        key = f"{key} import {', '.join(fromlist)}"
+    _stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if len(sys.modules) > loaded:
+            entry = _imports.setdefault(key, [0.0, 0.0])
+            entry[0] += elapsed
+            entry[1] += elapsed - children
+            if _stack:
+                _stack[-1] += elapsed
+
+
+# -------------------------------------------------------------------
+# Timeline
+# -------------------------------------------------------------------
+def mark(label):
+    """Record that startup reached `label`."""
+    if enabled:
+        _marks.append((label, time.perf_counter() - _t0))
+
+
+def watch_first_frame(root, widget):
+    """Mark "first frame drawn" once `widget` is mapped and Tk has redrawn, then report."""
+    if not enabled:
+        return
+
+    def drawn():
+        mark("first frame drawn")
+        report()
+        if os.environ.get("LMS_STARTUP_EXIT") == "1":
+            root.destroy()
+
+    def on_map(event):
+        if event.widget is widget:
+            widget.unbind("<Map>")
+            root.after_idle(drawn)
+
+    widget.bind("<Map>", on_map, add="+")
+
+
+def timeline():
+    """The timeline as a dict (the JSON written by report())."""
+    return {
+        "marks_ms": {label: at * 1000 for label, at in _marks},
+        "imports_ms": {name: {"inclusive": inclusive * 1000, "self": own * 1000}
+                       for name, (inclusive, own) in _imports.items()},
+    }
+
+
+def report(out=None):
+    """Print the timeline (default stderr) and write LMS_STARTUP_JSON; once per run."""
+    global _reported
+    if not enabled or _reported:
+        return
+    _reported = True
+    builtins.__import__ = _original_import
+
+    out = out or sys.stderr
+    print("startup timeline (ms since utils.startup was imported)", file=out)
+    previous = 0.0
+    for label, at in _marks:
+        print(f"  {label:<24}{at * 1000:>9.1f}  (+{(at - previous) * 1000:.1f})", file=out)
+        previous = at
+    slowest = sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)[:TOP_IMPORTS]
+    if slowest:
+        print(f"  {'slowest imports':<56}{'incl ms':>9}{'self ms':>9}", file=out)
+        for name, (inclusive, own) in slowest:
+            print(f"  {name:<56}{inclusive * 1000:>9.1f}{own * 1000:>9.1f}", file=out)
+
+    path = os.environ.get("LMS_STARTUP_JSON")
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(timeline(), f, indent=2)
+
+
+if enabled:
+    builtins.__import__ = _timed_import
+    atexit.register(report)     # runs with whatever was reached if no frame was drawn